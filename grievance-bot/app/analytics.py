@@ -0,0 +1,324 @@
+"""Incremental in-process analytics for processed grievances."""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from app.models import ClassificationResult, GrievanceAnalytics
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+class QuantileSketch:
+    """
+    Mergeable streaming quantile sketch with bounded relative error.
+
+    Values are counted in logarithmic buckets (as in DDSketch), so an update is
+    O(1), memory grows only with the dynamic range of the data, and every
+    reported quantile is within ``relative_accuracy`` of a true value.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Counter[int] = Counter()
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        """Record one positive value."""
+        self.buckets[math.ceil(math.log(value) / self._log_gamma)] += 1
+        self.count += 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Fold another sketch with the same accuracy into this one."""
+        self.buckets.update(other.buckets)
+        self.count += other.count
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate the q-quantile (0 <= q <= 1), or None if empty."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                return 2 * self._gamma**index / (self._gamma + 1)
+        return None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize for a snapshot."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "buckets": {str(k): v for k, v in self.buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "QuantileSketch":
+        """Restore a sketch serialized by ``to_dict``."""
+        sketch = cls(data["relative_accuracy"])
+        sketch.buckets = Counter({int(k): v for k, v in data["buckets"].items()})
+        sketch.count = sum(sketch.buckets.values())
+        return sketch
+
+
+class Rollup:
+    """Counters for one scope (all grievances, one org, or one hour)."""
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.manual_review = 0
+        self.by_type: Counter[str] = Counter()
+        self.by_priority: Counter[str] = Counter()
+        self.by_sub_category: Counter[str] = Counter()
+        # 0.5% accuracy keeps estimates of day counts below 100 within half a day
+        self.sla_days = QuantileSketch(relative_accuracy=0.005)
+        self.sla_days_sum = 0
+
+    def add(self, classification: ClassificationResult, sla_days: int | None) -> None:
+        """Count one grievance."""
+        self.total += 1
+        self.manual_review += classification.requires_manual_review
+        self.by_type[classification.request_type] += 1
+        self.by_priority[classification.priority] += 1
+        self.by_sub_category[classification.sub_category] += 1
+        if sla_days is not None:
+            self.sla_days.add(sla_days)
+            self.sla_days_sum += sla_days
+
+    def merge(self, other: "Rollup") -> None:
+        """Fold another rollup into this one."""
+        self.total += other.total
+        self.manual_review += other.manual_review
+        self.by_type.update(other.by_type)
+        self.by_priority.update(other.by_priority)
+        self.by_sub_category.update(other.by_sub_category)
+        self.sla_days.merge(other.sla_days)
+        self.sla_days_sum += other.sla_days_sum
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize for a snapshot."""
+        return {
+            "total": self.total,
+            "manual_review": self.manual_review,
+            "by_type": dict(self.by_type),
+            "by_priority": dict(self.by_priority),
+            "by_sub_category": dict(self.by_sub_category),
+            "sla_days": self.sla_days.to_dict(),
+            "sla_days_sum": self.sla_days_sum,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Rollup":
+        """Restore a rollup serialized by ``to_dict``."""
+        rollup = cls()
+        rollup.total = data["total"]
+        rollup.manual_review = data["manual_review"]
+        rollup.by_type = Counter(data["by_type"])
+        rollup.by_priority = Counter(data["by_priority"])
+        rollup.by_sub_category = Counter(data["by_sub_category"])
+        rollup.sla_days = QuantileSketch.from_dict(data["sla_days"])
+        rollup.sla_days_sum = data["sla_days_sum"]
+        return rollup
+
+
+class AnalyticsAggregator:
+    """
+    Maintains grievance analytics incrementally as results are produced.
+
+    Every recorded grievance updates an all-time rollup and an hourly rollup,
+    both globally and for its organization when one is given, so recording is
+    O(1) and a query merges at most ``retention_hours`` hourly rollups instead
+    of scanning history. Hourly rollups older than the retention are dropped.
+    At most ``max_orgs`` organizations get their own rollups; grievances of
+    further organizations only count globally, so arbitrary client-supplied
+    org ids cannot grow memory without bound. State can be saved to and
+    restored from a JSON snapshot.
+    """
+
+    def __init__(
+        self,
+        retention_hours: int = 168,
+        max_orgs: int = 10_000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.retention_hours = retention_hours
+        self.max_orgs = max_orgs
+        self.untracked_org_records = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Keyed by org id; None is the global scope
+        self._all_time: dict[str | None, Rollup] = {}
+        self._hourly: dict[tuple[str | None, int], Rollup] = {}
+        self._oldest_hour: int | None = None
+
+    def record(
+        self,
+        classification: ClassificationResult,
+        sla_days: int | None = None,
+        org_id: str | None = None,
+    ) -> None:
+        """Count one processed grievance."""
+        self.record_many([classification], sla_days=sla_days, org_id=org_id)
+
+    def record_many(
+        self,
+        classifications: Iterable[ClassificationResult],
+        sla_days: int | None = None,
+        org_id: str | None = None,
+    ) -> None:
+        """Count a batch of grievances sharing the same SLA and organization."""
+        hour = int(self._clock() // 3600)
+        with self._lock:
+            scopes: tuple[str | None, ...] = (None,)
+            if org_id is not None:
+                # The global scope is keyed None, hence the + 1
+                if org_id in self._all_time or len(self._all_time) < self.max_orgs + 1:
+                    scopes = (None, org_id)
+            rollups = []
+            for scope in scopes:
+                rollups.append(self._all_time.setdefault(scope, Rollup()))
+                rollups.append(self._hourly.setdefault((scope, hour), Rollup()))
+            count = 0
+            for classification in classifications:
+                count += 1
+                for rollup in rollups:
+                    rollup.add(classification, sla_days)
+            if org_id is not None and len(scopes) == 1:
+                self.untracked_org_records += count
+            self._expire(hour)
+
+    def summary(
+        self,
+        org_id: str | None = None,
+        window_hours: int | None = None,
+    ) -> GrievanceAnalytics:
+        """
+        Build the analytics summary for a scope.
+
+        Args:
+            org_id: Restrict to one organization; all grievances if None.
+            window_hours: Restrict to the last N hours (capped at the
+                retention); all time if None.
+
+        Returns:
+            GrievanceAnalytics for the requested scope and window.
+        """
+        with self._lock:
+            if window_hours is None:
+                rollup = Rollup()
+                rollup.merge(self._all_time.get(org_id, Rollup()))
+            else:
+                current = int(self._clock() // 3600)
+                rollup = Rollup()
+                for hour in range(current - min(window_hours, self.retention_hours) + 1, current + 1):
+                    bucket = self._hourly.get((org_id, hour))
+                    if bucket is not None:
+                        rollup.merge(bucket)
+        return _to_analytics(rollup, org_id, window_hours)
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of tracked organizations and of grievances left untracked."""
+        with self._lock:
+            return {
+                "tracked_orgs": sum(org is not None for org in self._all_time),
+                "untracked_org_records": self.untracked_org_records,
+            }
+
+    def save(self, path: str) -> None:
+        """Write a snapshot atomically to ``path``."""
+        with self._lock:
+            data = {
+                "version": SNAPSHOT_FORMAT_VERSION,
+                "all_time": [
+                    {"org_id": org, "rollup": r.to_dict()} for org, r in self._all_time.items()
+                ],
+                "hourly": [
+                    {"org_id": org, "hour": hour, "rollup": r.to_dict()}
+                    for (org, hour), r in self._hourly.items()
+                ],
+            }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Per process, so two workers saving at once never write the same file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(data, fh)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> bool:
+        """
+        Restore state from a snapshot; returns False if there is none.
+
+        An unreadable, corrupt or partial snapshot is logged and ignored,
+        leaving the current state as it was.
+        """
+        try:
+            with open(path, encoding="utf-8") as fh:
+                data = json.load(fh)
+            if data.get("version") != SNAPSHOT_FORMAT_VERSION:
+                return False
+            all_time = {
+                entry["org_id"]: Rollup.from_dict(entry["rollup"]) for entry in data["all_time"]
+            }
+            hourly = {
+                (entry["org_id"], entry["hour"]): Rollup.from_dict(entry["rollup"])
+                for entry in data["hourly"]
+            }
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as exc:
+            logger.warning("Ignoring unreadable analytics snapshot %s: %r", path, exc)
+            return False
+        with self._lock:
+            self._all_time = all_time
+            self._hourly = hourly
+            self._oldest_hour = min((hour for _, hour in self._hourly), default=None)
+            self._expire(int(self._clock() // 3600))
+        return True
+
+    def _expire(self, current_hour: int) -> None:
+        """Drop hourly rollups that fell out of the retention window."""
+        cutoff = current_hour - self.retention_hours
+        if self._oldest_hour is not None and self._oldest_hour > cutoff:
+            return
+        self._hourly = {key: r for key, r in self._hourly.items() if key[1] > cutoff}
+        self._oldest_hour = min((hour for _, hour in self._hourly), default=None)
+
+
+def _to_analytics(
+    rollup: Rollup,
+    org_id: str | None,
+    window_hours: int | None,
+) -> GrievanceAnalytics:
+    """Convert a rollup into the API response model."""
+    sla_count = rollup.sla_days.count
+
+    def sla_quantile(q: float) -> float | None:
+        # SLAs are whole days and the sketch is accurate to within half a day
+        value = rollup.sla_days.quantile(q)
+        return float(round(value)) if value is not None else None
+
+    return GrievanceAnalytics(
+        total_processed=rollup.total,
+        by_type=dict(rollup.by_type),
+        by_priority=dict(rollup.by_priority),
+        by_sub_category=dict(rollup.by_sub_category),
+        manual_review_rate=round(rollup.manual_review / rollup.total, 4) if rollup.total else 0.0,
+        avg_sla_days=round(rollup.sla_days_sum / sla_count, 1) if sla_count else None,
+        sla_days_p50=sla_quantile(0.5),
+        sla_days_p90=sla_quantile(0.9),
+        sla_days_p99=sla_quantile(0.99),
+        org_id=org_id,
+        window_hours=window_hours,
+    )
@@ -0,0 +1,158 @@
+"""Vectorized batch classification engine for bulk grievance requests."""
+
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+from app.classifier import DEFAULT_TABLES, KeywordTables, normalize_description
+from app.models import ClassificationResult
+
+
+class BatchClassifier:
+    """
+    Classifies a whole batch of grievances with NumPy array operations.
+
+    Each description is scanned once by the tables' keyword matcher and the hits
+    are stored as a sparse (CSR-style) item x keyword matrix. Type scores, the
+    stated-type boost, confidence, complexity and manual-review flags are then
+    computed column-wise over the batch. The output is identical to calling
+    ``GrievanceClassifier.classify`` on each item in turn.
+    """
+
+    def __init__(self, tables: KeywordTables = DEFAULT_TABLES) -> None:
+        self.tables = tables
+        self._matcher = tables.matcher
+        self._vocabulary: list[str] = sorted(tables.matcher.keywords)
+        self._column: dict[str, int] = {kw: i for i, kw in enumerate(self._vocabulary)}
+        self._types: list[str] = list(tables.keyword_map)
+        self._type_index: dict[str, int] = {t: i for i, t in enumerate(self._types)}
+
+        # Keyword -> type weights; a keyword listed twice for a type counts twice.
+        self._type_weights = np.zeros((len(self._vocabulary), len(self._types)))
+        for j, keywords in enumerate(tables.keyword_map.values()):
+            for kw in keywords:
+                self._type_weights[self._column[kw], j] += 1
+        self._type_denominators = np.array(
+            [max(1, len(keywords) // 2) for keywords in tables.keyword_map.values()],
+            dtype=np.float64,
+        )
+
+        self._critical = self._keyword_mask(tables.critical_keywords)
+        self._high = self._keyword_mask(tables.high_keywords)
+        self._low = self._keyword_mask(tables.low_keywords)
+        self._legal = self._keyword_mask(tables.complexity_keywords)
+        self._manual = self._keyword_mask(tables.manual_review_keywords)
+        self._sub_category_rules = [
+            (self._type_index[req_type], [(self._keyword_mask(cues), sub) for cues, sub in rules])
+            for req_type, rules in tables.sub_category_rules.items()
+            if req_type in self._type_index
+        ]
+
+    def classify_batch(
+        self,
+        descriptions: Sequence[str],
+        stated_types: Sequence[str],
+    ) -> list[ClassificationResult]:
+        """
+        Classify a batch of grievances.
+
+        Args:
+            descriptions: Grievance description texts.
+            stated_types: Request type stated for each description.
+
+        Returns:
+            One ClassificationResult per description, in input order.
+        """
+        n = len(descriptions)
+        if n == 0:
+            return []
+        rows, cols = self._hit_matrix(descriptions)
+
+        # Per-type keyword counts: sparse hits times the keyword -> type weights
+        counts = np.stack(
+            [
+                np.bincount(rows, weights=self._type_weights[cols, j], minlength=n)
+                for j in range(len(self._types))
+            ],
+            axis=1,
+        )
+        scores = np.minimum(1.0, counts / self._type_denominators)
+
+        # Boost the stated type
+        stated = np.array([self._type_index.get(t, -1) for t in stated_types], dtype=np.intp)
+        boosted = np.flatnonzero(stated >= 0)
+        scores[boosted, stated[boosted]] = np.minimum(1.0, scores[boosted, stated[boosted]] + 0.2)
+
+        # First maximum wins, matching max() over the type dict
+        best = np.argmax(scores, axis=1)
+        confidence = scores[np.arange(n), best]
+
+        critical = self._any_hit(rows, cols, self._critical, n)
+        high = self._any_hit(rows, cols, self._high, n)
+        low = self._any_hit(rows, cols, self._low, n)
+        priority = np.select([critical, high, low], ["critical", "high", "low"], "medium")
+
+        others_above = (scores > 0.3).sum(axis=1) - (confidence > 0.3)
+        legal = self._any_hit(rows, cols, self._legal, n)
+        complexity = np.select(
+            [(others_above >= 1) | legal, confidence >= 0.7],
+            ["complex", "simple"],
+            "moderate",
+        )
+
+        manual_review = (confidence < 0.6) | self._any_hit(rows, cols, self._manual, n)
+
+        sub_category = np.full(n, self.tables.default_sub_category, dtype=object)
+        for type_idx, rules in self._sub_category_rules:
+            unresolved = best == type_idx
+            for cue_mask, sub in rules:
+                matched = unresolved
+                if cue_mask.any():
+                    matched = unresolved & self._any_hit(rows, cols, cue_mask, n)
+                sub_category[matched] = sub
+                unresolved = unresolved & ~matched
+
+        types = self._types
+        return [
+            ClassificationResult(
+                request_type=types[b],
+                confidence=round(c, 2),
+                sub_category=sub,
+                priority=p,
+                estimated_complexity=cx,
+                requires_manual_review=m,
+            )
+            for b, c, sub, p, cx, m in zip(
+                best.tolist(),
+                confidence.tolist(),
+                sub_category.tolist(),
+                priority.tolist(),
+                complexity.tolist(),
+                manual_review.tolist(),
+            )
+        ]
+
+    def _hit_matrix(self, descriptions: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Scan each description once and return the (row, column) hit coordinates."""
+        rows: list[int] = []
+        cols: list[int] = []
+        column = self._column
+        find_all = self._matcher.find_all
+        for i, description in enumerate(descriptions):
+            hits = find_all(normalize_description(description))
+            rows.extend([i] * len(hits))
+            cols.extend(column[kw] for kw in hits)
+        return np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)
+
+    def _keyword_mask(self, keywords: Iterable[str]) -> np.ndarray:
+        """Boolean column mask for the given keywords."""
+        mask = np.zeros(len(self._vocabulary), dtype=bool)
+        for kw in keywords:
+            if kw in self._column:
+                mask[self._column[kw]] = True
+        return mask
+
+    @staticmethod
+    def _any_hit(rows: np.ndarray, cols: np.ndarray, mask: np.ndarray, n: int) -> np.ndarray:
+        """Per-item flag: whether any hit falls in a masked keyword column."""
+        return np.bincount(rows[mask[cols]], minlength=n) > 0
@@ -0,0 +1,88 @@
+"""In-process LRU/TTL cache of classification results."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from app.classifier import normalize_description
+from app.models import ClassificationResult
+
+
+class ClassificationCache:
+    """
+    Bounded cache of classification results keyed on the normalized input.
+
+    Entries are evicted least-recently-used once ``max_entries`` is reached and
+    treated as misses once they are older than ``ttl_seconds``. Keys carry the
+    version of the keyword tables (or learned model) that produced the result,
+    so when an organization's tables are reloaded its old results are never
+    served again; they simply age out. All operations are thread-safe, since
+    the sync route handlers run on FastAPI's threadpool.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, ClassificationResult]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def key(description: str, stated_type: str, tables_version: str = "") -> str:
+        """Cache key: a digest of the tables version, stated type and normalized description."""
+        normalized = normalize_description(description)
+        payload = f"{tables_version}\x00{stated_type}\x00{normalized}".encode()
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def get(self, key: str) -> ClassificationResult | None:
+        """Return the cached result for a key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, result = entry
+            if self._clock() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: str, result: ClassificationResult) -> None:
+        """Store a result, evicting the least recently used entries if full."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict[str, int | float]:
+        """Return size and hit/miss/eviction counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,151 @@
+"""Monotonic, time-sortable case ID allocation."""
+
+import os
+import secrets
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import IO
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore[assignment]
+
+# Crockford base32: uppercase, no I/L/O/U, and sorts in the same order as the values
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+# Suffix layout, high to low bits: milliseconds since UTC midnight | node | worker | sequence
+MS_PER_DAY = 86_400_000
+NODE_BITS = 24
+WORKER_BITS = 8
+SEQUENCE_BITS = 6
+MAX_NODES = 1 << NODE_BITS
+MAX_WORKERS = 1 << WORKER_BITS
+MAX_SEQUENCE = 1 << SEQUENCE_BITS
+SUFFIX_LENGTH = 13  # 27 + 24 + 8 + 6 = 65 bits
+
+
+def _encode(value: int) -> str:
+    """Encode a suffix value as fixed-width Crockford base32."""
+    chars = []
+    for _ in range(SUFFIX_LENGTH):
+        chars.append(ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+class CaseIdAllocator:
+    """
+    Allocates ``GRV-YYYYMMDD-XXXXXXXXXXXXX`` case IDs.
+
+    The suffix packs the milliseconds since UTC midnight, a node ID, a worker
+    slot and a per-millisecond sequence, so IDs sort by creation time and
+    consecutive IDs land next to each other in an index. Within a process IDs
+    are strictly increasing: if the clock stalls or steps back, or a
+    millisecond's ``MAX_SEQUENCE`` IDs are used up, allocation moves on to the
+    next millisecond instead.
+
+    The node ID tells hosts (or pods) apart: pass a distinct ``node_id`` per
+    host, or leave it None for a random one, chosen once so that workers
+    forked from this allocator share it. Worker processes on a node never
+    share a slot: each leases one by holding an exclusive ``flock`` on a file
+    in ``lock_dir`` for its lifetime, and a forked child leases its own.
+    """
+
+    def __init__(
+        self,
+        node_id: int | None = None,
+        lock_dir: str | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if node_id is not None and not 0 <= node_id < MAX_NODES:
+            raise ValueError(f"node_id must be in [0, {MAX_NODES})")
+        self.node_id = secrets.randbits(NODE_BITS) if node_id is None else node_id
+        self._lock_dir = lock_dir
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._sequence = 0
+        self._day = -1
+        self._prefix = ""
+        self._worker: int | None = None
+        self._worker_pid: int | None = None
+        self._lease: IO[bytes] | None = None
+
+    @property
+    def worker_id(self) -> int:
+        """Worker slot used by this process, leasing one if needed."""
+        with self._lock:
+            return self._current_worker()
+
+    def next_id(self) -> str:
+        """Allocate one case ID."""
+        return self.allocate(1)[0]
+
+    def allocate(self, count: int) -> list[str]:
+        """
+        Pre-allocate a block of case IDs in one call.
+
+        Args:
+            count: Number of IDs to allocate.
+
+        Returns:
+            ``count`` increasing case IDs.
+        """
+        with self._lock:
+            worker = (self.node_id << (WORKER_BITS + SEQUENCE_BITS)) | (
+                self._current_worker() << SEQUENCE_BITS
+            )
+            now_ms = int(self._clock() * 1000)
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._sequence = 0
+            ids: list[str] = []
+            for _ in range(count):
+                if self._sequence == MAX_SEQUENCE:
+                    self._last_ms += 1
+                    self._sequence = 0
+                day, ms_of_day = divmod(self._last_ms, MS_PER_DAY)
+                if day != self._day:
+                    self._day = day
+                    date = datetime.fromtimestamp(day * 86_400, tz=timezone.utc)
+                    self._prefix = f"GRV-{date.strftime('%Y%m%d')}-"
+                value = (
+                    (ms_of_day << (NODE_BITS + WORKER_BITS + SEQUENCE_BITS))
+                    | worker
+                    | self._sequence
+                )
+                ids.append(self._prefix + _encode(value))
+                self._sequence += 1
+            return ids
+
+    def _current_worker(self) -> int:
+        """Return this process's worker slot; the caller holds ``_lock``."""
+        pid = os.getpid()
+        if self._worker is None or self._worker_pid != pid:
+            self._worker = self._lease_slot()
+            self._worker_pid = pid
+        return self._worker
+
+    def _lease_slot(self) -> int:
+        """Take the first free worker slot in ``lock_dir``."""
+        if self._lease is not None:
+            # Inherited across fork; the parent still holds its slot
+            self._lease.close()
+            self._lease = None
+        if fcntl is None or self._lock_dir is None:
+            # Best effort without a lock directory: distinct for concurrent local PIDs
+            return os.getpid() % MAX_WORKERS
+        os.makedirs(self._lock_dir, exist_ok=True)
+        for slot in range(MAX_WORKERS):
+            handle = open(os.path.join(self._lock_dir, f"worker-{slot}.lock"), "ab")
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                handle.close()
+                continue
+            self._lease = handle
+            return slot
+        raise RuntimeError(f"all {MAX_WORKERS} case ID worker slots in {self._lock_dir} are taken")
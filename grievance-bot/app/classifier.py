@@ -1,8 +1,12 @@
 """Keyword-based NLP classifier for grievance requests."""
 
-import re
+import hashlib
+import json
+from collections.abc import Iterable, Mapping
+from types import MappingProxyType
 from typing import Literal
 
+from app.matcher import KeywordMatcher
 from app.models import ClassificationResult
 
 # Keyword dictionaries for each request type
@@ -34,11 +38,129 @@ CRITICAL_KEYWORDS = ["urgent", "immediately", "breach", "children", "child"]
 HIGH_KEYWORDS = ["legal", "complaint", "DPB", "Data Protection Board", "sue", "court"]
 LOW_KEYWORDS = ["general inquiry", "just asking", "curious", "information"]
 MANUAL_REVIEW_KEYWORDS = ["legal action", "DPB", "Data Protection Board", "children", "child's data"]
+COMPLEXITY_KEYWORDS = ["legal", "court", "lawyer", "DPB", "complaint"]
+
+# Sub-category rules per request type: the first rule whose cue words appear
+# wins, and a rule with no cue words is the fallback for that type
+SUB_CATEGORY_RULES: dict[str, list[tuple[list[str], str]]] = {
+    "erasure": [
+        (["account", "profile"], "account_deletion"),
+        (["specific", "certain", "some"], "partial_erasure"),
+        ([], "full_erasure"),
+    ],
+    "access": [
+        (["export", "copy"], "data_export_request"),
+        ([], "data_access_request"),
+    ],
+    "correction": [
+        (["name", "address"], "personal_details_correction"),
+        ([], "data_correction"),
+    ],
+    "portability": [
+        ([], "data_portability"),
+    ],
+    "objection": [
+        (["marketing", "email"], "marketing_objection"),
+        ([], "processing_objection"),
+    ],
+}
+DEFAULT_SUB_CATEGORY = "general"
+
+
+class KeywordTables:
+    """
+    Immutable set of keyword tables compiled into a single matcher.
+
+    Lists become tuples and the keyword map a read-only mapping, so a compiled
+    instance can be shared by concurrent requests and swapped out as a whole.
+    ``version`` fingerprints the tables; caches of classification results are
+    keyed on it so a table change never serves stale results.
+    """
+
+    def __init__(
+        self,
+        keyword_map: Mapping[str, Iterable[str]],
+        critical_keywords: Iterable[str],
+        high_keywords: Iterable[str],
+        low_keywords: Iterable[str],
+        manual_review_keywords: Iterable[str],
+        complexity_keywords: Iterable[str],
+        sub_category_rules: Mapping[str, Iterable[tuple[Iterable[str], str]]],
+        default_sub_category: str = DEFAULT_SUB_CATEGORY,
+    ) -> None:
+        self.keyword_map: Mapping[str, tuple[str, ...]] = MappingProxyType(
+            {req_type: tuple(keywords) for req_type, keywords in keyword_map.items()}
+        )
+        self.critical_keywords = tuple(critical_keywords)
+        self.high_keywords = tuple(high_keywords)
+        self.low_keywords = tuple(low_keywords)
+        self.manual_review_keywords = tuple(manual_review_keywords)
+        self.complexity_keywords = tuple(complexity_keywords)
+        self.sub_category_rules: Mapping[str, tuple[tuple[tuple[str, ...], str], ...]] = (
+            MappingProxyType(
+                {
+                    req_type: tuple((tuple(cues), sub) for cues, sub in rules)
+                    for req_type, rules in sub_category_rules.items()
+                }
+            )
+        )
+        self.default_sub_category = default_sub_category
+
+        # Every keyword above, compiled once so a description is scanned a single time
+        self.matcher = KeywordMatcher(
+            [kw for keywords in self.keyword_map.values() for kw in keywords]
+            + list(self.critical_keywords)
+            + list(self.high_keywords)
+            + list(self.low_keywords)
+            + list(self.manual_review_keywords)
+            + list(self.complexity_keywords)
+            + [
+                cue
+                for rules in self.sub_category_rules.values()
+                for cues, _ in rules
+                for cue in cues
+            ]
+        )
+        self.version = hashlib.sha256(
+            json.dumps(
+                [
+                    dict(self.keyword_map),
+                    self.critical_keywords,
+                    self.high_keywords,
+                    self.low_keywords,
+                    self.manual_review_keywords,
+                    self.complexity_keywords,
+                    dict(self.sub_category_rules),
+                    self.default_sub_category,
+                ]
+            ).encode()
+        ).hexdigest()[:16]
+
+
+# The built-in tables, used when an organization has no keyword configuration
+DEFAULT_TABLES = KeywordTables(
+    keyword_map=KEYWORD_MAP,
+    critical_keywords=CRITICAL_KEYWORDS,
+    high_keywords=HIGH_KEYWORDS,
+    low_keywords=LOW_KEYWORDS,
+    manual_review_keywords=MANUAL_REVIEW_KEYWORDS,
+    complexity_keywords=COMPLEXITY_KEYWORDS,
+    sub_category_rules=SUB_CATEGORY_RULES,
+)
+KEYWORD_MATCHER = DEFAULT_TABLES.matcher
+
+
+def normalize_description(description: str) -> str:
+    """Normalize a description the way the classifier sees it."""
+    return description.lower().strip()
 
 
 class GrievanceClassifier:
     """Keyword-based classifier for DPDP grievance requests."""
 
+    def __init__(self, tables: KeywordTables = DEFAULT_TABLES) -> None:
+        self.tables = tables
+
     def classify(self, description: str, stated_type: str) -> ClassificationResult:
         """
         Classify a grievance based on description and stated type.
@@ -50,20 +172,30 @@ class GrievanceClassifier:
         Returns:
             ClassificationResult with classification details.
         """
-        desc_lower = description.lower().strip()
-        desc_words = set(re.findall(r"\b\w+\b", desc_lower))
+        hits = self.tables.matcher.find_all(normalize_description(description))
+        return self._classify_hits(hits, self._type_scores(hits, stated_type), stated_type)
 
+    def _type_scores(self, hits: frozenset[str], stated_type: str) -> dict[str, float]:
+        """Score each request type from the keywords found in the description."""
         # Score each request type by keyword matches
         scores: dict[str, float] = {}
-        for req_type, keywords in KEYWORD_MAP.items():
-            matches = sum(1 for kw in keywords if kw in desc_lower or kw in desc_words)
+        for req_type, keywords in self.tables.keyword_map.items():
+            matches = sum(1 for kw in keywords if kw in hits)
             # Normalize by number of keywords (max possible matches)
             scores[req_type] = min(1.0, matches / max(1, len(keywords) // 2))
 
         # If stated type has matches, boost its score
         if stated_type in scores:
             scores[stated_type] = min(1.0, scores[stated_type] + 0.2)
+        return scores
 
+    def _classify_hits(
+        self,
+        hits: frozenset[str],
+        scores: dict[str, float],
+        stated_type: str,
+    ) -> ClassificationResult:
+        """Build the result from keyword hits and per-type scores."""
         # Determine best match
         if scores:
             best_type = max(scores, key=scores.get)
@@ -73,17 +205,17 @@ class GrievanceClassifier:
             confidence = 0.4  # Low confidence when no keywords match
 
         # Determine sub_category based on type
-        sub_category = self._get_sub_category(best_type, desc_lower)
+        sub_category = self._get_sub_category(best_type, hits)
 
         # Determine priority
-        priority = self._get_priority(desc_lower)
+        priority = self._get_priority(hits)
 
         # Determine estimated_complexity
-        estimated_complexity = self._get_complexity(desc_lower, scores, best_type)
+        estimated_complexity = self._get_complexity(hits, scores, best_type)
 
         # Determine requires_manual_review
         requires_manual_review = self._requires_manual_review(
-            desc_lower, confidence
+            hits, confidence
         )
 
         return ClassificationResult(
@@ -95,43 +227,26 @@ class GrievanceClassifier:
             requires_manual_review=requires_manual_review,
         )
 
-    def _get_sub_category(self, request_type: str, desc_lower: str) -> str:
+    def _get_sub_category(self, request_type: str, hits: frozenset[str]) -> str:
         """Determine sub-category based on request type and description."""
-        if request_type == "erasure":
-            if "account" in desc_lower or "profile" in desc_lower:
-                return "account_deletion"
-            if "specific" in desc_lower or "certain" in desc_lower or "some" in desc_lower:
-                return "partial_erasure"
-            return "full_erasure"
-        if request_type == "access":
-            if "export" in desc_lower or "copy" in desc_lower:
-                return "data_export_request"
-            return "data_access_request"
-        if request_type == "correction":
-            if "name" in desc_lower or "address" in desc_lower:
-                return "personal_details_correction"
-            return "data_correction"
-        if request_type == "portability":
-            return "data_portability"
-        if request_type == "objection":
-            if "marketing" in desc_lower or "email" in desc_lower:
-                return "marketing_objection"
-            return "processing_objection"
-        return "general"
-
-    def _get_priority(self, desc_lower: str) -> Literal["low", "medium", "high", "critical"]:
+        for cues, sub_category in self.tables.sub_category_rules.get(request_type, ()):
+            if not cues or any(cue in hits for cue in cues):
+                return sub_category
+        return self.tables.default_sub_category
+
+    def _get_priority(self, hits: frozenset[str]) -> Literal["low", "medium", "high", "critical"]:
         """Determine priority based on description keywords."""
-        if any(kw in desc_lower for kw in CRITICAL_KEYWORDS):
+        if any(kw in hits for kw in self.tables.critical_keywords):
             return "critical"
-        if any(kw in desc_lower for kw in HIGH_KEYWORDS):
+        if any(kw in hits for kw in self.tables.high_keywords):
             return "high"
-        if any(kw in desc_lower for kw in LOW_KEYWORDS):
+        if any(kw in hits for kw in self.tables.low_keywords):
             return "low"
         return "medium"
 
     def _get_complexity(
         self,
-        desc_lower: str,
+        hits: frozenset[str],
         scores: dict[str, float],
         best_type: str,
     ) -> Literal["simple", "moderate", "complex"]:
@@ -142,7 +257,7 @@ class GrievanceClassifier:
             return "complex"
 
         # Legal terms mentioned
-        if any(kw in desc_lower for kw in ["legal", "court", "lawyer", "DPB", "complaint"]):
+        if any(kw in hits for kw in self.tables.complexity_keywords):
             return "complex"
 
         # Clear single type with high confidence
@@ -151,10 +266,10 @@ class GrievanceClassifier:
 
         return "moderate"
 
-    def _requires_manual_review(self, desc_lower: str, confidence: float) -> bool:
+    def _requires_manual_review(self, hits: frozenset[str], confidence: float) -> bool:
         """Determine if manual review is required."""
         if confidence < 0.6:
             return True
-        if any(kw in desc_lower for kw in MANUAL_REVIEW_KEYWORDS):
+        if any(kw in hits for kw in self.tables.manual_review_keywords):
             return True
         return False
@@ -0,0 +1,120 @@
+"""Runtime settings for the grievance bot, read from environment variables."""
+
+import os
+
+# Pre-forking production server (python -m app.serve): bind address and worker processes.
+# Analytics, SLA tracking and the dedup index are per worker, so one worker is the default
+SERVER_HOST = os.environ.get("GRIEVANCE_HOST", "0.0.0.0")
+SERVER_PORT = int(os.environ.get("GRIEVANCE_PORT", "8000"))
+SERVER_WORKERS = int(os.environ.get("GRIEVANCE_WORKERS", "1"))
+
+# Bulk requests with at least this many items use the vectorized batch engine
+BATCH_ENGINE_MIN_ITEMS = int(os.environ.get("GRIEVANCE_BATCH_ENGINE_MIN_ITEMS", "64"))
+
+# Streaming NDJSON bulk endpoint: items classified per chunk, and the longest input line accepted
+BULK_STREAM_CHUNK_SIZE = int(os.environ.get("GRIEVANCE_BULK_STREAM_CHUNK_SIZE", "256"))
+BULK_STREAM_MAX_LINE_BYTES = int(
+    os.environ.get("GRIEVANCE_BULK_STREAM_MAX_LINE_BYTES", str(1024 * 1024))
+)
+
+# Bulk responses at least this large are gzip/zstd compressed when accepted; 0 disables it
+RESPONSE_COMPRESSION_MIN_BYTES = int(
+    os.environ.get("GRIEVANCE_RESPONSE_COMPRESSION_MIN_BYTES", "1024")
+)
+
+# Learned classifier weights written by "python -m app.learned train"; empty uses keywords only
+CLASSIFIER_MODEL_PATH = os.environ.get("GRIEVANCE_CLASSIFIER_MODEL_PATH", "")
+
+# Shared classification result cache; a size of 0 disables it
+CLASSIFICATION_CACHE_MAX_ENTRIES = int(os.environ.get("GRIEVANCE_CACHE_MAX_ENTRIES", "10000"))
+CLASSIFICATION_CACHE_TTL_SECONDS = float(os.environ.get("GRIEVANCE_CACHE_TTL_SECONDS", "3600"))
+
+# Opt-in process pool for large bulk batches; 0 workers keeps everything in-process
+PARALLEL_WORKERS = int(os.environ.get("GRIEVANCE_PARALLEL_WORKERS", "0"))
+PARALLEL_MIN_ITEMS = int(os.environ.get("GRIEVANCE_PARALLEL_MIN_ITEMS", "5000"))
+PARALLEL_CHUNK_SIZE = int(os.environ.get("GRIEVANCE_PARALLEL_CHUNK_SIZE", "2000"))
+PARALLEL_START_METHOD = os.environ.get("GRIEVANCE_PARALLEL_START_METHOD", "spawn")
+
+# Micro-batching of concurrent single-grievance requests
+MICROBATCH_MAX_SIZE = int(os.environ.get("GRIEVANCE_MICROBATCH_MAX_SIZE", "64"))
+MICROBATCH_MAX_WAIT_MS = float(os.environ.get("GRIEVANCE_MICROBATCH_MAX_WAIT_MS", "2"))
+
+# Localized response template packs (<language>.json) and how many stay in memory
+TEMPLATE_DIR = os.environ.get(
+    "GRIEVANCE_TEMPLATE_DIR", os.path.join(os.path.dirname(__file__), "templates")
+)
+TEMPLATE_CACHE_MAX_LANGUAGES = int(os.environ.get("GRIEVANCE_TEMPLATE_CACHE_MAX_LANGUAGES", "8"))
+
+# Per-organization keyword configs (<org_id>.json); empty uses the built-in tables for everyone
+TENANT_KEYWORDS_DIR = os.environ.get("GRIEVANCE_TENANT_KEYWORDS_DIR", "")
+TENANT_KEYWORDS_CACHE_SIZE = int(os.environ.get("GRIEVANCE_TENANT_KEYWORDS_CACHE_SIZE", "256"))
+TENANT_KEYWORDS_CHECK_INTERVAL_SECONDS = float(
+    os.environ.get("GRIEVANCE_TENANT_KEYWORDS_CHECK_INTERVAL_SECONDS", "2")
+)
+
+# Near-duplicate detection: similarity threshold, and how long and how many grievances are
+# remembered (per worker; each entry takes about 3 KB)
+DEDUP_ENABLED = os.environ.get("GRIEVANCE_DEDUP_ENABLED", "1") == "1"
+DEDUP_THRESHOLD = float(os.environ.get("GRIEVANCE_DEDUP_THRESHOLD", "0.8"))
+DEDUP_WINDOW_HOURS = float(os.environ.get("GRIEVANCE_DEDUP_WINDOW_HOURS", "24"))
+DEDUP_MAX_ENTRIES = int(os.environ.get("GRIEVANCE_DEDUP_MAX_ENTRIES", "50000"))
+
+# Directory for local state files (snapshots, queues, allocator state)
+STATE_DIR = os.environ.get("GRIEVANCE_STATE_DIR", ".state")
+
+# Analytics aggregator: hourly rollup retention, per-org cap and snapshot schedule
+ANALYTICS_RETENTION_HOURS = int(os.environ.get("GRIEVANCE_ANALYTICS_RETENTION_HOURS", "168"))
+ANALYTICS_MAX_ORGS = int(os.environ.get("GRIEVANCE_ANALYTICS_MAX_ORGS", "10000"))
+ANALYTICS_SNAPSHOT_PATH = os.environ.get(
+    "GRIEVANCE_ANALYTICS_SNAPSHOT_PATH", os.path.join(STATE_DIR, "analytics.json")
+)
+ANALYTICS_SNAPSHOT_INTERVAL_SECONDS = float(
+    os.environ.get("GRIEVANCE_ANALYTICS_SNAPSHOT_INTERVAL_SECONDS", "60")
+)
+
+# Sampled slow-request capture for /metrics/slow-requests; can be switched at runtime
+SLOW_REQUEST_CAPTURE = os.environ.get("GRIEVANCE_SLOW_REQUEST_CAPTURE", "0") == "1"
+SLOW_REQUEST_SAMPLE_RATE = float(os.environ.get("GRIEVANCE_SLOW_REQUEST_SAMPLE_RATE", "1.0"))
+SLOW_REQUEST_THRESHOLD_MS = float(os.environ.get("GRIEVANCE_SLOW_REQUEST_THRESHOLD_MS", "250"))
+
+# Case IDs: a node ID per host or pod (random if unset) and the directory that
+# worker processes on the node lease their slots from
+CASE_ID_NODE_ID = (
+    int(os.environ["GRIEVANCE_CASE_ID_NODE_ID"])
+    if os.environ.get("GRIEVANCE_CASE_ID_NODE_ID")
+    else None
+)
+CASE_ID_LOCK_DIR = os.environ.get(
+    "GRIEVANCE_CASE_ID_LOCK_DIR", os.path.join(STATE_DIR, "case-ids")
+)
+
+# Asynchronous job mode: SQLite queue location, worker pool size and retry policy
+JOB_QUEUE_PATH = os.environ.get("GRIEVANCE_JOB_QUEUE_PATH", os.path.join(STATE_DIR, "jobs.sqlite3"))
+JOB_CONCURRENCY = int(os.environ.get("GRIEVANCE_JOB_CONCURRENCY", "8"))
+JOB_MAX_ATTEMPTS = int(os.environ.get("GRIEVANCE_JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_BACKOFF_SECONDS = float(os.environ.get("GRIEVANCE_JOB_RETRY_BACKOFF_SECONDS", "1"))
+JOB_LEASE_SECONDS = float(os.environ.get("GRIEVANCE_JOB_LEASE_SECONDS", "60"))
+JOB_POLL_INTERVAL_SECONDS = float(os.environ.get("GRIEVANCE_JOB_POLL_INTERVAL_SECONDS", "0.5"))
+JOB_MAX_WAIT_SECONDS = float(os.environ.get("GRIEVANCE_JOB_MAX_WAIT_SECONDS", "30"))
+JOB_RETENTION_HOURS = float(os.environ.get("GRIEVANCE_JOB_RETENTION_HOURS", "24"))
+
+# SLA deadline scheduler: warning lead time, wheel tick, recent events kept, how long
+# unresolved breached cases stay listed, snapshot location
+SLA_WARNING_HOURS = float(os.environ.get("GRIEVANCE_SLA_WARNING_HOURS", "72"))
+SLA_TICK_SECONDS = float(os.environ.get("GRIEVANCE_SLA_TICK_SECONDS", "60"))
+SLA_EVENT_BUFFER = int(os.environ.get("GRIEVANCE_SLA_EVENT_BUFFER", "1000"))
+SLA_BREACHED_RETENTION_DAYS = float(os.environ.get("GRIEVANCE_SLA_BREACHED_RETENTION_DAYS", "30"))
+SLA_SNAPSHOT_PATH = os.environ.get(
+    "GRIEVANCE_SLA_SNAPSHOT_PATH", os.path.join(STATE_DIR, "sla.json")
+)
+SLA_SNAPSHOT_INTERVAL_SECONDS = float(
+    os.environ.get("GRIEVANCE_SLA_SNAPSHOT_INTERVAL_SECONDS", "60")
+)
+
+# Ticket persistence: "sqlite:///path.db" or a postgresql:// DSN; empty disables it
+PERSISTENCE_URL = os.environ.get("GRIEVANCE_PERSISTENCE_URL", "")
+PERSISTENCE_BATCH_SIZE = int(os.environ.get("GRIEVANCE_PERSISTENCE_BATCH_SIZE", "500"))
+PERSISTENCE_FLUSH_INTERVAL_MS = float(
+    os.environ.get("GRIEVANCE_PERSISTENCE_FLUSH_INTERVAL_MS", "200")
+)
+PERSISTENCE_POOL_SIZE = int(os.environ.get("GRIEVANCE_PERSISTENCE_POOL_SIZE", "4"))
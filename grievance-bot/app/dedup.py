@@ -0,0 +1,242 @@
+"""Near-duplicate grievance detection with MinHash signatures and an LSH index."""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from typing import NamedTuple
+
+import numpy as np
+
+from app.classifier import normalize_description
+
+_MULTIPLIERS = np.array([1 << (8 * i) for i in range(8)], dtype=np.uint64)
+
+
+class DuplicateMatch(NamedTuple):
+    """An earlier grievance that a new one nearly duplicates."""
+
+    reference: str
+    similarity: float
+
+
+class _Entry(NamedTuple):
+    """One indexed grievance."""
+
+    reference: str
+    scope: str
+    signature: bytes
+    added_at: float
+
+
+class MinHasher:
+    """
+    MinHash signatures over byte shingles of a normalized description.
+
+    Each description is lowercased and whitespace-collapsed, cut into
+    overlapping ``shingle_size``-byte shingles, and hashed with
+    ``num_perm`` multiply-shift hash functions; the signature keeps each
+    function's minimum. The fraction of equal positions in two signatures
+    estimates the Jaccard similarity of their shingle sets.
+
+    Long descriptions are first reduced to the ``max_shingles`` shingles with
+    the lowest value of one more hash function. That bottom-k sample is taken
+    the same way for every description, so it still estimates the Jaccard
+    similarity, and signing costs at most ``max_shingles * num_perm`` hashes.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 64,
+        shingle_size: int = 5,
+        max_shingles: int = 256,
+        seed: int = 0x5EED,
+    ) -> None:
+        if not 1 <= shingle_size <= 8:
+            raise ValueError("shingle_size must be between 1 and 8 bytes")
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.max_shingles = max(1, max_shingles)
+        self._a = rng.integers(1, 1 << 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64)
+        self._sample_a, self._sample_b = (
+            rng.integers(1, 1 << 63, dtype=np.uint64) | np.uint64(1),
+            rng.integers(0, 1 << 63, dtype=np.uint64),
+        )
+
+    def signature(self, description: str) -> np.ndarray:
+        """Return the ``num_perm`` uint32 MinHash signature of a description."""
+        text = " ".join(normalize_description(description).split()).encode()
+        k = self.shingle_size
+        if len(text) < k:
+            text = text.ljust(k, b"\0")
+        windows = np.lib.stride_tricks.sliding_window_view(np.frombuffer(text, dtype=np.uint8), k)
+        shingles = np.unique(windows.astype(np.uint64) @ _MULTIPLIERS[:k])
+        if len(shingles) > self.max_shingles:
+            ranks = (shingles * self._sample_a + self._sample_b) >> np.uint64(32)
+            shingles = shingles[np.argpartition(ranks, self.max_shingles - 1)[: self.max_shingles]]
+        # uint64 arithmetic wraps, which is what multiply-shift hashing relies on
+        hashed = (shingles[:, None] * self._a + self._b) >> np.uint64(32)
+        return hashed.min(axis=0).astype(np.uint32)
+
+
+class NearDuplicateIndex:
+    """
+    In-memory LSH index of recent grievance signatures.
+
+    Signatures are split into ``bands`` bands; two grievances become
+    candidates when any band matches exactly, and are reported when their
+    estimated similarity reaches ``threshold``. Every band bucket keeps only
+    its ``bucket_size`` newest entries, so a lookup touches at most
+    ``bands * bucket_size`` candidates however large the index grows.
+    Entries older than ``window_seconds`` are evicted, as are the oldest once
+    ``max_entries`` is reached. Grievances only match within the same scope,
+    e.g. the same organization.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 64,
+        bands: int = 16,
+        window_seconds: float = 86_400.0,
+        max_entries: int = 50_000,
+        bucket_size: int = 8,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.window_seconds = window_seconds
+        self.max_entries = max(1, max_entries)
+        self.bucket_size = max(1, bucket_size)
+        self.hasher = MinHasher(num_perm=num_perm)
+        self._rows = num_perm // bands
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        # Lists rather than deques: most buckets hold one entry, and an empty
+        # deque costs more than a short list
+        self._buckets: dict[int, list[int]] = {}
+        self._next_id = 0
+        self.lookups = 0
+        self.matches = 0
+        self.evictions = 0
+
+    def check(
+        self,
+        description: str,
+        reference: str | None = None,
+        scope: str = "",
+    ) -> DuplicateMatch | None:
+        """
+        Find the closest earlier near-duplicate of a description.
+
+        Args:
+            description: Grievance text.
+            reference: If given, the description is added to the index under
+                this reference (a case ID, say) after the lookup.
+            scope: Only entries added with the same scope can match.
+
+        Returns:
+            The most similar indexed grievance at or above the threshold, or
+            None.
+        """
+        return self.check_many([description], [reference], scope)[0]
+
+    def check_many(
+        self,
+        descriptions: Sequence[str],
+        references: Sequence[str | None],
+        scope: str = "",
+    ) -> list[DuplicateMatch | None]:
+        """Check descriptions in order, adding those with a reference as they go."""
+        signatures = [self.hasher.signature(description) for description in descriptions]
+        matches: list[DuplicateMatch | None] = []
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            for signature, reference in zip(signatures, references):
+                band_keys = self._band_keys(signature, scope)
+                matches.append(self._best_match(signature, band_keys, scope))
+                if reference is not None:
+                    self._add(_Entry(reference, scope, signature.tobytes(), now), band_keys)
+            self.lookups += len(signatures)
+            self.matches += sum(match is not None for match in matches)
+        return matches
+
+    def stats(self) -> dict[str, int]:
+        """Return index size and lookup/match/eviction counters."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "lookups": self.lookups,
+                "matches": self.matches,
+                "evictions": self.evictions,
+            }
+
+    def _band_keys(self, signature: np.ndarray, scope: str) -> tuple[int, ...]:
+        """Bucket key per band, salted with the scope and band number."""
+        rows = signature.reshape(self.bands, self._rows)
+        return tuple(hash((scope, band, rows[band].tobytes())) for band in range(self.bands))
+
+    def _best_match(
+        self,
+        signature: np.ndarray,
+        band_keys: tuple[int, ...],
+        scope: str,
+    ) -> DuplicateMatch | None:
+        """Score every candidate sharing a band; the caller holds ``_lock``."""
+        candidates = {
+            entry_id
+            for key in band_keys
+            for entry_id in self._buckets.get(key, ())
+        }
+        best: DuplicateMatch | None = None
+        for entry_id in candidates:
+            entry = self._entries[entry_id]
+            if entry.scope != scope:
+                continue
+            stored = np.frombuffer(entry.signature, dtype=np.uint32)
+            similarity = float(np.count_nonzero(stored == signature)) / len(signature)
+            if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                best = DuplicateMatch(entry.reference, round(similarity, 4))
+        return best
+
+    def _add(self, entry: _Entry, band_keys: tuple[int, ...]) -> None:
+        """Index an entry, evicting the oldest if full; the caller holds ``_lock``."""
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = entry
+        for key in band_keys:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = []
+            bucket.append(entry_id)
+            if len(bucket) > self.bucket_size:
+                del bucket[0]
+        while len(self._entries) > self.max_entries:
+            self._evict_oldest()
+
+    def _expire(self, now: float) -> None:
+        """Evict entries older than the window; the caller holds ``_lock``."""
+        cutoff = now - self.window_seconds
+        while self._entries and next(iter(self._entries.values())).added_at < cutoff:
+            self._evict_oldest()
+
+    def _evict_oldest(self) -> None:
+        """Drop the oldest entry from the index; the caller holds ``_lock``."""
+        entry_id, entry = self._entries.popitem(last=False)
+        # Band keys are recomputed rather than stored, to keep entries small
+        signature = np.frombuffer(entry.signature, dtype=np.uint32)
+        for key in self._band_keys(signature, entry.scope):
+            bucket = self._buckets.get(key)
+            # Entries are evicted oldest first, so this one is at the front if still present
+            if bucket and bucket[0] == entry_id:
+                del bucket[0]
+                if not bucket:
+                    del self._buckets[key]
+        self.evictions += 1
@@ -0,0 +1,218 @@
+"""Content negotiation and compression for bulk API responses."""
+
+import functools
+import gzip
+import importlib
+from collections.abc import Callable, Collection, Mapping, Sequence
+from types import ModuleType
+from typing import Any
+
+from fastapi import Response
+from pydantic import BaseModel
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Optional encoders and the module each needs
+_MEDIA_TYPE_MODULES = {MSGPACK_MEDIA_TYPE: "msgpack", ARROW_MEDIA_TYPE: "pyarrow"}
+
+# Older clients still send the unregistered MessagePack type
+_ALIASES = {"application/x-msgpack": MSGPACK_MEDIA_TYPE}
+
+_GZIP_LEVEL = 6
+_ZSTD_LEVEL = 3
+
+# Bulk endpoints advertise the optional encodings in the OpenAPI schema
+BULK_RESPONSES: dict[int | str, dict[str, Any]] = {
+    200: {"content": {MSGPACK_MEDIA_TYPE: {}, ARROW_MEDIA_TYPE: {}}}
+}
+
+# Columns by name, each as (Python value type, values); None marks a missing value
+Table = Mapping[str, tuple[type, Sequence[Any]]]
+
+
+@functools.cache
+def _optional_module(name: str) -> ModuleType | None:
+    """Import an optional encoder dependency, or None if it is not installed."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def _weights(header: str | None) -> dict[str, float]:
+    """
+    Parse an Accept or Accept-Encoding header.
+
+    Returns:
+        Lowercased media types (or codings) mapped to their q-values, in the
+        order the client listed them.
+    """
+    weights: dict[str, float] = {}
+    for part in (header or "").split(","):
+        name, *params = (piece.strip() for piece in part.split(";"))
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        name = _ALIASES.get(name.lower(), name.lower())
+        weights[name] = max(quality, weights.get(name, 0.0))
+    return weights
+
+
+def _available(tabular: bool) -> list[str]:
+    """Media types this server can encode, JSON first."""
+    return [JSON_MEDIA_TYPE] + [
+        media_type
+        for media_type, module in _MEDIA_TYPE_MODULES.items()
+        if _optional_module(module) is not None and (tabular or media_type != ARROW_MEDIA_TYPE)
+    ]
+
+
+def negotiate(accept: str | None, tabular: bool = False) -> str:
+    """
+    Pick the response media type for a request's Accept header.
+
+    Each available type takes the q-value of the most specific range that
+    matches it (``application/json;q=0`` beats ``*/*``), and the highest
+    q-value wins. On a tie the type matched by the range listed first wins,
+    and JSON wins among types matched by the same wildcard, so clients
+    sending a missing header or ``*/*`` still get JSON. MessagePack and
+    Arrow IPC are only offered when their package is installed, and Arrow
+    only for ``tabular`` responses. A header no available type satisfies
+    also gets JSON rather than a 406, as clients got before negotiation.
+
+    Args:
+        accept: The Accept header, if any.
+        tabular: Whether the endpoint can render its result as a table.
+
+    Returns:
+        The chosen media type.
+    """
+    if not accept:
+        return JSON_MEDIA_TYPE
+    weights = _weights(accept)
+    positions = {name: position for position, name in enumerate(weights)}
+    candidates = []
+    for preference, media_type in enumerate(_available(tabular)):
+        major = media_type.split("/")[0]
+        for media_range in (media_type, f"{major}/*", "*/*"):
+            if media_range in weights:
+                if weights[media_range] > 0:
+                    candidates.append(
+                        (-weights[media_range], positions[media_range], preference, media_type)
+                    )
+                break
+    return min(candidates)[-1] if candidates else JSON_MEDIA_TYPE
+
+
+def _content_coding(accept_encoding: str | None) -> str | None:
+    """The preferred coding the client accepts: zstd if available, else gzip."""
+    weights = _weights(accept_encoding)
+    wildcard = weights.get("*", 0.0)
+    if weights.get("zstd", wildcard) > 0 and _optional_module("zstandard") is not None:
+        return "zstd"
+    if weights.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, accept_encoding: str | None, min_bytes: int) -> tuple[bytes, str | None]:
+    """
+    Compress a response body if it is large enough and the client accepts it.
+
+    Args:
+        body: Encoded response body.
+        accept_encoding: The request's Accept-Encoding header, if any.
+        min_bytes: Smallest body worth compressing; 0 never compresses.
+
+    Returns:
+        The body to send and its Content-Encoding, or None if left as is.
+    """
+    if min_bytes <= 0 or len(body) < min_bytes:
+        return body, None
+    coding = _content_coding(accept_encoding)
+    if coding == "zstd":
+        zstandard = _optional_module("zstandard")
+        return zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(body), coding
+    if coding == "gzip":
+        return gzip.compress(body, compresslevel=_GZIP_LEVEL, mtime=0), coding
+    return body, None
+
+
+def arrow_stream(table: Table, categorical: Collection[str] = ()) -> bytes:
+    """
+    Encode columns as a single-batch Arrow IPC stream.
+
+    Column types come from the table, not the values, so the schema stays the
+    same for every response, including ones where a column is all missing.
+
+    Args:
+        table: Columns of equal length; value types are str, float, int or bool.
+        categorical: String columns to dictionary-encode, so each distinct
+            value is stored once and rows hold the narrowest integer index.
+
+    Returns:
+        The IPC stream bytes.
+    """
+    pa = _optional_module("pyarrow")
+    arrow_types = {str: pa.string(), float: pa.float64(), int: pa.int64(), bool: pa.bool_()}
+    arrays = []
+    for name, (value_type, values) in table.items():
+        array = pa.array(values, type=arrow_types[value_type])
+        if name in categorical:
+            array = array.dictionary_encode()
+            index_type = next(
+                index_type
+                for index_type in (pa.int8(), pa.int16(), pa.int32())
+                if len(array.dictionary) <= 2 ** (index_type.bit_width - 1)
+            )
+            array = array.cast(pa.dictionary(index_type, pa.string()))
+        arrays.append(array)
+    batch = pa.RecordBatch.from_arrays(arrays, names=list(table))
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def encoded_response(
+    model: BaseModel,
+    media_type: str,
+    accept_encoding: str | None,
+    min_compress_bytes: int,
+    table: Callable[[], Table] | None = None,
+    categorical: Collection[str] = (),
+) -> Response:
+    """
+    Serialize a response model in a negotiated media type, compressed if large.
+
+    Args:
+        model: The validated response model.
+        media_type: A media type returned by ``negotiate``.
+        accept_encoding: The request's Accept-Encoding header, if any.
+        min_compress_bytes: Compression threshold; see ``compress``.
+        table: Builds the columns for Arrow IPC; required for that type.
+        categorical: Columns of ``table`` to dictionary-encode.
+
+    Returns:
+        A response that bypasses FastAPI's response_model serialization.
+    """
+    if media_type == MSGPACK_MEDIA_TYPE:
+        body = _optional_module("msgpack").packb(model.model_dump(mode="json"))
+    elif media_type == ARROW_MEDIA_TYPE:
+        body = arrow_stream(table(), categorical)
+    else:
+        body = model.model_dump_json().encode()
+    body, coding = compress(body, accept_encoding, min_compress_bytes)
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if coding is not None:
+        headers["Content-Encoding"] = coding
+    return Response(content=body, media_type=media_type, headers=headers)
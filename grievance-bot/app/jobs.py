@@ -0,0 +1,365 @@
+"""Durable SQLite-backed job queue and worker pool for asynchronous processing."""
+
+import asyncio
+import contextlib
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Iterator, Sequence
+from dataclasses import dataclass
+
+from fastapi.concurrency import run_in_threadpool
+
+TERMINAL_STATUSES = ("done", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    principal TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    available_at REAL NOT NULL,
+    lease_expires REAL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_seq ON jobs(status, seq);
+CREATE INDEX IF NOT EXISTS idx_jobs_principal_status ON jobs(principal, status, seq);
+"""
+
+# Oldest unfinished job per principal, if it is due: queued and past its retry
+# time, or running under a lease that has expired
+_CLAIM_SQL = """
+SELECT seq, id, payload, attempts, created_at FROM jobs AS j
+WHERE (
+    (j.status = 'queued' AND j.available_at <= :now)
+    OR (j.status = 'running' AND j.lease_expires < :now)
+  )
+  AND NOT EXISTS (
+    SELECT 1 FROM jobs AS o
+    WHERE o.principal = j.principal AND o.seq < j.seq AND o.status IN ('queued', 'running')
+  )
+ORDER BY seq
+LIMIT :limit
+"""
+
+
+@dataclass(frozen=True)
+class Job:
+    """One queued unit of work."""
+
+    id: str
+    status: str
+    attempts: int
+    payload: str
+    result: str | None
+    error: str | None
+    created_at: float
+    updated_at: float
+
+
+class JobQueue:
+    """
+    Durable FIFO queue of jobs in a local SQLite database.
+
+    Jobs are keyed by a principal and claimed in submission order, at most
+    one at a time per principal, so a data principal's grievances are
+    processed in the order they arrived. A claimed job holds a lease that its
+    worker renews while the job runs; if the worker dies the lease expires
+    and the job is claimed again. Failed attempts are retried with
+    exponential backoff up to ``max_attempts``, keeping their place in the
+    principal's order. The database is opened in WAL mode so several worker
+    processes can share it.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_attempts: int = 3,
+        retry_backoff_seconds: float = 1.0,
+        lease_seconds: float = 60.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.max_attempts = max(1, max_attempts)
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.lease_seconds = lease_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def submit(self, principal: str, payload: str) -> str:
+        """Queue one job and return its ID."""
+        return self.submit_many([(principal, payload)])[0]
+
+    def submit_many(self, jobs: Sequence[tuple[str, str]]) -> list[str]:
+        """Queue (principal, payload) jobs in one transaction, in order."""
+        now = self._clock()
+        ids = [uuid.uuid4().hex for _ in jobs]
+        rows = [
+            (job_id, principal, payload, now, now, now)
+            for job_id, (principal, payload) in zip(ids, jobs)
+        ]
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT INTO jobs (id, principal, payload, available_at, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return ids
+
+    def claim(self, limit: int) -> list[Job]:
+        """Lease up to ``limit`` claimable jobs for this worker."""
+        now = self._clock()
+        with self._transaction() as conn:
+            # Jobs whose worker died on their last attempt are not retried again
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'lease expired', updated_at = ?"
+                " WHERE status = 'running' AND lease_expires < ? AND attempts >= ?",
+                (now, now, self.max_attempts),
+            )
+            rows = conn.execute(_CLAIM_SQL, {"now": now, "limit": limit}).fetchall()
+            conn.executemany(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1,"
+                " lease_expires = ?, updated_at = ? WHERE seq = ?",
+                [(now + self.lease_seconds, now, seq) for seq, *_ in rows],
+            )
+        return [
+            Job(
+                id=job_id,
+                status="running",
+                attempts=attempts + 1,
+                payload=payload,
+                result=None,
+                error=None,
+                created_at=created_at,
+                updated_at=now,
+            )
+            for _, job_id, payload, attempts, created_at in rows
+        ]
+
+    def renew(self, job_ids: Sequence[str]) -> None:
+        """Extend the leases of running jobs this worker still holds."""
+        now = self._clock()
+        with self._transaction() as conn:
+            conn.executemany(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ?"
+                " WHERE id = ? AND status = 'running'",
+                [(now + self.lease_seconds, now, job_id) for job_id in job_ids],
+            )
+
+    def complete(self, job_id: str, result: str) -> None:
+        """Store a job's result."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL,"
+                " lease_expires = NULL, updated_at = ? WHERE id = ?",
+                (result, self._clock(), job_id),
+            )
+
+    def fail(self, job_id: str, attempts: int, error: str) -> None:
+        """Record a failed attempt, scheduling a retry if attempts remain."""
+        now = self._clock()
+        with self._transaction() as conn:
+            if attempts >= self.max_attempts:
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, lease_expires = NULL,"
+                    " updated_at = ? WHERE id = ?",
+                    (error, now, job_id),
+                )
+            else:
+                retry_at = now + self.retry_backoff_seconds * 2 ** (attempts - 1)
+                conn.execute(
+                    "UPDATE jobs SET status = 'queued', error = ?, available_at = ?,"
+                    " lease_expires = NULL, updated_at = ? WHERE id = ?",
+                    (error, retry_at, now, job_id),
+                )
+
+    def get(self, job_id: str) -> Job | None:
+        """Fetch a job by ID."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT id, status, attempts, payload, result, error, created_at, updated_at"
+                " FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        return Job(*row) if row is not None else None
+
+    def purge(self, older_than_seconds: float) -> int:
+        """Delete finished jobs last updated more than ``older_than_seconds`` ago."""
+        cutoff = self._clock() - older_than_seconds
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'failed') AND updated_at < ?",
+                (cutoff,),
+            )
+        return cursor.rowcount
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of jobs in each status."""
+        with self._lock:
+            counts = dict(
+                self._connect().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+            )
+        return {status: counts.get(status, 0) for status in ("queued", "running", *TERMINAL_STATUSES)}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in one write transaction on the shared connection."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use; the caller holds ``_lock``."""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, isolation_level=None, check_same_thread=False, timeout=30
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+
+class JobRunner:
+    """
+    Drains a JobQueue with at most ``concurrency`` jobs in flight.
+
+    A dispatcher task claims jobs whenever a slot is free, waking up on new
+    submissions and finished jobs from this process and otherwise every
+    ``poll_interval`` seconds to pick up work queued by other processes.
+    ``handler`` turns a job payload into its result payload; an exception
+    counts as a failed attempt. Leases of in-flight jobs are renewed every
+    third of the queue's lease, so a long job is not claimed a second time.
+    Finished jobs are purged after ``retention_seconds``.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handler: Callable[[str], Awaitable[str]],
+        concurrency: int = 4,
+        poll_interval: float = 0.5,
+        retention_seconds: float = 86_400.0,
+    ) -> None:
+        self.queue = queue
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self._next_purge = 0.0
+        self._next_renewal = 0.0
+        self._handler = handler
+        self._running: set[asyncio.Task[None]] = set()
+        self._in_flight: set[str] = set()
+        self._dispatcher: asyncio.Task[None] | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._finished: asyncio.Event | None = None
+
+    def start(self) -> None:
+        """Start the dispatcher on the running event loop."""
+        self._wakeup = asyncio.Event()
+        self._finished = asyncio.Event()
+        self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+
+    async def stop(self) -> None:
+        """Stop claiming work and wait for in-flight jobs to finish."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._dispatcher
+            self._dispatcher = None
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    def notify(self) -> None:
+        """Tell the dispatcher new jobs were submitted."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def wait(self, job_id: str, timeout: float) -> Job | None:
+        """
+        Long-poll a job until it finishes or ``timeout`` seconds pass.
+
+        Args:
+            job_id: Job to wait for.
+            timeout: Maximum seconds to wait; 0 returns immediately.
+
+        Returns:
+            The job in its latest state, or None if it does not exist.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            finished = self._finished
+            job = await run_in_threadpool(self.queue.get, job_id)
+            remaining = deadline - time.monotonic()
+            if job is None or job.status in TERMINAL_STATUSES or remaining <= 0:
+                return job
+            # Jobs run by this process signal completion; others are polled
+            with contextlib.suppress(asyncio.TimeoutError):
+                if finished is None:
+                    await asyncio.sleep(min(remaining, self.poll_interval))
+                else:
+                    await asyncio.wait_for(
+                        finished.wait(), timeout=min(remaining, self.poll_interval)
+                    )
+
+    async def _dispatch(self) -> None:
+        """Claim jobs into free slots until cancelled."""
+        assert self._wakeup is not None
+        while True:
+            self._wakeup.clear()
+            if time.monotonic() >= self._next_purge:
+                await run_in_threadpool(self.queue.purge, self.retention_seconds)
+                self._next_purge = time.monotonic() + min(self.retention_seconds, 3600)
+            if self._in_flight and time.monotonic() >= self._next_renewal:
+                await run_in_threadpool(self.queue.renew, list(self._in_flight))
+                self._next_renewal = time.monotonic() + self.queue.lease_seconds / 3
+            free = self.concurrency - len(self._running)
+            if free > 0:
+                for job in await run_in_threadpool(self.queue.claim, free):
+                    self._in_flight.add(job.id)
+                    task = asyncio.get_running_loop().create_task(self._run(job))
+                    self._running.add(task)
+                    task.add_done_callback(self._running.discard)
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+
+    async def _run(self, job: Job) -> None:
+        """Run one job and record its outcome."""
+        try:
+            result = await self._handler(job.payload)
+        except Exception as exc:
+            await run_in_threadpool(self.queue.fail, job.id, job.attempts, repr(exc))
+        else:
+            await run_in_threadpool(self.queue.complete, job.id, result)
+        finally:
+            self._in_flight.discard(job.id)
+        # Wake long-pollers, and the dispatcher since the principal's next job is free
+        assert self._finished is not None and self._wakeup is not None
+        self._finished.set()
+        self._finished = asyncio.Event()
+        self._wakeup.set()
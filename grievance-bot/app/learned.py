@@ -0,0 +1,426 @@
+"""
+Learned request-type classifier: hashed n-gram naive Bayes with memory-mapped weights.
+
+Train a model from labelled CSVs (columns ``description``, ``request_type`` and
+optionally ``stated_type``), then point GRIEVANCE_CLASSIFIER_MODEL_PATH at it.
+Rows without a stated type get the neutral ``NO_STATED_TYPE``, never their label,
+which would teach the model to echo the stated type:
+
+    python -m app.learned train data/*.csv --output model.bin
+    python -m app.learned evaluate model.bin holdout.csv
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import math
+import random
+import re
+import struct
+import sys
+import zlib
+from collections.abc import Sequence
+
+import numpy as np
+
+from app.classifier import (
+    DEFAULT_TABLES,
+    GrievanceClassifier,
+    KeywordTables,
+    normalize_description,
+)
+from app.models import ClassificationResult
+
+MAGIC = b"GRVNB01\n"
+_HEADER_LENGTH = struct.Struct("<I")
+_ALIGNMENT = 64
+
+# Whole tokens only, so "port" never matches inside "report"
+_TOKEN = re.compile(r"[^\s\"'`.,;:!?()\[\]{}<>/\\|*#=+~-]+")
+
+# Stated type of training rows that have none; one shared token carries no signal
+NO_STATED_TYPE = ""
+
+# Candidate softmax temperatures for calibrating confidence on held-out data
+_TEMPERATURES = np.geomspace(0.05, 20.0, 80)
+
+
+# Odd 64-bit multipliers mixing two token hashes into a bigram hash
+_BIGRAM_LEFT = np.uint64(0x9E3779B97F4A7C15)
+_BIGRAM_MIX = np.uint64(0xBF58476D1CE4E5B9)
+
+
+def feature_matrix(
+    descriptions: Sequence[str],
+    stated_types: Sequence[str],
+    n_features: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Binary hashed features of a batch in CSR form: (row offsets, columns).
+
+    Features are the unigrams and adjacent-word bigrams of each normalized
+    description, plus its stated type, hashed into ``n_features`` (a power
+    of two) buckets. Each distinct token is hashed once per batch; bigram
+    hashes are mixed from their tokens' hashes in bulk. Every row has at
+    least the stated-type feature, and its columns are sorted.
+    """
+    rows = [_TOKEN.findall(normalize_description(d)) for d in descriptions]
+    lengths = np.fromiter((len(tokens) for tokens in rows), dtype=np.int64, count=len(rows))
+    tokens = [token for row in rows for token in row]
+    hashes = {token: zlib.crc32(token.encode()) for token in set(tokens)}
+    unigrams = np.fromiter(map(hashes.__getitem__, tokens), dtype=np.uint64, count=len(tokens))
+    row_of = np.repeat(np.arange(len(rows), dtype=np.int64), lengths)
+
+    # A bigram pairs each token with the next one in the same grievance
+    same_row = row_of[:-1] == row_of[1:]
+    bigrams = ((unigrams[:-1] * _BIGRAM_LEFT) ^ unigrams[1:]) * _BIGRAM_MIX >> np.uint64(32)
+    stated = np.array(
+        [zlib.crc32(f"\x00stated:{stated_type}".encode()) for stated_type in stated_types],
+        dtype=np.uint64,
+    )
+
+    mask = np.uint64(n_features - 1)
+    keys = np.concatenate(
+        (
+            row_of * n_features + (unigrams & mask).astype(np.int64),
+            row_of[:-1][same_row] * n_features + (bigrams[same_row] & mask).astype(np.int64),
+            np.arange(len(rows), dtype=np.int64) * n_features + (stated & mask).astype(np.int64),
+        )
+    )
+    keys.sort()
+    keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+    indptr = np.searchsorted(keys, np.arange(len(rows) + 1, dtype=np.int64) * n_features)
+    return indptr, keys % n_features
+
+
+class HashedNaiveBayes:
+    """
+    Multinomial naive Bayes over binary hashed n-gram features.
+
+    Per-class log likelihoods are kept in an ``n_features`` x classes float32
+    matrix; ``load`` memory-maps it read-only, so every process serving the
+    same file shares one copy through the page cache. Posteriors are
+    softmaxed at a temperature fitted on held-out data, which makes the
+    top probability usable as a calibrated confidence.
+    """
+
+    def __init__(
+        self,
+        classes: Sequence[str],
+        log_priors: np.ndarray,
+        weights: np.ndarray,
+        temperature: float = 1.0,
+        version: str | None = None,
+    ) -> None:
+        self.classes = list(classes)
+        self.log_priors = np.asarray(log_priors, dtype=np.float64)
+        self.weights = weights
+        self.n_features = weights.shape[0]
+        self.temperature = temperature
+        # Loaded models reuse the stored fingerprint instead of reading every page
+        self.version = version or hashlib.blake2b(
+            json.dumps([self.classes, self.log_priors.tolist(), temperature]).encode()
+            + np.ascontiguousarray(weights).tobytes(),
+            digest_size=8,
+        ).hexdigest()
+
+    @classmethod
+    def fit(
+        cls,
+        descriptions: Sequence[str],
+        labels: Sequence[str],
+        stated_types: Sequence[str],
+        n_features: int = 1 << 18,
+        alpha: float = 0.5,
+    ) -> "HashedNaiveBayes":
+        """
+        Estimate a model from labelled grievances.
+
+        Args:
+            descriptions: Grievance texts.
+            labels: True request type of each grievance.
+            stated_types: Request type each data principal stated.
+            n_features: Hash buckets; must be a power of two.
+            alpha: Additive smoothing.
+
+        Returns:
+            The fitted model, at temperature 1.
+        """
+        if n_features & (n_features - 1):
+            raise ValueError("n_features must be a power of two")
+        classes = sorted(set(labels))
+        label_index = np.array([classes.index(label) for label in labels], dtype=np.int64)
+        indptr, columns = feature_matrix(descriptions, stated_types, n_features)
+        rows = np.repeat(label_index, np.diff(indptr))
+        counts = np.zeros((n_features, len(classes)))
+        np.add.at(counts, (columns, rows), 1.0)
+        log_likelihood = np.log(counts + alpha) - np.log(counts.sum(axis=0) + alpha * n_features)
+        class_counts = np.bincount(label_index, minlength=len(classes))
+        return cls(
+            classes,
+            np.log(class_counts / class_counts.sum()),
+            log_likelihood.astype(np.float32),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "HashedNaiveBayes":
+        """Open a model file, memory-mapping its weights."""
+        with open(path, "rb") as fh:
+            if fh.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a grievance classifier model")
+            (length,) = _HEADER_LENGTH.unpack(fh.read(_HEADER_LENGTH.size))
+            header = json.loads(fh.read(length))
+        offset = _weights_offset(length)
+        weights = np.memmap(
+            path,
+            dtype="<f4",
+            mode="r",
+            offset=offset,
+            shape=(header["n_features"], len(header["classes"])),
+        )
+        return cls(
+            header["classes"],
+            np.array(header["log_priors"]),
+            weights,
+            header["temperature"],
+            header["version"],
+        )
+
+    def save(self, path: str) -> None:
+        """Write the model as a header followed by aligned little-endian float32 weights."""
+        header = json.dumps(
+            {
+                "classes": self.classes,
+                "n_features": self.n_features,
+                "log_priors": self.log_priors.tolist(),
+                "temperature": self.temperature,
+                "version": self.version,
+            }
+        ).encode()
+        offset = _weights_offset(len(header))
+        with open(path, "wb") as fh:
+            fh.write(MAGIC + _HEADER_LENGTH.pack(len(header)) + header)
+            fh.write(b"\0" * (offset - fh.tell()))
+            fh.write(np.ascontiguousarray(self.weights, dtype="<f4").tobytes())
+
+    def log_posteriors(
+        self,
+        descriptions: Sequence[str],
+        stated_types: Sequence[str],
+    ) -> np.ndarray:
+        """Unnormalized class log posteriors, one row per grievance."""
+        indptr, columns = feature_matrix(descriptions, stated_types, self.n_features)
+        # Every row has at least one feature, so reduceat never sees an empty segment
+        summed = np.add.reduceat(self.weights[columns], indptr[:-1], axis=0, dtype=np.float64)
+        return summed + self.log_priors
+
+    def predict_proba(
+        self,
+        descriptions: Sequence[str],
+        stated_types: Sequence[str],
+    ) -> np.ndarray:
+        """Calibrated class probabilities, one row per grievance."""
+        return _softmax(self.log_posteriors(descriptions, stated_types) / self.temperature)
+
+    def fit_temperature(
+        self,
+        descriptions: Sequence[str],
+        labels: Sequence[str],
+        stated_types: Sequence[str],
+    ) -> float:
+        """Return the temperature minimizing log loss on held-out grievances."""
+        logits = self.log_posteriors(descriptions, stated_types)
+        targets = np.array([self.classes.index(label) for label in labels])
+        losses = [_log_loss(_softmax(logits / t), targets) for t in _TEMPERATURES]
+        return float(_TEMPERATURES[int(np.argmin(losses))])
+
+    def with_temperature(self, temperature: float) -> "HashedNaiveBayes":
+        """Return the same model softmaxed at another temperature."""
+        return HashedNaiveBayes(self.classes, self.log_priors, self.weights, temperature)
+
+
+class StatisticalClassifier(GrievanceClassifier):
+    """
+    GrievanceClassifier whose request type and confidence come from a learned model.
+
+    The model's calibrated probabilities replace the keyword type scores;
+    sub-category, priority, complexity and manual review are still derived
+    from the keyword tables, so results keep the ClassificationResult
+    contract. ``classify_batch`` scores a whole batch with one gather over
+    the weight matrix.
+    """
+
+    def __init__(self, model: HashedNaiveBayes, tables: KeywordTables = DEFAULT_TABLES) -> None:
+        super().__init__(tables)
+        unknown = set(model.classes) - set(tables.keyword_map)
+        if unknown:
+            raise ValueError(f"model predicts unknown request types: {sorted(unknown)}")
+        self.model = model
+        self.version = model.version
+
+    @classmethod
+    def load(cls, path: str) -> "StatisticalClassifier":
+        """Load a model file for the built-in keyword tables."""
+        return cls(HashedNaiveBayes.load(path))
+
+    def classify(self, description: str, stated_type: str) -> ClassificationResult:
+        """Classify one grievance."""
+        return self.classify_batch([description], [stated_type])[0]
+
+    def classify_batch(
+        self,
+        descriptions: Sequence[str],
+        stated_types: Sequence[str],
+    ) -> list[ClassificationResult]:
+        """
+        Classify a batch of grievances.
+
+        Args:
+            descriptions: Grievance description texts.
+            stated_types: Request type stated for each description.
+
+        Returns:
+            One ClassificationResult per description, in input order.
+        """
+        if not descriptions:
+            return []
+        probabilities = self.model.predict_proba(descriptions, stated_types).tolist()
+        find_all = self.tables.matcher.find_all
+        return [
+            self._classify_hits(
+                find_all(normalize_description(description)),
+                dict(zip(self.model.classes, row)),
+                stated_type,
+            )
+            for description, stated_type, row in zip(descriptions, stated_types, probabilities)
+        ]
+
+
+def _weights_offset(header_length: int) -> int:
+    """File offset of the weight matrix, aligned for the memory map."""
+    end = len(MAGIC) + _HEADER_LENGTH.size + header_length
+    return -(-end // _ALIGNMENT) * _ALIGNMENT
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    """Row-wise softmax."""
+    shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return shifted / shifted.sum(axis=1, keepdims=True)
+
+
+def _log_loss(probabilities: np.ndarray, targets: np.ndarray) -> float:
+    """Mean negative log likelihood of the true classes."""
+    picked = probabilities[np.arange(len(targets)), targets]
+    return float(-np.mean(np.log(np.clip(picked, 1e-12, None))))
+
+
+def read_labelled(paths: Sequence[str]) -> tuple[list[str], list[str], list[str]]:
+    """
+    Read (descriptions, labels, stated types) from labelled CSV files.
+
+    A missing or empty ``stated_type`` reads as ``NO_STATED_TYPE``.
+    """
+    descriptions: list[str] = []
+    labels: list[str] = []
+    stated_types: list[str] = []
+    for path in paths:
+        with open(path, newline="", encoding="utf-8") as fh:
+            for row in csv.DictReader(fh):
+                label = (row.get("request_type") or "").strip().lower()
+                if not label or not row.get("description"):
+                    continue
+                descriptions.append(row["description"])
+                labels.append(label)
+                stated_types.append((row.get("stated_type") or NO_STATED_TYPE).strip().lower())
+    return descriptions, labels, stated_types
+
+
+def _report(
+    model: HashedNaiveBayes,
+    descriptions: list[str],
+    labels: list[str],
+    stated: list[str],
+) -> str:
+    """Accuracy and log loss of a model on labelled grievances."""
+    probabilities = model.predict_proba(descriptions, stated)
+    targets = np.array([model.classes.index(label) for label in labels])
+    accuracy = float(np.mean(probabilities.argmax(axis=1) == targets))
+    return f"accuracy {accuracy:.4f}, log loss {_log_loss(probabilities, targets):.4f}"
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    commands = parser.add_subparsers(dest="command", required=True)
+    train = commands.add_parser("train", help="fit a model on labelled CSVs")
+    train.add_argument("csv", nargs="+")
+    train.add_argument("--output", "-o", required=True)
+    train.add_argument("--bits", type=int, default=18, help="log2 of the hashed feature count")
+    train.add_argument("--alpha", type=float, default=0.5, help="additive smoothing")
+    train.add_argument(
+        "--holdout", type=float, default=0.1, help="fraction held out to calibrate confidence"
+    )
+    train.add_argument("--seed", type=int, default=0)
+    evaluate = commands.add_parser("evaluate", help="score a model on labelled CSVs")
+    evaluate.add_argument("model")
+    evaluate.add_argument("csv", nargs="+")
+    args = parser.parse_args(argv)
+
+    if args.command == "evaluate":
+        model = HashedNaiveBayes.load(args.model)
+        descriptions, labels, stated = read_labelled(args.csv)
+        unknown = set(labels) - set(model.classes)
+        if unknown:
+            print(f"labels the model does not know: {sorted(unknown)}", file=sys.stderr)
+            return 1
+        print(f"{len(labels)} grievances: {_report(model, descriptions, labels, stated)}")
+        return 0
+
+    descriptions, labels, stated = read_labelled(args.csv)
+    unknown = set(labels) - set(DEFAULT_TABLES.keyword_map)
+    if unknown:
+        print(f"unknown request types in training data: {sorted(unknown)}", file=sys.stderr)
+        return 1
+    if not labels:
+        print("no labelled rows found", file=sys.stderr)
+        return 1
+
+    order = list(range(len(labels)))
+    random.Random(args.seed).shuffle(order)
+    cut = len(order) - math.floor(len(order) * args.holdout)
+    train_rows, held_rows = order[:cut], order[cut:]
+    n_features = 1 << args.bits
+    temperature = 1.0
+    if held_rows:
+        held = (
+            [descriptions[i] for i in held_rows],
+            [labels[i] for i in held_rows],
+            [stated[i] for i in held_rows],
+        )
+        model = HashedNaiveBayes.fit(
+            [descriptions[i] for i in train_rows],
+            [labels[i] for i in train_rows],
+            [stated[i] for i in train_rows],
+            n_features=n_features,
+            alpha=args.alpha,
+        )
+        print(f"holdout, uncalibrated: {_report(model, *held)}")
+        temperature = model.fit_temperature(*held)
+        calibrated = model.with_temperature(temperature)
+        print(f"holdout, temperature {temperature:.3f}: {_report(calibrated, *held)}")
+
+    # Refit on everything, keeping the calibrated temperature
+    model = HashedNaiveBayes.fit(
+        descriptions, labels, stated, n_features=n_features, alpha=args.alpha
+    ).with_temperature(temperature)
+    model.save(args.output)
+    print(
+        f"wrote {args.output}: {len(labels)} grievances, {len(model.classes)} classes,"
+        f" 2^{args.bits} features, version {model.version}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
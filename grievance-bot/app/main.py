@@ -1,14 +1,134 @@
 """Yojak Grievance Bot API - FastAPI application."""
 
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+
+from app import process_stats
+from app.config import (
+    ANALYTICS_SNAPSHOT_INTERVAL_SECONDS,
+    ANALYTICS_SNAPSHOT_PATH,
+    SLA_SNAPSHOT_INTERVAL_SECONDS,
+    SLA_SNAPSHOT_PATH,
+    SLA_TICK_SECONDS,
+)
+from app.metrics import MetricsMiddleware, registry, slow_requests
+from app.models import SlowRequestSettings
+from app.pipeline import (
+    classification_cache,
+    classify_batcher,
+    parallel_classifier,
+    tenant_keywords,
+)
+from app.routes import (
+    analytics,
+    duplicate_index,
+    job_queue,
+    job_runner,
+    responder,
+    router,
+    sla_scheduler,
+    ticket_writer,
+)
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def _worker_path(application: FastAPI, path: str) -> str:
+    """
+    Snapshot path for this worker.
+
+    Prefork workers (see ``app.serve``) each hold their own analytics and SLA
+    cases, so each snapshots to a file named after its slot, e.g.
+    ``sla.2.json``; a single worker uses ``path`` as is.
+    """
+    slot = getattr(application.state, "worker_slot", None)
+    if not path or slot is None:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{slot}{ext}"
+
+
+async def _snapshot_analytics(path: str) -> None:
+    """Periodically persist the analytics aggregator."""
+    while True:
+        await asyncio.sleep(ANALYTICS_SNAPSHOT_INTERVAL_SECONDS)
+        await run_in_threadpool(analytics.save, path)
+
+
+async def _run_sla_scheduler(snapshot_path: str) -> None:
+    """Fire due SLA events every tick and periodically snapshot open cases."""
+    next_snapshot = time.monotonic() + SLA_SNAPSHOT_INTERVAL_SECONDS
+    while True:
+        await asyncio.sleep(SLA_TICK_SECONDS)
+        await run_in_threadpool(sla_scheduler.advance)
+        if snapshot_path and time.monotonic() >= next_snapshot:
+            await run_in_threadpool(sla_scheduler.save, snapshot_path)
+            next_snapshot = time.monotonic() + SLA_SNAPSHOT_INTERVAL_SECONDS
+
+
+@asynccontextmanager
+async def lifespan(application: FastAPI) -> AsyncIterator[None]:
+    """
+    Restore analytics and open SLA cases, and start the job runner and SLA
+    scheduler on startup.
+
+    On shutdown, let in-flight jobs finish, flush pending tickets, snapshot
+    analytics and SLA cases, and stop worker processes.
+    """
+    analytics_path = _worker_path(application, ANALYTICS_SNAPSHOT_PATH)
+    sla_path = _worker_path(application, SLA_SNAPSHOT_PATH)
+    if analytics_path:
+        analytics.load(analytics_path)
+        snapshot_task = asyncio.create_task(_snapshot_analytics(analytics_path))
+    if sla_path:
+        sla_scheduler.load(sla_path)
+    sla_task = asyncio.create_task(_run_sla_scheduler(sla_path))
+    job_runner.start()
+    startup_seconds = process_stats.mark_ready()
+    memory = process_stats.memory_stats()
+    logger.info(
+        "Worker %d ready in %.0f ms (rss %.1f MiB, pss %.1f MiB, shared %.1f MiB)",
+        os.getpid(),
+        startup_seconds * 1000,
+        memory["rss"] / 2**20,
+        memory["pss"] / 2**20,
+        memory["shared"] / 2**20,
+    )
+    yield
+    await job_runner.stop()
+    job_queue.close()
+    sla_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await sla_task
+    if sla_path:
+        sla_scheduler.save(sla_path)
+    if ticket_writer is not None:
+        await run_in_threadpool(ticket_writer.close)
+    if analytics_path:
+        snapshot_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await snapshot_task
+        analytics.save(analytics_path)
+    if parallel_classifier is not None:
+        parallel_classifier.shutdown()
 
-from app.routes import router
 
 app = FastAPI(
     title="Yojak Grievance Bot API",
     version="1.0.0",
     description="AI-powered grievance redressal for the DPDP PaaS platform",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -19,8 +139,43 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(router)
 
+registry.register_collector(
+    lambda: {f"grievance_cache_{k}": v for k, v in classification_cache.stats().items()}
+)
+registry.register_collector(
+    lambda: {f"grievance_analytics_{k}": v for k, v in analytics.stats().items()}
+)
+registry.register_collector(
+    lambda: {f"grievance_microbatch_{k}": v for k, v in classify_batcher.stats().items()}
+)
+registry.register_collector(
+    lambda: {f"grievance_jobs_{k}": v for k, v in job_queue.stats().items()}
+)
+if ticket_writer is not None:
+    registry.register_collector(
+        lambda: {f"grievance_tickets_{k}": v for k, v in ticket_writer.stats().items()}
+    )
+registry.register_collector(
+    lambda: {f"grievance_templates_{k}": v for k, v in responder.templates.stats().items()}
+)
+if duplicate_index is not None:
+    registry.register_collector(
+        lambda: {f"grievance_dedup_{k}": v for k, v in duplicate_index.stats().items()}
+    )
+registry.register_collector(
+    lambda: {f"grievance_sla_{k}": v for k, v in sla_scheduler.stats().items()}
+)
+registry.register_collector(
+    lambda: {f"grievance_process_{k}": v for k, v in process_stats.stats().items()}
+)
+registry.register_collector(
+    lambda: {f"grievance_tenant_keywords_{k}": v for k, v in tenant_keywords.stats().items()}
+)
+
 
 @app.get("/")
 def health_check() -> dict[str, str]:
@@ -32,3 +187,22 @@ def health_check() -> dict[str, str]:
 def health() -> dict[str, str]:
     """Health check endpoint for load balancers."""
     return {"status": "ok"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> str:
+    """Prometheus metrics: request counts, latency and per-stage histograms."""
+    return registry.render()
+
+
+@app.get("/metrics/slow-requests")
+def get_slow_requests() -> dict[str, Any]:
+    """Return the slow-request capture settings and captured requests."""
+    return {**slow_requests.settings(), "requests": slow_requests.captured()}
+
+
+@app.put("/metrics/slow-requests", response_model=SlowRequestSettings)
+def set_slow_requests(settings: SlowRequestSettings) -> SlowRequestSettings:
+    """Switch sampled slow-request capture on or off at runtime."""
+    slow_requests.configure(settings.enabled, settings.sample_rate, settings.slow_ms)
+    return settings
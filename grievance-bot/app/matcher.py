@@ -0,0 +1,68 @@
+"""Single-pass keyword matcher used by the grievance classifier."""
+
+import re
+from collections.abc import Iterable
+
+
+class KeywordMatcher:
+    """
+    Finds every keyword occurring as a substring of a text in one scan.
+
+    The keywords are compiled into a single zero-width lookahead pattern whose
+    alternatives are laid out as a trie, so one ``findall`` pass reports the
+    longest keyword starting at every position of the text. Any shorter keyword
+    starting at the same position is necessarily a prefix of that one, so a
+    prefix table built at compile time recovers it without rescanning.
+    Matching is case-sensitive; callers are expected to lowercase the text.
+    """
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self.keywords: frozenset[str] = frozenset(kw for kw in keywords if kw)
+        # Every keyword that is a prefix of each keyword (including itself).
+        self._prefixes: dict[str, frozenset[str]] = {
+            kw: frozenset(other for other in self.keywords if kw.startswith(other))
+            for kw in self.keywords
+        }
+        self._pattern = (
+            re.compile(f"(?=({_trie_pattern(self.keywords)}))") if self.keywords else None
+        )
+
+    def find_all(self, text: str) -> frozenset[str]:
+        """
+        Return the set of keywords that occur anywhere in the text.
+
+        Args:
+            text: The (already normalized) text to scan.
+
+        Returns:
+            Frozen set of matched keywords, as spelled in the keyword list.
+        """
+        if self._pattern is None:
+            return frozenset()
+        hits: set[str] = set()
+        for kw in set(self._pattern.findall(text)):
+            hits |= self._prefixes[kw]
+        return frozenset(hits)
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Build a regex alternation shaped as a trie that prefers longer matches."""
+    trie: dict = {}
+    for kw in keywords:
+        node = trie
+        for ch in kw:
+            node = node.setdefault(ch, {})
+        node[""] = True
+    return _node_pattern(trie)
+
+
+def _node_pattern(node: dict) -> str:
+    """Render one trie node; an end-of-keyword marker makes the tail optional."""
+    branches = [re.escape(ch) + _node_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    if "" in node:
+        # Greedy optional tail: try the longer keyword before stopping here.
+        return f"(?:{body})?"
+    return body
@@ -0,0 +1,371 @@
+"""Low-overhead request metrics rendered in the Prometheus text format."""
+
+import bisect
+import contextvars
+import functools
+import inspect
+import math
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import (
+    SLOW_REQUEST_CAPTURE,
+    SLOW_REQUEST_SAMPLE_RATE,
+    SLOW_REQUEST_THRESHOLD_MS,
+)
+
+# Latency buckets in seconds, from sub-millisecond stages up to slow bulk calls
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    """Render a Prometheus label set."""
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value exactly; ``:g`` would round counters to 6 digits."""
+    value = float(value)
+    if value.is_integer():
+        return str(int(value))
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Counter:
+    """Monotonic counter with a fixed label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        """Increment the series for the given label values."""
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def samples(self) -> Iterator[str]:
+        """Yield exposition lines for every series."""
+        with self._lock:
+            values = list(self._values.items())
+        for label_values, value in values:
+            yield f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    """Gauge that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, *label_values: str, amount: float = 1.0) -> None:
+        """Decrement the series for the given label values."""
+        self.inc(*label_values, amount=-amount)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with a fixed label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        # label values -> [per-bucket counts (+Inf last), sum]
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """Record one observation."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def samples(self) -> Iterator[str]:
+        """Yield exposition lines for every series."""
+        with self._lock:
+            snapshot = [(lv, list(counts), total[0]) for lv, (counts, total) in self._series.items()]
+        for label_values, counts, total in snapshot:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                labels = _format_labels(self.labels, label_values, f'le="{le}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labels, label_values)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class MetricsRegistry:
+    """Holds metrics and collector callbacks and renders them for scraping."""
+
+    def __init__(self) -> None:
+        self._metrics: list[Counter | Histogram] = []
+        self._collectors: list[Callable[[], dict[str, float]]] = []
+
+    def register(self, metric: Any) -> Any:
+        """Add a metric and return it."""
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], dict[str, float]]) -> None:
+        """Add a callback returning ``{metric_name: value}`` gauges at scrape time."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        for collector in self._collectors:
+            for name, value in collector().items():
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+REQUESTS = registry.register(
+    Counter(
+        "grievance_requests_total",
+        "HTTP requests by route, status and classified request type",
+        ("route", "status", "classified_type"),
+    )
+)
+REQUEST_DURATION = registry.register(
+    Histogram("grievance_request_duration_seconds", "End-to-end request latency", ("route",))
+)
+STAGE_DURATION = registry.register(
+    Histogram(
+        "grievance_stage_duration_seconds",
+        "Per-stage latency: validate, classify, generate_response, serialize",
+        ("route", "stage"),
+    )
+)
+IN_FLIGHT = registry.register(
+    Gauge("grievance_requests_in_flight", "Requests currently being handled")
+)
+
+
+class RequestTimings:
+    """Stage timings for one request, shared between middleware and handler."""
+
+    __slots__ = ("started", "stages", "endpoint_done", "classified_type")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.stages: dict[str, float] = {}
+        self.endpoint_done: float | None = None
+        self.classified_type = "none"
+
+
+_current: contextvars.ContextVar[RequestTimings | None] = contextvars.ContextVar(
+    "grievance_request_timings", default=None
+)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block as a named stage of the current request."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.stages[name] = timings.stages.get(name, 0.0) + time.perf_counter() - t0
+
+
+def set_classified_type(request_type: str) -> None:
+    """Label the current request with its classified request type."""
+    timings = _current.get()
+    if timings is not None:
+        timings.classified_type = request_type
+
+
+def instrumented(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Mark the validate and serialize stage boundaries around a route endpoint.
+
+    Everything between the request arriving and the endpoint being called is
+    body parsing plus Pydantic validation; everything between the endpoint
+    returning and the response starting is response-model serialization.
+    """
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            timings = _begin_endpoint()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                if timings is not None:
+                    timings.endpoint_done = time.perf_counter()
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        timings = _begin_endpoint()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            if timings is not None:
+                timings.endpoint_done = time.perf_counter()
+
+    return wrapper
+
+
+def _begin_endpoint() -> RequestTimings | None:
+    """Close the validate stage of the current request."""
+    timings = _current.get()
+    if timings is not None:
+        timings.stages["validate"] = time.perf_counter() - timings.started
+    return timings
+
+
+class SlowRequestSampler:
+    """
+    Runtime-switchable capture of slow requests and their stage breakdown.
+
+    When enabled, a ``sample_rate`` fraction of requests is considered and
+    those slower than ``slow_ms`` are kept in a bounded ring buffer.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        sample_rate: float = 1.0,
+        slow_ms: float = 250.0,
+        capacity: int = 100,
+    ) -> None:
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self._captured: deque[dict[str, Any]] = deque(maxlen=capacity)
+
+    def configure(self, enabled: bool, sample_rate: float, slow_ms: float) -> None:
+        """Switch capture on or off and set its parameters."""
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+
+    def should_sample(self) -> bool:
+        """Decide whether to consider the next request."""
+        return self.enabled and random.random() < self.sample_rate
+
+    def offer(self, route: str, status: int, duration: float, timings: RequestTimings) -> None:
+        """Keep the request if it was slow."""
+        if duration * 1000 < self.slow_ms:
+            return
+        self._captured.append(
+            {
+                "route": route,
+                "status": status,
+                "duration_ms": round(duration * 1000, 3),
+                "classified_type": timings.classified_type,
+                "stages_ms": {k: round(v * 1000, 3) for k, v in timings.stages.items()},
+                "at": time.time(),
+            }
+        )
+
+    def captured(self) -> list[dict[str, Any]]:
+        """Return captured slow requests, oldest first."""
+        return list(self._captured)
+
+    def settings(self) -> dict[str, Any]:
+        """Return the current sampler settings."""
+        return {"enabled": self.enabled, "sample_rate": self.sample_rate, "slow_ms": self.slow_ms}
+
+
+slow_requests = SlowRequestSampler(
+    enabled=SLOW_REQUEST_CAPTURE,
+    sample_rate=SLOW_REQUEST_SAMPLE_RATE,
+    slow_ms=SLOW_REQUEST_THRESHOLD_MS,
+)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request counts, latency and stages."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        status = 500
+        response_started: float | None = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, response_started
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_started = time.perf_counter()
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec()
+            _current.reset(token)
+            duration = time.perf_counter() - timings.started
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            if timings.endpoint_done is not None and response_started is not None:
+                # Adds to any serialization the endpoint timed itself
+                timings.stages["serialize"] = timings.stages.get("serialize", 0.0) + max(
+                    0.0, response_started - timings.endpoint_done
+                )
+            REQUESTS.inc(route, str(status), timings.classified_type)
+            REQUEST_DURATION.observe(duration, route)
+            for name, seconds in timings.stages.items():
+                STAGE_DURATION.observe(seconds, route, name)
+            if slow_requests.should_sample():
+                slow_requests.offer(route, status, duration, timings)
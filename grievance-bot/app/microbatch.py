@@ -0,0 +1,94 @@
+"""Dynamic micro-batching of concurrent single-item requests."""
+
+import asyncio
+from collections.abc import Callable, Sequence
+from typing import Generic, TypeVar
+
+from fastapi.concurrency import run_in_threadpool
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Collects concurrent submissions into batches for a single handler call.
+
+    When no batch is running, pending items are flushed on the next event loop
+    iteration, so an idle service adds no wait. While a batch is running, new
+    items accumulate and are flushed when it finishes, when ``max_batch_size``
+    items are pending, or ``max_wait_seconds`` after the first one arrived,
+    whichever comes first. The handler runs on the threadpool with the whole
+    batch and must return one result per item in order; each caller's future
+    then resolves with its own result, or with the handler's exception if the
+    batch failed. All state is touched only from the event loop, so no locking
+    is needed.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[list[T]], Sequence[R]],
+        max_batch_size: int,
+        max_wait_seconds: float,
+    ) -> None:
+        self._handler = handler
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max_wait_seconds
+        self._pending: list[tuple[T, asyncio.Future[R]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._running: set[asyncio.Task[None]] = set()
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, item: T) -> R:
+        """Queue one item and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[R] = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            delay = self.max_wait_seconds if self._running else 0
+            self._timer = loop.call_later(delay, self._flush)
+        return await future
+
+    def stats(self) -> dict[str, int | float]:
+        """Return batch counters and the mean batch size."""
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
+
+    def _flush(self) -> None:
+        """Hand the pending items to a background task as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._on_batch_done)
+
+    def _on_batch_done(self, task: "asyncio.Task[None]") -> None:
+        """Flush items that queued up behind a batch once the service is idle."""
+        self._running.discard(task)
+        if self._pending and not self._running:
+            self._flush()
+
+    async def _run(self, batch: list[tuple[T, asyncio.Future[R]]]) -> None:
+        """Run the handler for one batch and resolve every caller's future."""
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            results = await run_in_threadpool(self._handler, [item for item, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -14,6 +14,9 @@ class GrievanceRequest(BaseModel):
     ] = Field(..., description="Stated type of the request")
     description: str = Field(..., description="Description of the grievance")
     language: str = Field(default="en", description="Preferred response language")
+    org_id: str | None = Field(
+        default=None, description="Organization (data fiduciary) the grievance belongs to"
+    )
 
 
 class ClassificationResult(BaseModel):
@@ -49,6 +52,21 @@ class AIResponse(BaseModel):
     generated_at: str = Field(..., description="ISO timestamp of generation")
 
 
+class DuplicateInfo(BaseModel):
+    """Reference to an earlier grievance that this one nearly duplicates."""
+
+    duplicate_of: str = Field(..., description="Case ID or item ID of the earlier grievance")
+    similarity: float = Field(..., ge=0.0, le=1.0, description="Estimated text similarity")
+
+
+class ProcessResult(BaseModel):
+    """Classification and generated response returned by the full pipeline."""
+
+    classification: ClassificationResult
+    response: AIResponse
+    duplicate: DuplicateInfo | None = None
+
+
 class GrievanceAnalytics(BaseModel):
     """Analytics summary for grievance processing."""
 
@@ -56,12 +74,104 @@ class GrievanceAnalytics(BaseModel):
     by_type: dict[str, int] = Field(
         default_factory=dict, description="Count by request type"
     )
-    avg_resolution_days: float = Field(
-        ..., ge=0.0, description="Average resolution time in days"
+    by_priority: dict[str, int] = Field(
+        default_factory=dict, description="Count by priority"
+    )
+    by_sub_category: dict[str, int] = Field(
+        default_factory=dict, description="Count by sub-category"
+    )
+    manual_review_rate: float = Field(
+        ..., ge=0.0, le=1.0, description="Share of grievances flagged for manual review"
+    )
+    avg_sla_days: float | None = Field(
+        default=None, description="Mean assigned SLA in days"
     )
-    ai_accuracy: float = Field(
-        ..., ge=0.0, le=1.0, description="AI classification accuracy rate"
+    sla_days_p50: float | None = Field(default=None, description="Median assigned SLA in days")
+    sla_days_p90: float | None = Field(default=None, description="90th percentile assigned SLA")
+    sla_days_p99: float | None = Field(default=None, description="99th percentile assigned SLA")
+    org_id: str | None = Field(default=None, description="Organization scope, if any")
+    window_hours: int | None = Field(
+        default=None, description="Trailing window in hours, or None for all time"
     )
-    sla_compliance_rate: float = Field(
-        ..., ge=0.0, le=1.0, description="SLA compliance percentage"
+    avg_resolution_days: float | None = Field(
+        default=None,
+        ge=0.0,
+        description="Average resolution time in days (not tracked by the bot)",
     )
+    ai_accuracy: float | None = Field(
+        default=None,
+        ge=0.0,
+        le=1.0,
+        description="AI classification accuracy rate (not tracked by the bot)",
+    )
+    sla_compliance_rate: float | None = Field(
+        default=None,
+        ge=0.0,
+        le=1.0,
+        description="SLA compliance percentage (not tracked by the bot)",
+    )
+
+
+class SlowRequestSettings(BaseModel):
+    """Runtime settings for sampled slow-request capture."""
+
+    enabled: bool = Field(..., description="Whether slow requests are captured")
+    sample_rate: float = Field(
+        default=1.0, ge=0.0, le=1.0, description="Fraction of requests considered"
+    )
+    slow_ms: float = Field(default=250.0, ge=0.0, description="Capture requests slower than this")
+
+
+class JobAccepted(BaseModel):
+    """Acknowledgement of jobs queued for asynchronous processing."""
+
+    job_ids: list[str] = Field(..., description="IDs to poll at /api/jobs/{job_id}")
+    status: Literal["queued"] = "queued"
+
+
+class JobStatus(BaseModel):
+    """State of an asynchronous processing job."""
+
+    job_id: str = Field(..., description="Job identifier")
+    status: Literal["queued", "running", "done", "failed"] = Field(
+        ..., description="Current job state"
+    )
+    attempts: int = Field(..., ge=0, description="Processing attempts so far")
+    result: ProcessResult | None = Field(default=None, description="Result once done")
+    error: str | None = Field(default=None, description="Last error, if an attempt failed")
+    created_at: str = Field(..., description="ISO timestamp of submission")
+    updated_at: str = Field(..., description="ISO timestamp of the last state change")
+
+
+class QueuedGrievance(BaseModel):
+    """A queued job's payload: the grievance and the case ID reserved for it."""
+
+    case_id: str
+    request: GrievanceRequest
+
+
+class BulkJobRequest(BaseModel):
+    """Grievances to queue for asynchronous processing in one call."""
+
+    requests: list[GrievanceRequest] = Field(..., min_length=1)
+
+
+class SlaCaseStatus(BaseModel):
+    """An open case tracked against its SLA deadline."""
+
+    case_id: str = Field(..., description="Case identifier")
+    org_id: str | None = Field(default=None, description="Organization the case belongs to")
+    request_type: str = Field(..., description="Classified request type")
+    priority: str = Field(..., description="Priority level")
+    deadline: str = Field(..., description="ISO timestamp of the SLA deadline")
+    status: Literal["open", "approaching", "breached"] = Field(
+        ..., description="Whether the deadline is near or has passed"
+    )
+
+
+class SlaEventRecord(BaseModel):
+    """A case approaching or passing its SLA deadline."""
+
+    kind: Literal["approaching", "breached"] = Field(..., description="Event type")
+    case: SlaCaseStatus = Field(..., description="The case as of the event")
+    fired_at: str = Field(..., description="ISO timestamp the event fired")
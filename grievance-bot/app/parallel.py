@@ -0,0 +1,102 @@
+"""Process-pool execution of large classification batches."""
+
+import threading
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+from app.batch import BatchClassifier
+from app.config import CLASSIFIER_MODEL_PATH
+from app.learned import StatisticalClassifier
+from app.models import ClassificationResult
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+# Per-worker classifier state, built once by the pool initializer
+_worker_engine: BatchClassifier | StatisticalClassifier | None = None
+
+
+def _init_worker() -> None:
+    """Build the batch engine (and its compiled matcher) in a worker process."""
+    global _worker_engine
+    if CLASSIFIER_MODEL_PATH:
+        # Memory-mapped, so every worker reads the same page-cached weights
+        _worker_engine = StatisticalClassifier.load(CLASSIFIER_MODEL_PATH)
+    else:
+        _worker_engine = BatchClassifier()
+
+
+def _classify_chunk(
+    descriptions: Sequence[str],
+    stated_types: Sequence[str],
+) -> list[ClassificationResult]:
+    """Classify one shard inside a worker process."""
+    if _worker_engine is None:
+        _init_worker()
+    return _worker_engine.classify_batch(descriptions, stated_types)
+
+
+class ParallelClassifier:
+    """
+    Shards large batches across a persistent pool of classifier processes.
+
+    The pool is created on first use and reused for every later batch; each
+    worker pre-builds its classifier state in the pool initializer, so a shard
+    pays only for pickling its inputs and results. Shards are submitted in
+    order and results are concatenated in the same order.
+    """
+
+    def __init__(self, workers: int, chunk_size: int, start_method: str = "spawn") -> None:
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.start_method = start_method
+        self._executor: "ProcessPoolExecutor | None" = None
+        self._lock = threading.Lock()
+
+    def classify_batch(
+        self,
+        descriptions: Sequence[str],
+        stated_types: Sequence[str],
+    ) -> list[ClassificationResult]:
+        """
+        Classify a batch across the worker pool.
+
+        Args:
+            descriptions: Grievance description texts.
+            stated_types: Request type stated for each description.
+
+        Returns:
+            One ClassificationResult per description, in input order.
+        """
+        step = max(1, self.chunk_size)
+        shards = range(0, len(descriptions), step)
+        results: list[ClassificationResult] = []
+        for chunk in self._pool().map(
+            _classify_chunk,
+            [descriptions[i:i + step] for i in shards],
+            [stated_types[i:i + step] for i in shards],
+        ):
+            results.extend(chunk)
+        return results
+
+    def shutdown(self) -> None:
+        """Stop the worker processes, if they were started."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+    def _pool(self) -> "ProcessPoolExecutor":
+        """Return the shared executor, starting it on first use."""
+        with self._lock:
+            if self._executor is None:
+                # Imported here so servers that never use the pool don't pay for it
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=_init_worker,
+                )
+            return self._executor
@@ -0,0 +1,366 @@
+"""Batched persistence of processed grievances into ``grievance_tickets``."""
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple, Protocol
+
+from app.models import AIResponse, ClassificationResult, GrievanceRequest
+
+logger = logging.getLogger(__name__)
+
+
+class TicketRow(NamedTuple):
+    """One ``grievance_tickets`` row, in column order."""
+
+    id: str
+    org_id: str | None
+    case_id: str
+    data_principal_email: str
+    request_type: str
+    status: str
+    priority: str
+    description: str
+    ai_classification: str
+    ai_response: str
+    sla_deadline: datetime
+    created_at: datetime
+    updated_at: datetime
+
+
+COLUMNS = TicketRow._fields
+
+# Offline stand-in for the Supabase table, minus the foreign keys
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS grievance_tickets (
+    id TEXT PRIMARY KEY,
+    org_id TEXT,
+    case_id TEXT NOT NULL UNIQUE,
+    data_principal_email TEXT NOT NULL,
+    request_type TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'open',
+    priority TEXT NOT NULL DEFAULT 'medium',
+    description TEXT NOT NULL,
+    ai_classification TEXT,
+    ai_response TEXT,
+    assigned_to TEXT,
+    sla_deadline TEXT NOT NULL,
+    resolved_at TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_grievance_org ON grievance_tickets(org_id);
+CREATE INDEX IF NOT EXISTS idx_grievance_sla ON grievance_tickets(sla_deadline);
+"""
+
+
+def canonical_org_id(org_id: str | None) -> str | None:
+    """
+    The canonical form of an organization ID, or None if it is not a UUID.
+
+    ``grievance_tickets.org_id`` is a UUID column, so rows without one can
+    never be written.
+    """
+    if org_id is None:
+        return None
+    try:
+        return str(uuid.UUID(org_id))
+    except ValueError:
+        return None
+
+
+def ticket_row(
+    request: GrievanceRequest,
+    classification: ClassificationResult,
+    response: AIResponse,
+) -> TicketRow:
+    """Build the ticket row for one processed grievance."""
+    now = datetime.now(timezone.utc)
+    return TicketRow(
+        id=str(uuid.uuid4()),
+        org_id=canonical_org_id(request.org_id),
+        case_id=response.case_id,
+        data_principal_email=request.data_principal_email,
+        request_type=classification.request_type,
+        status="escalated" if response.escalation_required else "open",
+        priority=classification.priority,
+        description=request.description,
+        ai_classification=classification.model_dump_json(),
+        ai_response=response.model_dump_json(),
+        sla_deadline=now + timedelta(days=response.sla_days),
+        created_at=now,
+        updated_at=now,
+    )
+
+
+class TicketStore(Protocol):
+    """
+    A database that ticket rows can be bulk-inserted into.
+
+    ``row_errors`` are the exceptions raised when the database rejects a
+    row's data (a constraint or type violation), as opposed to failing
+    itself; retrying the same rows cannot fix them.
+    """
+
+    row_errors: tuple[type[Exception], ...]
+
+    def write_many(self, rows: Sequence[TicketRow]) -> None:
+        """Insert rows in one transaction."""
+        ...
+
+    def close(self) -> None:
+        """Release connections."""
+        ...
+
+
+class SQLiteTicketStore:
+    """
+    Writes tickets to a local SQLite table with ``executemany``.
+
+    The database is opened on the first write, from the writer thread, so a
+    store created before the server forks holds no connection to share.
+    """
+
+    row_errors = (sqlite3.IntegrityError, sqlite3.DataError)
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        self._insert = (
+            f"INSERT INTO grievance_tickets ({', '.join(COLUMNS)})"
+            f" VALUES ({', '.join('?' * len(COLUMNS))})"
+        )
+
+    def write_many(self, rows: Sequence[TicketRow]) -> None:
+        """Insert rows in one transaction."""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SQLITE_SCHEMA)
+        with self._conn:
+            self._conn.executemany(
+                self._insert,
+                [
+                    (*row[:-3], *(value.isoformat() for value in row[-3:]))
+                    for row in rows
+                ],
+            )
+
+    def close(self) -> None:
+        """Close the connection, if one was opened."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class PostgresTicketStore:
+    """
+    Writes tickets to Postgres with ``COPY`` over a pooled connection.
+
+    The pool is opened on the first write, so a store created before the
+    server forks holds no connections or pool threads to share.
+    """
+
+    def __init__(self, dsn: str, pool_size: int = 4) -> None:
+        try:
+            import psycopg
+            from psycopg_pool import ConnectionPool
+        except ImportError as exc:
+            raise RuntimeError(
+                "Postgres persistence needs psycopg: pip install 'psycopg[binary,pool]'"
+            ) from exc
+        self.row_errors = (psycopg.DataError, psycopg.IntegrityError)
+        self._pool_class = ConnectionPool
+        self._dsn = dsn
+        self._pool_size = max(1, pool_size)
+        self._pool: "ConnectionPool | None" = None
+        self._copy = f"COPY grievance_tickets ({', '.join(COLUMNS)}) FROM STDIN"
+
+    def write_many(self, rows: Sequence[TicketRow]) -> None:
+        """Stream rows through COPY in one transaction."""
+        if self._pool is None:
+            self._pool = self._pool_class(
+                self._dsn, min_size=1, max_size=self._pool_size, open=True
+            )
+        with self._pool.connection() as conn, conn.cursor() as cursor:
+            with cursor.copy(self._copy) as copy:
+                for row in rows:
+                    copy.write_row(row)
+
+    def close(self) -> None:
+        """Close the pool, if it was opened."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+
+def open_store(url: str, pool_size: int = 4) -> TicketStore:
+    """
+    Open a ticket store from a URL.
+
+    Args:
+        url: ``sqlite:///relative/path.db``, ``sqlite:////absolute/path.db``
+            or a ``postgresql://`` DSN.
+        pool_size: Maximum pooled connections for Postgres.
+
+    Returns:
+        The matching TicketStore.
+    """
+    if url.startswith("sqlite:///"):
+        return SQLiteTicketStore(url[len("sqlite:///"):])
+    if url.startswith(("postgres://", "postgresql://")):
+        return PostgresTicketStore(url, pool_size=pool_size)
+    raise ValueError(f"unsupported persistence URL: {url!r}")
+
+
+class TicketWriter:
+    """
+    Buffers ticket rows and writes them to a store in batches.
+
+    ``add`` only enqueues; a background thread writes a batch once
+    ``batch_size`` rows are pending or ``flush_interval`` seconds after the
+    oldest pending row arrived, whichever comes first. A batch the database
+    fails on is retried ``max_retries`` times with backoff before it is
+    dropped and counted; a batch it rejects for some row's data is split in
+    halves until only the offending rows are dropped. Rows without a UUID
+    org ID are rejected up front. At most ``max_pending`` rows are buffered;
+    beyond that ``add`` drops the row and counts it rather than blocking,
+    since it is called from the event loop. The thread starts with the first
+    ``add``, and again in a forked worker, which inherits no threads.
+    """
+
+    def __init__(
+        self,
+        store: TicketStore,
+        batch_size: int = 500,
+        flush_interval: float = 0.2,
+        max_pending: int = 50_000,
+        max_retries: int = 3,
+    ) -> None:
+        self._store = store
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self._queue: queue.Queue[TicketRow | None] = queue.Queue(maxsize=max_pending)
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.overflowed = 0
+        self._start_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    def add(self, row: TicketRow) -> bool:
+        """Queue one row for writing; returns False if it was rejected or the buffer is full."""
+        if row.org_id is None:
+            self.rejected += 1
+            return False
+        if self._pid != os.getpid():
+            self._start()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.overflowed += 1
+            return False
+        return True
+
+    def stats(self) -> dict[str, int]:
+        """Return write counters and the number of pending rows."""
+        return {
+            "pending": self._queue.qsize(),
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "overflowed": self.overflowed,
+        }
+
+    def close(self) -> None:
+        """Write everything still pending, then stop the thread and the store."""
+        if self._thread is not None and self._pid == os.getpid():
+            self._queue.put(None)
+            self._thread.join()
+        self._store.close()
+
+    def _start(self) -> None:
+        """Start the writer thread for this process."""
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                # Forked from a process that had started writing: drop its rows and counters
+                self._queue = queue.Queue(maxsize=self.max_pending)
+                self.written = self.batches = self.dropped = 0
+                self.rejected = self.overflowed = 0
+            self._thread = threading.Thread(target=self._run, name="ticket-writer", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _run(self) -> None:
+        """Collect rows into batches until ``close`` is called."""
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            stopping = False
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    row = (
+                        self._queue.get(timeout=timeout)
+                        if timeout > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+            self._write(batch)
+            if stopping:
+                return
+
+    def _write(self, batch: list[TicketRow]) -> None:
+        """Write one batch, retrying with backoff and isolating rejected rows."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._store.write_many(batch)
+            except self._store.row_errors as exc:
+                if len(batch) == 1:
+                    logger.warning(
+                        "dropping grievance ticket %s rejected by the database: %s",
+                        batch[0].case_id,
+                        exc,
+                    )
+                    self.dropped += 1
+                    return
+                middle = len(batch) // 2
+                self._write(batch[:middle])
+                self._write(batch[middle:])
+                return
+            except Exception:
+                if attempt == self.max_retries:
+                    logger.exception(
+                        "dropping %d grievance tickets after %d attempts", len(batch), attempt + 1
+                    )
+                    self.dropped += len(batch)
+                    return
+                time.sleep(0.1 * 2**attempt)
+            else:
+                self.written += len(batch)
+                self.batches += 1
+                return
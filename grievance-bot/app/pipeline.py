@@ -0,0 +1,160 @@
+"""Shared classification pipeline: result cache, batch engine and process pool."""
+
+from collections.abc import Sequence
+from itertools import groupby
+
+from app.cache import ClassificationCache
+from app.config import (
+    BATCH_ENGINE_MIN_ITEMS,
+    CLASSIFICATION_CACHE_MAX_ENTRIES,
+    CLASSIFICATION_CACHE_TTL_SECONDS,
+    CLASSIFIER_MODEL_PATH,
+    MICROBATCH_MAX_SIZE,
+    MICROBATCH_MAX_WAIT_MS,
+    PARALLEL_CHUNK_SIZE,
+    PARALLEL_MIN_ITEMS,
+    PARALLEL_START_METHOD,
+    PARALLEL_WORKERS,
+    TENANT_KEYWORDS_CACHE_SIZE,
+    TENANT_KEYWORDS_CHECK_INTERVAL_SECONDS,
+    TENANT_KEYWORDS_DIR,
+)
+from app.learned import StatisticalClassifier
+from app.microbatch import MicroBatcher
+from app.models import ClassificationResult
+from app.parallel import ParallelClassifier
+from app.tenants import DEFAULT_PROFILE, KeywordProfile, TenantKeywordStore
+
+statistical_classifier = (
+    StatisticalClassifier.load(CLASSIFIER_MODEL_PATH) if CLASSIFIER_MODEL_PATH else None
+)
+parallel_classifier = (
+    ParallelClassifier(
+        workers=PARALLEL_WORKERS,
+        chunk_size=PARALLEL_CHUNK_SIZE,
+        start_method=PARALLEL_START_METHOD,
+    )
+    if PARALLEL_WORKERS > 0
+    else None
+)
+classification_cache = ClassificationCache(
+    max_entries=CLASSIFICATION_CACHE_MAX_ENTRIES,
+    ttl_seconds=CLASSIFICATION_CACHE_TTL_SECONDS,
+)
+tenant_keywords = TenantKeywordStore(
+    directory=TENANT_KEYWORDS_DIR,
+    max_profiles=TENANT_KEYWORDS_CACHE_SIZE,
+    check_interval=TENANT_KEYWORDS_CHECK_INTERVAL_SECONDS,
+)
+
+
+def classify_many(
+    descriptions: Sequence[str],
+    stated_types: Sequence[str],
+    org_id: str | None = None,
+) -> list[ClassificationResult]:
+    """
+    Classify a batch through the cache, sending distinct misses to an engine.
+
+    Args:
+        descriptions: Grievance descriptions.
+        stated_types: Request type stated for each description.
+        org_id: Organization whose keyword tables to use; None uses the defaults.
+
+    Returns:
+        One classification per description, in order.
+    """
+    profile = tenant_keywords.profile_for(org_id)
+    version = (
+        statistical_classifier.version
+        if statistical_classifier is not None and profile is DEFAULT_PROFILE
+        else profile.version
+    )
+    keys = [
+        ClassificationCache.key(description, stated_type, version)
+        for description, stated_type in zip(descriptions, stated_types)
+    ]
+    cached = [classification_cache.get(key) for key in keys]
+
+    # Classify each distinct miss once, even if it repeats within the batch
+    missing: dict[str, int] = {}
+    for i, (key, classification) in enumerate(zip(keys, cached)):
+        if classification is None and key not in missing:
+            missing[key] = i
+    fresh = dict(
+        zip(
+            missing,
+            _classify_uncached(
+                profile,
+                [descriptions[i] for i in missing.values()],
+                [stated_types[i] for i in missing.values()],
+            ),
+        )
+    )
+    for key, classification in fresh.items():
+        classification_cache.put(key, classification)
+
+    return [
+        classification if classification is not None else fresh[key]
+        for key, classification in zip(keys, cached)
+    ]
+
+
+def _classify_uncached(
+    profile: KeywordProfile,
+    descriptions: Sequence[str],
+    stated_types: Sequence[str],
+) -> list[ClassificationResult]:
+    """Classify a batch, switching to the batch engine or process pool by size."""
+    # Pool workers only hold the built-in tables
+    if (
+        parallel_classifier is not None
+        and profile is DEFAULT_PROFILE
+        and len(descriptions) >= PARALLEL_MIN_ITEMS
+    ):
+        return parallel_classifier.classify_batch(descriptions, stated_types)
+    # The learned model serves the built-in tables; org keyword overrides stay keyword-based
+    if statistical_classifier is not None and profile is DEFAULT_PROFILE:
+        return statistical_classifier.classify_batch(descriptions, stated_types)
+    if len(descriptions) >= BATCH_ENGINE_MIN_ITEMS:
+        return profile.batch_classifier.classify_batch(descriptions, stated_types)
+    return [
+        profile.classifier.classify(description=description, stated_type=stated_type)
+        for description, stated_type in zip(descriptions, stated_types)
+    ]
+
+
+def _classify_items(
+    items: list[tuple[str, str, str | None]],
+) -> list[ClassificationResult]:
+    """Micro-batch handler: classify (description, stated_type, org_id) items."""
+    results: list[ClassificationResult | None] = [None] * len(items)
+    order = sorted(range(len(items)), key=lambda i: items[i][2] or "")
+    for org_id, group in groupby(order, key=lambda i: items[i][2]):
+        indices = list(group)
+        for i, classification in zip(
+            indices,
+            classify_many(
+                [items[i][0] for i in indices],
+                [items[i][1] for i in indices],
+                org_id=org_id,
+            ),
+        ):
+            results[i] = classification
+    return results  # type: ignore[return-value]
+
+
+classify_batcher: MicroBatcher[tuple[str, str, str | None], ClassificationResult] = MicroBatcher(
+    handler=_classify_items,
+    max_batch_size=MICROBATCH_MAX_SIZE,
+    max_wait_seconds=MICROBATCH_MAX_WAIT_MS / 1000,
+)
+
+
+async def classify_async(
+    description: str,
+    stated_type: str,
+    org_id: str | None = None,
+) -> ClassificationResult:
+    """Classify one grievance as part of a micro-batch of concurrent requests."""
+    return await classify_batcher.submit((description, stated_type, org_id))
@@ -0,0 +1,68 @@
+"""Startup time and memory use of the current worker process."""
+
+import os
+import resource
+import time
+
+_IMPORTED_AT = time.monotonic()
+_ready_after: float | None = None
+
+
+def process_age() -> float:
+    """
+    Seconds since this process was created, or since this module was imported
+    where /proc is unavailable. For a forked worker that is time since the fork.
+    """
+    try:
+        with open("/proc/self/stat", encoding="ascii") as fh:
+            # Fields after the parenthesised command name; starttime is field 22
+            started_ticks = int(fh.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime", encoding="ascii") as fh:
+            uptime = float(fh.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return time.monotonic() - _IMPORTED_AT
+    return max(0.0, uptime - started_ticks / os.sysconf("SC_CLK_TCK"))
+
+
+def mark_ready() -> float:
+    """Record that the process finished starting up and return how long it took."""
+    global _ready_after
+    _ready_after = process_age()
+    return _ready_after
+
+
+def memory_stats() -> dict[str, int]:
+    """
+    Resident, proportional and shared memory of this process, in bytes.
+
+    ``pss`` charges shared pages fractionally to each process sharing them, so
+    summing it across workers gives their true combined footprint; ``shared``
+    is how much of ``rss`` other processes also map, e.g. copy-on-write pages
+    inherited from a pre-fork parent.
+    """
+    fields = {"Rss": 0, "Pss": 0, "Shared_Clean": 0, "Shared_Dirty": 0}
+    try:
+        with open("/proc/self/smaps_rollup", encoding="ascii") as fh:
+            for line in fh:
+                name, _, rest = line.partition(":")
+                if name in fields:
+                    fields[name] = int(rest.split()[0]) * 1024
+    except OSError:
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        return {"rss": rss, "pss": rss, "shared": 0}
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "shared": fields["Shared_Clean"] + fields["Shared_Dirty"],
+    }
+
+
+def stats() -> dict[str, float]:
+    """Return startup time and memory gauges for the metrics endpoint."""
+    memory = memory_stats()
+    return {
+        "startup_seconds": round(_ready_after, 3) if _ready_after is not None else 0.0,
+        "resident_memory_bytes": memory["rss"],
+        "proportional_memory_bytes": memory["pss"],
+        "shared_memory_bytes": memory["shared"],
+    }
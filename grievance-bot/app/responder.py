@@ -1,11 +1,21 @@
 """Template-based response generator for grievance requests."""
 
-import uuid
+import itertools
 from datetime import datetime, timezone
-
+from typing import NamedTuple
+
+from app.case_ids import CaseIdAllocator
+from app.config import (
+    CASE_ID_LOCK_DIR,
+    CASE_ID_NODE_ID,
+    TEMPLATE_CACHE_MAX_LANGUAGES,
+    TEMPLATE_DIR,
+)
 from app.models import AIResponse, ClassificationResult, GrievanceRequest
+from app.template_store import TemplateStore
 
-# DPDP Act 2023 compliant response templates
+# DPDP Act 2023 compliant response templates (English; other languages are
+# loaded from the packs in TEMPLATE_DIR)
 TEMPLATES: dict[str, str] = {
     "erasure": (
         "We acknowledge receipt of your request for erasure of your personal data. "
@@ -56,13 +66,122 @@ TEMPLATES: dict[str, str] = {
 }
 
 
+# Compliance-team actions per request type
+TYPE_ACTIONS: dict[str, tuple[str, ...]] = {
+    "erasure": (
+        "Identify all systems holding the data principal's data",
+        "Execute erasure workflow per retention policy",
+        "Document erasure completion and retain audit trail",
+    ),
+    "access": (
+        "Compile data summary from all relevant systems",
+        "Prepare data in requested format (PDF/JSON)",
+        "Send secure access link to data principal",
+    ),
+    "correction": (
+        "Request supporting documentation if not provided",
+        "Verify correction request against source documents",
+        "Update records and notify downstream processors",
+    ),
+    "portability": (
+        "Export data in machine-readable format",
+        "Ensure format supports interoperability",
+        "Provide secure download mechanism",
+    ),
+    "objection": (
+        "Identify consent-based processing activities",
+        "Cease processing for withdrawn consent",
+        "Update consent records and notify data principal",
+    ),
+}
+
+MANUAL_REVIEW_ACTIONS = (
+    "Flag for manual review by compliance officer",
+    "Verify data principal identity before processing",
+)
+EXPEDITE_ACTION = "Prioritize in queue - expedite processing"
+EXPEDITE_PRIORITIES = ("high", "critical")
+
+# SLA days by estimated complexity; the DPDP Act default is 90 days and
+# complex cases get a faster initial response
+SLA_DAYS_BY_COMPLEXITY: dict[str, int] = {"simple": 45, "moderate": 90, "complex": 60}
+DEFAULT_SLA_DAYS = 90
+
+PRIORITIES = ("low", "medium", "high", "critical")
+COMPLEXITIES = ("simple", "moderate", "complex")
+
+
+class ResponsePlan(NamedTuple):
+    """Actions, SLA and escalation for one combination of classification fields."""
+
+    suggested_actions: tuple[str, ...]
+    sla_days: int
+    escalation_required: bool
+
+
+PlanKey = tuple[str, bool, str, str]
+
+
+def build_plan(
+    request_type: str,
+    requires_manual_review: bool,
+    priority: str,
+    estimated_complexity: str,
+) -> ResponsePlan:
+    """Build the response plan for one combination of classification fields."""
+    actions: list[str] = []
+    if requires_manual_review:
+        actions.extend(MANUAL_REVIEW_ACTIONS)
+    actions.extend(TYPE_ACTIONS.get(request_type, ()))
+    if priority in EXPEDITE_PRIORITIES:
+        actions.append(EXPEDITE_ACTION)
+    return ResponsePlan(
+        suggested_actions=tuple(actions),
+        sla_days=SLA_DAYS_BY_COMPLEXITY.get(estimated_complexity, DEFAULT_SLA_DAYS),
+        escalation_required=requires_manual_review,
+    )
+
+
+def build_plan_table() -> dict[PlanKey, ResponsePlan]:
+    """Precompute plans for every known (type, review, priority, complexity)."""
+    return {
+        key: build_plan(*key)
+        for key in itertools.product(TEMPLATES, (False, True), PRIORITIES, COMPLEXITIES)
+    }
+
+
 class GrievanceResponder:
     """Generates DPDP Act compliant responses for grievance requests."""
 
+    def __init__(
+        self,
+        templates: TemplateStore | None = None,
+        case_ids: CaseIdAllocator | None = None,
+    ) -> None:
+        self.templates = templates or TemplateStore(
+            TEMPLATE_DIR, TEMPLATES, max_languages=TEMPLATE_CACHE_MAX_LANGUAGES
+        )
+        self.case_ids = case_ids or CaseIdAllocator(
+            node_id=CASE_ID_NODE_ID, lock_dir=CASE_ID_LOCK_DIR
+        )
+        self._plans = build_plan_table()
+
+    def plan_for(self, classification: ClassificationResult) -> ResponsePlan:
+        """Look up the precomputed plan for a classification."""
+        key = (
+            classification.request_type,
+            classification.requires_manual_review,
+            classification.priority,
+            classification.estimated_complexity,
+        )
+        plan = self._plans.get(key)
+        return plan if plan is not None else build_plan(*key)
+
     def generate_response(
         self,
         classification: ClassificationResult,
         request: GrievanceRequest,
+        case_id: str | None = None,
     ) -> AIResponse:
         """
         Generate a template-based response for the grievance.
@@ -70,75 +189,22 @@ class GrievanceResponder:
         Args:
             classification: The classification result from the classifier.
             request: The original grievance request.
+            case_id: A case ID reserved earlier; a new one is allocated if None.
 
         Returns:
             AIResponse with the generated response and metadata.
         """
-        req_type = classification.request_type
-        template = TEMPLATES.get(req_type, TEMPLATES["access"])  # Fallback to access
-
-        # Build suggested actions for compliance team
-        suggested_actions = self._get_suggested_actions(classification, request)
-
-        # Determine SLA based on complexity
-        sla_days = self._get_sla_days(classification)
-
-        case_id = f"GRV-{datetime.now(timezone.utc).strftime('%Y%m%d')}-{uuid.uuid4().hex[:8].upper()}"
-
+        plan = self.plan_for(classification)
+        # Falls back to access for unknown types and English for missing languages
+        response_text, language = self.templates.resolve(
+            request.language, classification.request_type
+        )
         return AIResponse(
-            case_id=case_id,
-            response_text=template,
-            language=request.language,
-            suggested_actions=suggested_actions,
-            sla_days=sla_days,
-            escalation_required=classification.requires_manual_review,
+            case_id=case_id or self.case_ids.next_id(),
+            response_text=response_text,
+            language=language,
+            suggested_actions=list(plan.suggested_actions),
+            sla_days=plan.sla_days,
+            escalation_required=plan.escalation_required,
             generated_at=datetime.now(timezone.utc).isoformat(),
         )
-
-    def _get_suggested_actions(
-        self,
-        classification: ClassificationResult,
-        request: GrievanceRequest,
-    ) -> list[str]:
-        """Generate suggested actions for the compliance team."""
-        actions: list[str] = []
-
-        if classification.requires_manual_review:
-            actions.append("Flag for manual review by compliance officer")
-            actions.append("Verify data principal identity before processing")
-
-        req_type = classification.request_type
-        if req_type == "erasure":
-            actions.append("Identify all systems holding the data principal's data")
-            actions.append("Execute erasure workflow per retention policy")
-            actions.append("Document erasure completion and retain audit trail")
-        elif req_type == "access":
-            actions.append("Compile data summary from all relevant systems")
-            actions.append("Prepare data in requested format (PDF/JSON)")
-            actions.append("Send secure access link to data principal")
-        elif req_type == "correction":
-            actions.append("Request supporting documentation if not provided")
-            actions.append("Verify correction request against source documents")
-            actions.append("Update records and notify downstream processors")
-        elif req_type == "portability":
-            actions.append("Export data in machine-readable format")
-            actions.append("Ensure format supports interoperability")
-            actions.append("Provide secure download mechanism")
-        elif req_type == "objection":
-            actions.append("Identify consent-based processing activities")
-            actions.append("Cease processing for withdrawn consent")
-            actions.append("Update consent records and notify data principal")
-
-        if classification.priority in ("high", "critical"):
-            actions.append("Prioritize in queue - expedite processing")
-
-        return actions
-
-    def _get_sla_days(self, classification: ClassificationResult) -> int:
-        """Determine SLA days based on complexity and priority."""
-        base_sla = 90  # DPDP Act default
-        if classification.estimated_complexity == "complex":
-            return min(base_sla, 60)  # Complex may need faster initial response
-        if classification.estimated_complexity == "simple":
-            return 45
-        return base_sla
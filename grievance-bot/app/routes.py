@@ -1,86 +1,408 @@
 """API routes for the DPDP Grievance Bot."""
 
-from typing import Literal, Union
+import json
+import logging
+import time
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from typing import Literal
 
-from fastapi import APIRouter
-from pydantic import BaseModel
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError
 
-from app.classifier import GrievanceClassifier
+from app.analytics import AnalyticsAggregator
+from app.config import (
+    ANALYTICS_MAX_ORGS,
+    ANALYTICS_RETENTION_HOURS,
+    BULK_STREAM_CHUNK_SIZE,
+    BULK_STREAM_MAX_LINE_BYTES,
+    DEDUP_ENABLED,
+    DEDUP_MAX_ENTRIES,
+    DEDUP_THRESHOLD,
+    DEDUP_WINDOW_HOURS,
+    JOB_CONCURRENCY,
+    JOB_LEASE_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    JOB_MAX_WAIT_SECONDS,
+    JOB_POLL_INTERVAL_SECONDS,
+    JOB_QUEUE_PATH,
+    JOB_RETENTION_HOURS,
+    JOB_RETRY_BACKOFF_SECONDS,
+    PERSISTENCE_BATCH_SIZE,
+    PERSISTENCE_FLUSH_INTERVAL_MS,
+    PERSISTENCE_POOL_SIZE,
+    PERSISTENCE_URL,
+    RESPONSE_COMPRESSION_MIN_BYTES,
+    SLA_BREACHED_RETENTION_DAYS,
+    SLA_EVENT_BUFFER,
+    SLA_TICK_SECONDS,
+    SLA_WARNING_HOURS,
+)
+from app.dedup import DuplicateMatch, NearDuplicateIndex
+from app.encoding import BULK_RESPONSES, Table, encoded_response, negotiate
+from app.jobs import Job, JobQueue, JobRunner
+from app.metrics import instrumented, set_classified_type, stage
 from app.models import (
     AIResponse,
+    BulkJobRequest,
     ClassificationResult,
+    DuplicateInfo,
     GrievanceAnalytics,
     GrievanceRequest,
+    JobAccepted,
+    JobStatus,
+    ProcessResult,
+    QueuedGrievance,
+    SlaCaseStatus,
+    SlaEventRecord,
+)
+from app.persistence import TicketWriter, open_store, ticket_row
+from app.pipeline import (
+    classification_cache,
+    classify_async,
+    classify_many,
+    tenant_keywords,
 )
-from app.responder import GrievanceResponder, TEMPLATES
+from app.responder import TEMPLATES, GrievanceResponder
+from app.sla import SlaCase, SlaEvent, SlaScheduler
+from app.streaming import NDJSONStreamingResponse, iter_ndjson_lines
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["grievance"])
-classifier = GrievanceClassifier()
 responder = GrievanceResponder()
+analytics = AnalyticsAggregator(
+    retention_hours=ANALYTICS_RETENTION_HOURS, max_orgs=ANALYTICS_MAX_ORGS
+)
+ticket_writer = (
+    TicketWriter(
+        open_store(PERSISTENCE_URL, pool_size=PERSISTENCE_POOL_SIZE),
+        batch_size=PERSISTENCE_BATCH_SIZE,
+        flush_interval=PERSISTENCE_FLUSH_INTERVAL_MS / 1000,
+    )
+    if PERSISTENCE_URL
+    else None
+)
+duplicate_index = (
+    NearDuplicateIndex(
+        threshold=DEDUP_THRESHOLD,
+        window_seconds=DEDUP_WINDOW_HOURS * 3600,
+        max_entries=DEDUP_MAX_ENTRIES,
+    )
+    if DEDUP_ENABLED
+    else None
+)
+sla_scheduler = SlaScheduler(
+    warning_seconds=SLA_WARNING_HOURS * 3600,
+    tick_seconds=SLA_TICK_SECONDS,
+    event_buffer=SLA_EVENT_BUFFER,
+    breached_retention_seconds=SLA_BREACHED_RETENTION_DAYS * 86_400,
+)
+job_queue = JobQueue(
+    JOB_QUEUE_PATH,
+    max_attempts=JOB_MAX_ATTEMPTS,
+    retry_backoff_seconds=JOB_RETRY_BACKOFF_SECONDS,
+    lease_seconds=JOB_LEASE_SECONDS,
+)
 
 
 @router.post("/classify", response_model=ClassificationResult)
-def classify_grievance(request: GrievanceRequest) -> ClassificationResult:
+@instrumented
+async def classify_grievance(request: GrievanceRequest) -> ClassificationResult:
     """Classify a grievance request and return the classification result."""
-    return classifier.classify(
-        description=request.description,
-        stated_type=request.request_type,
-    )
+    with stage("classify"):
+        classification = await classify_async(
+            description=request.description,
+            stated_type=request.request_type,
+            org_id=request.org_id,
+        )
+    set_classified_type(classification.request_type)
+    return classification
 
 
 @router.post("/respond", response_model=AIResponse)
-def generate_response(request: GrievanceRequest) -> AIResponse:
-    """Classify the grievance and generate an AI response."""
-    classification = classifier.classify(
-        description=request.description,
-        stated_type=request.request_type,
-    )
-    return responder.generate_response(classification=classification, request=request)
+@instrumented
+async def generate_response(request: GrievanceRequest) -> Response:
+    """
+    Classify the grievance and generate an AI response.
+
+    Unlike /process, nothing is recorded: the case is not checked for
+    duplicates, counted in analytics, tracked against its SLA or persisted.
+    """
+    with stage("classify"):
+        classification = await classify_async(
+            description=request.description,
+            stated_type=request.request_type,
+            org_id=request.org_id,
+        )
+    set_classified_type(classification.request_type)
+    with stage("generate_response"):
+        response = responder.generate_response(classification=classification, request=request)
+    return _json_response(response)
 
 
-@router.post("/process")
-def process_grievance(
-    request: GrievanceRequest,
-) -> dict[str, Union[ClassificationResult, AIResponse]]:
+@router.post("/process", response_model=ProcessResult)
+@instrumented
+async def process_grievance(request: GrievanceRequest) -> Response:
     """Full pipeline: classify and generate response, return both."""
-    classification = classifier.classify(
-        description=request.description,
-        stated_type=request.request_type,
+    return _json_response(await _run_pipeline(request))
+
+
+async def _run_pipeline(request: GrievanceRequest, case_id: str | None = None) -> ProcessResult:
+    """
+    Classify a grievance, generate its response, and record and persist it.
+
+    Args:
+        request: The grievance.
+        case_id: Case ID reserved when the grievance was queued, if any.
+
+    Returns:
+        The classification, response and near-duplicate match.
+    """
+    with stage("classify"):
+        classification = await classify_async(
+            description=request.description,
+            stated_type=request.request_type,
+            org_id=request.org_id,
+        )
+    set_classified_type(classification.request_type)
+    with stage("generate_response"):
+        response = responder.generate_response(
+            classification=classification,
+            request=request,
+            case_id=case_id,
+        )
+    duplicate = None
+    if duplicate_index is not None:
+        # Signing is numpy work proportional to the description's length
+        with stage("dedup"):
+            match = await run_in_threadpool(
+                duplicate_index.check,
+                request.description,
+                reference=response.case_id,
+                scope=request.org_id or "",
+            )
+        duplicate = _duplicate_info(match)
+    analytics.record(classification, sla_days=response.sla_days, org_id=request.org_id)
+    sla_scheduler.track(
+        SlaCase(
+            case_id=response.case_id,
+            org_id=request.org_id,
+            request_type=classification.request_type,
+            priority=classification.priority,
+            deadline=time.time() + response.sla_days * 86_400,
+        )
     )
-    response = responder.generate_response(
-        classification=classification,
-        request=request,
+    # Tickets belong to an organization, as in grievance_tickets.org_id; the
+    # writer rejects org IDs that are not UUIDs and never blocks the loop
+    if ticket_writer is not None and request.org_id is not None:
+        ticket_writer.add(ticket_row(request, classification, response))
+    return ProcessResult.model_construct(
+        classification=classification, response=response, duplicate=duplicate
     )
-    return {
-        "classification": classification,
-        "response": response,
-    }
 
 
-@router.get("/analytics", response_model=GrievanceAnalytics)
-def get_analytics() -> GrievanceAnalytics:
-    """Return mock grievance analytics."""
-    return GrievanceAnalytics(
-        total_processed=1250,
-        by_type={
-            "access": 420,
-            "correction": 310,
-            "erasure": 280,
-            "portability": 150,
-            "objection": 90,
-        },
-        avg_resolution_days=32.5,
-        ai_accuracy=0.87,
-        sla_compliance_rate=0.92,
+def _duplicate_info(match: DuplicateMatch | None) -> DuplicateInfo | None:
+    """Convert an index match to its API model."""
+    if match is None:
+        return None
+    return DuplicateInfo(duplicate_of=match.reference, similarity=match.similarity)
+
+
+def _json_response(model: BaseModel) -> Response:
+    """
+    Serialize an already-validated model straight to a JSON response.
+
+    Returning a Response bypasses FastAPI's response_model handling, which
+    would validate the model again and walk it through jsonable_encoder.
+    """
+    with stage("serialize"):
+        return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+async def _process_job(payload: str) -> str:
+    """Job handler: run the full pipeline on a queued grievance under its reserved case ID."""
+    queued = QueuedGrievance.model_validate_json(payload)
+    result = await _run_pipeline(queued.request, case_id=queued.case_id)
+    return result.model_dump_json()
+
+
+job_runner = JobRunner(
+    job_queue,
+    _process_job,
+    concurrency=JOB_CONCURRENCY,
+    poll_interval=JOB_POLL_INTERVAL_SECONDS,
+    retention_seconds=JOB_RETENTION_HOURS * 3600,
+)
+
+
+def _principal(request: GrievanceRequest) -> str:
+    """Ordering key for a grievance: its data principal within its organization."""
+    return f"{request.org_id or ''}\x00{request.data_principal_email.strip().lower()}"
+
+
+def _enqueue(requests: list[GrievanceRequest]) -> list[str]:
+    """
+    Queue grievances in one transaction, returning their job IDs.
+
+    Case IDs are reserved here in a single block, so a bulk submission takes
+    the allocator's lock once, and a retried job keeps the same case ID.
+    """
+    case_ids = responder.case_ids.allocate(len(requests))
+    return job_queue.submit_many(
+        [
+            (_principal(r), QueuedGrievance(case_id=case_id, request=r).model_dump_json())
+            for r, case_id in zip(requests, case_ids)
+        ]
     )
 
 
+@router.post("/jobs", status_code=202, response_model=JobAccepted)
+async def submit_job(request: GrievanceRequest) -> JobAccepted:
+    """Queue a grievance for asynchronous processing and return its job ID."""
+    job_ids = await run_in_threadpool(_enqueue, [request])
+    job_runner.notify()
+    return JobAccepted(job_ids=job_ids)
+
+
+@router.post("/jobs/bulk", status_code=202, response_model=JobAccepted)
+async def submit_jobs(request: BulkJobRequest) -> JobAccepted:
+    """Queue many grievances in one transaction; each becomes its own job."""
+    job_ids = await run_in_threadpool(_enqueue, request.requests)
+    job_runner.notify()
+    return JobAccepted(job_ids=job_ids)
+
+
+@router.get("/jobs/stats")
+def get_job_stats() -> dict[str, int]:
+    """Return the number of jobs in each state."""
+    return job_queue.stats()
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(
+    job_id: str,
+    wait: float = Query(default=0, ge=0),
+) -> JobStatus:
+    """
+    Return a job's state and result.
+
+    With ``wait`` > 0 the call long-polls, returning as soon as the job is
+    done or failed, or after ``wait`` seconds (capped at JOB_MAX_WAIT_SECONDS)
+    with its current state.
+    """
+    job = await job_runner.wait(job_id, timeout=min(wait, JOB_MAX_WAIT_SECONDS))
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return _job_status(job)
+
+
+def _job_status(job: Job) -> JobStatus:
+    """Convert a queue record into the API response model."""
+    return JobStatus(
+        job_id=job.id,
+        status=job.status,
+        attempts=job.attempts,
+        result=ProcessResult.model_validate_json(job.result) if job.result else None,
+        error=job.error,
+        created_at=datetime.fromtimestamp(job.created_at, tz=timezone.utc).isoformat(),
+        updated_at=datetime.fromtimestamp(job.updated_at, tz=timezone.utc).isoformat(),
+    )
+
+
+def _log_breach(event: SlaEvent) -> None:
+    """Log every SLA breach."""
+    if event.kind == "breached":
+        logger.warning(
+            "SLA breached for case %s (org %s)", event.case.case_id, event.case.org_id
+        )
+
+
+sla_scheduler.subscribe(_log_breach)
+
+
+@router.get("/sla/due", response_model=list[SlaCaseStatus])
+def get_sla_due(
+    within_hours: float = Query(default=24, ge=0),
+    org_id: str | None = None,
+    include_breached: bool = True,
+) -> list[SlaCaseStatus]:
+    """List open cases due within the next ``within_hours``, earliest deadline first."""
+    cases = sla_scheduler.due_within(
+        within_hours * 3600, org_id=org_id, include_breached=include_breached
+    )
+    return [_sla_case_status(case) for case in cases]
+
+
+@router.get("/sla/events", response_model=list[SlaEventRecord])
+def get_sla_events(limit: int = Query(default=100, ge=1)) -> list[SlaEventRecord]:
+    """Return the most recent approaching-deadline and breach events, newest first."""
+    events = list(sla_scheduler.events)[-limit:]
+    return [
+        SlaEventRecord(
+            kind=event.kind,
+            case=_sla_case_status(event.case),
+            fired_at=datetime.fromtimestamp(event.fired_at, tz=timezone.utc).isoformat(),
+        )
+        for event in reversed(events)
+    ]
+
+
+@router.delete("/sla/cases/{case_id}", status_code=204)
+def resolve_sla_case(case_id: str) -> Response:
+    """Stop tracking a resolved case."""
+    if not sla_scheduler.resolve(case_id):
+        raise HTTPException(status_code=404, detail="case not tracked")
+    return Response(status_code=204)
+
+
+def _sla_case_status(case: SlaCase) -> SlaCaseStatus:
+    """Convert a tracked case into the API response model."""
+    return SlaCaseStatus(
+        case_id=case.case_id,
+        org_id=case.org_id,
+        request_type=case.request_type,
+        priority=case.priority,
+        deadline=datetime.fromtimestamp(case.deadline, tz=timezone.utc).isoformat(),
+        status="breached" if case.breached else "approaching" if case.warned else "open",
+    )
+
+
+@router.get("/analytics", response_model=GrievanceAnalytics)
+def get_analytics(
+    org_id: str | None = None,
+    window_hours: int | None = Query(default=None, ge=1),
+) -> GrievanceAnalytics:
+    """Return grievance analytics, optionally for one org and a trailing window."""
+    return analytics.summary(org_id=org_id, window_hours=window_hours)
+
+
+@router.get("/cache/stats")
+def get_cache_stats() -> dict[str, int | float]:
+    """Return classification cache size and hit/miss/eviction counters."""
+    return classification_cache.stats()
+
+
 @router.get("/templates")
 def get_templates() -> dict[str, list[str]]:
-    """Return the list of available response templates."""
+    """Return the available response templates and languages."""
     return {
         "available_types": list(TEMPLATES.keys()),
         "templates": list(TEMPLATES.keys()),
+        "languages": responder.templates.available_languages(),
+        "loaded_languages": responder.templates.loaded_languages(),
+    }
+
+
+@router.get("/orgs/{org_id}/keywords")
+def get_org_keywords(org_id: str) -> dict[str, str | bool]:
+    """Return which keyword tables version an organization is classified with."""
+    profile = tenant_keywords.profile_for(org_id)
+    return {
+        "org_id": org_id,
+        "version": profile.version,
+        "custom": profile.org_id is not None,
     }
 
 
@@ -91,28 +413,162 @@ class BulkClassifyItem(BaseModel):
     stated_type: Literal[
         "access", "correction", "erasure", "portability", "objection"
     ] = "access"
+    id: str | None = None
 
 
 class BulkClassifyRequest(BaseModel):
     """Request model for bulk classification."""
 
     items: list[BulkClassifyItem]
+    org_id: str | None = None
 
 
 class BulkClassifyResponse(BaseModel):
     """Response model for bulk classification."""
 
     classifications: list[ClassificationResult]
+    duplicates: list[DuplicateInfo | None] = []
+
+
+def _classify_items(
+    items: list[BulkClassifyItem],
+    org_id: str | None,
+) -> list[ClassificationResult]:
+    """Classify bulk items through the shared pipeline, with the org's keywords."""
+    return classify_many(
+        descriptions=[item.description for item in items],
+        stated_types=[item.stated_type for item in items],
+        org_id=org_id,
+    )
+
+
+# Enum-like result fields, dictionary-encoded in columnar responses
+_CATEGORICAL_COLUMNS = frozenset(
+    {"request_type", "sub_category", "priority", "estimated_complexity"}
+)
+
+
+def _bulk_table(response: BulkClassifyResponse) -> Table:
+    """One row per item: its classification fields, then its duplicate match if any."""
+    results = response.classifications
+    columns: dict[str, tuple[type, list]] = {
+        "request_type": (str, [r.request_type for r in results]),
+        "confidence": (float, [r.confidence for r in results]),
+        "sub_category": (str, [r.sub_category for r in results]),
+        "priority": (str, [r.priority for r in results]),
+        "estimated_complexity": (str, [r.estimated_complexity for r in results]),
+        "requires_manual_review": (bool, [r.requires_manual_review for r in results]),
+    }
+    if response.duplicates:
+        duplicates = response.duplicates
+        columns["duplicate_of"] = (str, [d.duplicate_of if d else None for d in duplicates])
+        columns["similarity"] = (float, [d.similarity if d else None for d in duplicates])
+    return columns
 
 
-@router.post("/bulk-classify", response_model=BulkClassifyResponse)
-def bulk_classify(request: BulkClassifyRequest) -> BulkClassifyResponse:
-    """Classify multiple grievance descriptions at once."""
-    classifications = [
-        classifier.classify(
-            description=item.description,
-            stated_type=item.stated_type,
+@router.post("/bulk-classify", response_model=BulkClassifyResponse, responses=BULK_RESPONSES)
+@instrumented
+def bulk_classify(
+    request: BulkClassifyRequest,
+    accept: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
+) -> Response:
+    """
+    Classify multiple grievance descriptions at once.
+
+    ``duplicates`` flags, per item, a near-duplicate of an earlier grievance:
+    one already processed for the org, or an earlier item in this request
+    that carries an ``id``. Items with an ``id`` are remembered under it.
+
+    The response is JSON unless the Accept header asks for MessagePack (same
+    shape) or an Arrow IPC stream (one row per item, enum fields
+    dictionary-encoded). Large responses are gzip or zstd compressed when
+    Accept-Encoding allows.
+    """
+    media_type = negotiate(accept, tabular=True)
+    with stage("classify"):
+        classifications = _classify_items(request.items, request.org_id)
+    duplicates: list[DuplicateInfo | None] = []
+    if duplicate_index is not None:
+        with stage("dedup"):
+            matches = duplicate_index.check_many(
+                [item.description for item in request.items],
+                [item.id for item in request.items],
+                scope=request.org_id or "",
+            )
+        duplicates = [_duplicate_info(match) for match in matches]
+    analytics.record_many(classifications, org_id=request.org_id)
+    response = BulkClassifyResponse.model_construct(
+        classifications=classifications, duplicates=duplicates
+    )
+    with stage("serialize"):
+        return encoded_response(
+            response,
+            media_type,
+            accept_encoding,
+            RESPONSE_COMPRESSION_MIN_BYTES,
+            table=lambda: _bulk_table(response),
+            categorical=_CATEGORICAL_COLUMNS,
         )
-        for item in request.items
+
+
+@router.post("/bulk-classify/stream")
+async def bulk_classify_stream(
+    request: Request,
+    org_id: str | None = None,
+) -> NDJSONStreamingResponse:
+    """
+    Classify an NDJSON stream of items and stream NDJSON results back.
+
+    Each input line is a BulkClassifyItem. Lines are parsed as they arrive and
+    classified in chunks of BULK_STREAM_CHUNK_SIZE, so memory stays bounded by
+    the chunk size rather than the request size. Output lines follow input
+    order; a line that fails validation, or is longer than
+    BULK_STREAM_MAX_LINE_BYTES, yields an ``{"error": ...}`` object.
+
+    The response is always NDJSON and uncompressed, whatever the Accept and
+    Accept-Encoding headers; use /bulk-classify for MessagePack, Arrow IPC
+    or compressed responses.
+    """
+    return NDJSONStreamingResponse(_stream_classifications(request.stream(), org_id))
+
+
+async def _stream_classifications(
+    chunks: AsyncIterator[bytes],
+    org_id: str | None,
+) -> AsyncIterator[bytes]:
+    """Parse NDJSON items incrementally and yield classified chunks."""
+    # Valid items, or the error messages of an invalid line
+    pending: list[BulkClassifyItem | list[str]] = []
+    async for line in iter_ndjson_lines(chunks, BULK_STREAM_MAX_LINE_BYTES):
+        if line is None:
+            pending.append([f"line longer than {BULK_STREAM_MAX_LINE_BYTES} bytes"])
+        else:
+            try:
+                pending.append(BulkClassifyItem.model_validate_json(line))
+            except ValidationError as exc:
+                pending.append([err["msg"] for err in exc.errors()])
+        if len(pending) >= BULK_STREAM_CHUNK_SIZE:
+            yield await run_in_threadpool(_encode_chunk, pending, org_id)
+            pending = []
+    if pending:
+        yield await run_in_threadpool(_encode_chunk, pending, org_id)
+
+
+def _encode_chunk(
+    entries: list[BulkClassifyItem | list[str]],
+    org_id: str | None,
+) -> bytes:
+    """Classify the valid entries of a chunk and encode every entry as NDJSON."""
+    classifications = _classify_items(
+        [e for e in entries if isinstance(e, BulkClassifyItem)], org_id
+    )
+    analytics.record_many(classifications, org_id=org_id)
+    results = iter(classifications)
+    lines = [
+        next(results).model_dump_json()
+        if isinstance(entry, BulkClassifyItem)
+        else json.dumps({"error": "invalid item", "detail": entry})
+        for entry in entries
     ]
-    return BulkClassifyResponse(classifications=classifications)
+    return ("\n".join(lines) + "\n").encode()
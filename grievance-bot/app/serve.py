@@ -0,0 +1,143 @@
+"""Pre-forking production server: build shared state once, then fork the workers."""
+
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+from types import FrameType
+
+import uvicorn
+
+from app.config import SERVER_HOST, SERVER_PORT, SERVER_WORKERS
+
+logger = logging.getLogger("app.serve")
+
+# A worker that dies sooner than this after starting is restarted with a delay
+_CRASH_LOOP_SECONDS = 1.0
+
+
+def warm_up() -> None:
+    """
+    Build everything that is otherwise initialised on first use.
+
+    Importing ``app.main`` already compiles the keyword tables and response
+    plans; this runs one grievance through each classifier engine and the
+    MinHash signer (and the learned model, if configured), and loads the
+    template packs, so that state lives in the parent's heap and is shared
+    with every worker.
+    """
+    from app.pipeline import statistical_classifier
+    from app.routes import duplicate_index, responder
+    from app.tenants import DEFAULT_PROFILE
+
+    DEFAULT_PROFILE.classifier.classify(description="warm up", stated_type="access")
+    DEFAULT_PROFILE.batch_classifier.classify_batch(["warm up"], ["access"])
+    if statistical_classifier is not None:
+        statistical_classifier.classify_batch(["warm up"], ["access"])
+    if duplicate_index is not None:
+        duplicate_index.hasher.signature("warm up")
+    responder.templates.preload()
+
+
+class Supervisor:
+    """
+    Forks ``workers`` uvicorn servers sharing one listening socket.
+
+    Each worker occupies a numbered slot, and a worker that exits
+    unexpectedly is restarted in the same slot. With more than one worker,
+    the slot is stored as ``app.state.worker_slot`` so each worker snapshots
+    its local state to its own files. SIGTERM or SIGINT is forwarded to every
+    worker, which finishes in-flight requests and runs the application's
+    shutdown before exiting.
+    """
+
+    def __init__(self, config: uvicorn.Config, sock: socket.socket, workers: int) -> None:
+        self.config = config
+        self.sock = sock
+        self.workers = max(1, workers)
+        # Slot and start time of each running worker, by pid
+        self._children: dict[int, tuple[int, float]] = {}
+        self._stopping = False
+
+    def run(self) -> None:
+        """Start the workers and supervise them until told to stop."""
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        for slot in range(self.workers):
+            self._spawn(slot)
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            child = self._children.pop(pid, None)
+            if child is None or self._stopping:
+                continue
+            slot, started_at = child
+            logger.warning(
+                "worker %d exited with code %d; restarting", pid, os.waitstatus_to_exitcode(status)
+            )
+            if time.monotonic() - started_at < _CRASH_LOOP_SECONDS:
+                time.sleep(_CRASH_LOOP_SECONDS)
+            if not self._stopping:
+                self._spawn(slot)
+        self.sock.close()
+
+    def _spawn(self, slot: int) -> None:
+        """Fork one worker into ``slot``."""
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            if self.workers > 1:
+                self.config.app.state.worker_slot = slot
+            code = 0
+            try:
+                uvicorn.Server(self.config).run(sockets=[self.sock])
+            except BaseException:
+                logger.exception("worker %d failed", os.getpid())
+                code = 1
+            finally:
+                os._exit(code)
+        self._children[pid] = (slot, time.monotonic())
+
+    def _stop(self, signum: int, _: FrameType | None) -> None:
+        """Forward a shutdown signal to every worker."""
+        self._stopping = True
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+
+def main() -> None:
+    """Import and warm the application, bind the port and fork the workers."""
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:     %(message)s")
+    started = time.monotonic()
+
+    from app.main import app
+
+    warm_up()
+    # Loading the config imports the protocol and event loop implementations
+    config = uvicorn.Config(app, lifespan="on")
+    config.load()
+    sock = socket.create_server((SERVER_HOST, SERVER_PORT), backlog=2048)
+    sock.set_inheritable(True)
+    # Move everything built so far out of the collector's reach: workers' GC
+    # passes would otherwise write to those objects and un-share their pages
+    gc.freeze()
+    logger.info(
+        "Shared state built in %.0f ms; forking %d workers on %s:%d",
+        (time.monotonic() - started) * 1000,
+        SERVER_WORKERS,
+        SERVER_HOST,
+        SERVER_PORT,
+    )
+    Supervisor(config, sock, SERVER_WORKERS).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""SLA deadline tracking for open cases on a hierarchical timer wheel."""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from typing import Literal, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Four levels of 64 slots: 64 ticks, ~3 days, ~6 months and ~32 years at one-minute ticks
+SLOT_BITS = 6
+SLOTS = 1 << SLOT_BITS
+LEVELS = 4
+
+EventKind = Literal["approaching", "breached"]
+
+# Timers also drop breached cases once their retention has passed, without an event
+_TimerKind = Literal["approaching", "breached", "expired"]
+
+
+class SlaCase(NamedTuple):
+    """An open case and its SLA deadline (seconds since the epoch)."""
+
+    case_id: str
+    org_id: str | None
+    request_type: str
+    priority: str
+    deadline: float
+    warned: bool = False
+    breached: bool = False
+
+
+class SlaEvent(NamedTuple):
+    """A case approaching or passing its deadline."""
+
+    kind: EventKind
+    case: SlaCase
+    fired_at: float
+
+
+class _Timer(NamedTuple):
+    """A wheel entry: fire ``kind`` for ``case_id`` at ``tick``."""
+
+    tick: int
+    kind: _TimerKind
+    case_id: str
+
+
+class TimerWheel:
+    """
+    Hierarchical timing wheel of ``LEVELS`` levels of ``SLOTS`` slots each.
+
+    A timer sits on the level of the highest base-``SLOTS`` digit in which its
+    tick differs from the current tick, in the slot named by that digit. When
+    the current tick reaches a slot's start, the slot's timers cascade to
+    lower levels, so each timer moves at most ``LEVELS`` times: inserting and
+    firing are O(1) amortized. Timers beyond the top level wait in an
+    overflow list, re-inserted whenever the top level wraps.
+    """
+
+    def __init__(self, tick: int) -> None:
+        self.tick = tick
+        self._slots: list[list[list[_Timer]]] = [
+            [[] for _ in range(SLOTS)] for _ in range(LEVELS)
+        ]
+        self._due: list[_Timer] = []
+        self._overflow: list[_Timer] = []
+
+    def insert(self, timer: _Timer) -> None:
+        """Schedule a timer; one at or before the current tick fires on the next advance."""
+        if timer.tick <= self.tick:
+            self._due.append(timer)
+            return
+        level = ((timer.tick ^ self.tick).bit_length() - 1) // SLOT_BITS
+        if level >= LEVELS:
+            self._overflow.append(timer)
+            return
+        self._slots[level][(timer.tick >> (level * SLOT_BITS)) & (SLOTS - 1)].append(timer)
+
+    def advance(self, tick: int) -> list[_Timer]:
+        """Move the wheel forward to ``tick`` and return every timer that fell due."""
+        fired, self._due = self._due, []
+        while self.tick < tick:
+            self.tick += 1
+            for level in range(LEVELS - 1, 0, -1):
+                if self.tick & ((1 << (level * SLOT_BITS)) - 1) == 0:
+                    self._cascade(level)
+            if self.tick & ((1 << (LEVELS * SLOT_BITS)) - 1) == 0:
+                overflow, self._overflow = self._overflow, []
+                for timer in overflow:
+                    self.insert(timer)
+            slot = self._slots[0][self.tick & (SLOTS - 1)]
+            fired.extend(slot)
+            slot.clear()
+            fired.extend(self._due)
+            self._due.clear()
+        return fired
+
+    def until(self, tick: int) -> Iterator[_Timer]:
+        """
+        Yield pending timers due at or before ``tick``, in no particular order.
+
+        Only slots whose range starts by ``tick`` are visited, so the cost
+        depends on the window and the timers in it, not on the wheel's size.
+        """
+        yield from (timer for timer in self._due if timer.tick <= tick)
+        for level in range(LEVELS):
+            shift = level * SLOT_BITS
+            base = (self.tick >> (shift + SLOT_BITS)) << (shift + SLOT_BITS)
+            for index in range(((self.tick >> shift) & (SLOTS - 1)) + 1, SLOTS):
+                if base + (index << shift) > tick:
+                    break
+                yield from (timer for timer in self._slots[level][index] if timer.tick <= tick)
+        yield from (timer for timer in self._overflow if timer.tick <= tick)
+
+    def _cascade(self, level: int) -> None:
+        """Re-insert the timers of the level slot the current tick just entered."""
+        slot = self._slots[level][(self.tick >> (level * SLOT_BITS)) & (SLOTS - 1)]
+        timers = list(slot)
+        slot.clear()
+        for timer in timers:
+            self.insert(timer)
+
+
+class SlaScheduler:
+    """
+    Tracks open cases and fires events as their SLA deadlines approach.
+
+    Each case schedules an "approaching" timer ``warning_seconds`` before its
+    deadline and a "breached" timer at the deadline, on a TimerWheel ticking
+    every ``tick_seconds``. ``advance`` fires due events to the listeners and
+    keeps the latest ``event_buffer`` of them for inspection. Resolved cases
+    are dropped at once; their timers are skipped when they come up.
+    Breached cases that are never resolved are dropped
+    ``breached_retention_seconds`` after their deadline, so the index and
+    its snapshots stay bounded by the intake rate. Open cases can be
+    snapshotted to disk and the wheel rebuilt from a snapshot.
+    """
+
+    def __init__(
+        self,
+        warning_seconds: float = 72 * 3600.0,
+        tick_seconds: float = 60.0,
+        event_buffer: int = 1000,
+        breached_retention_seconds: float = 30 * 86_400.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.warning_seconds = warning_seconds
+        self.tick_seconds = tick_seconds
+        self.breached_retention_seconds = breached_retention_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._cases: dict[str, SlaCase] = {}
+        self._breached: set[str] = set()
+        self._wheel = TimerWheel(self._tick_at(clock()))
+        self._listeners: list[Callable[[SlaEvent], None]] = []
+        self.events: deque[SlaEvent] = deque(maxlen=event_buffer)
+        self.fired = {"approaching": 0, "breached": 0}
+        self.expired = 0
+
+    def subscribe(self, listener: Callable[[SlaEvent], None]) -> None:
+        """Call ``listener`` with every event fired from now on."""
+        self._listeners.append(listener)
+
+    def track(self, case: SlaCase) -> None:
+        """Start tracking an open case."""
+        with self._lock:
+            self._cases[case.case_id] = case
+            self._breached.discard(case.case_id)
+            self._schedule(case)
+
+    def resolve(self, case_id: str) -> bool:
+        """Stop tracking a case; returns False if it was not tracked."""
+        with self._lock:
+            self._breached.discard(case_id)
+            return self._cases.pop(case_id, None) is not None
+
+    def advance(self) -> list[SlaEvent]:
+        """Fire every event that has fallen due by now."""
+        now = self._clock()
+        events: list[SlaEvent] = []
+        with self._lock:
+            for timer in self._wheel.advance(self._tick_at(now)):
+                case = self._cases.get(timer.case_id)
+                if timer.kind == "expired":
+                    self._expire(case, timer.tick)
+                    continue
+                if case is None or case.breached or (timer.kind == "approaching" and case.warned):
+                    continue
+                if timer.kind == "approaching":
+                    case = case._replace(warned=True)
+                else:
+                    case = case._replace(warned=True, breached=True)
+                    self._breached.add(case.case_id)
+                    self._wheel.insert(self._expiry_timer(case))
+                self._cases[case.case_id] = case
+                events.append(SlaEvent(timer.kind, case, now))
+            for event in events:
+                self.events.append(event)
+                self.fired[event.kind] += 1
+        for event in events:
+            for listener in self._listeners:
+                try:
+                    listener(event)
+                except Exception:
+                    logger.exception("SLA event listener failed for %s", event.case.case_id)
+        return events
+
+    def due_within(
+        self,
+        seconds: float,
+        org_id: str | None = None,
+        include_breached: bool = True,
+    ) -> list[SlaCase]:
+        """
+        List open cases whose deadline falls within the next ``seconds``.
+
+        Args:
+            seconds: Window length from now.
+            org_id: Only cases of this organization, if given.
+            include_breached: Also list open cases already past their deadline.
+
+        Returns:
+            Matching cases, earliest deadline first.
+        """
+        end = self._clock() + seconds
+        with self._lock:
+            found = {
+                timer.case_id: self._cases[timer.case_id]
+                for timer in self._wheel.until(self._tick_at(end) + 1)
+                if timer.kind == "breached" and timer.case_id in self._cases
+            }
+            if include_breached:
+                found.update((case_id, self._cases[case_id]) for case_id in self._breached)
+        return sorted(
+            (
+                case
+                for case in found.values()
+                if case.deadline <= end
+                and (include_breached or not case.breached)
+                and (org_id is None or case.org_id == org_id)
+            ),
+            key=lambda case: case.deadline,
+        )
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of open and breached cases and events fired."""
+        with self._lock:
+            return {
+                "open_cases": len(self._cases),
+                "breached_cases": len(self._breached),
+                "approaching_events": self.fired["approaching"],
+                "breached_events": self.fired["breached"],
+                "expired_cases": self.expired,
+            }
+
+    def save(self, path: str) -> None:
+        """Write the open cases to a snapshot atomically."""
+        with self._lock:
+            data = {
+                "version": SNAPSHOT_FORMAT_VERSION,
+                "cases": [list(case) for case in self._cases.values()],
+            }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Per process, so two workers saving at once never write the same file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(data, fh)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> bool:
+        """
+        Rebuild the case index from a snapshot; returns False if there is none.
+
+        Deadlines that passed or came within the warning window while the
+        service was down fire on the next ``advance``. An unreadable, corrupt
+        or partial snapshot is logged and ignored, leaving the current cases
+        as they were.
+        """
+        try:
+            with open(path, encoding="utf-8") as fh:
+                data = json.load(fh)
+            if data.get("version") != SNAPSHOT_FORMAT_VERSION:
+                return False
+            cases = [SlaCase(*fields) for fields in data["cases"]]
+            # A bad deadline fails here rather than halfway through rebuilding the wheel
+            for case in cases:
+                self._tick_at(case.deadline - self.warning_seconds)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError, TypeError, AttributeError, OverflowError) as exc:
+            logger.warning("Ignoring unreadable SLA snapshot %s: %r", path, exc)
+            return False
+        with self._lock:
+            self._cases = {}
+            self._breached = set()
+            self._wheel = TimerWheel(self._tick_at(self._clock()))
+            for case in cases:
+                self._cases[case.case_id] = case
+                if case.breached:
+                    self._breached.add(case.case_id)
+                self._schedule(case)
+        return True
+
+    def _schedule(self, case: SlaCase) -> None:
+        """Put a case's remaining timers on the wheel; the caller holds ``_lock``."""
+        if case.breached:
+            self._wheel.insert(self._expiry_timer(case))
+            return
+        if not case.warned:
+            warn_at = self._tick_at(case.deadline - self.warning_seconds, round_up=True)
+            self._wheel.insert(_Timer(warn_at, "approaching", case.case_id))
+        breach_at = self._tick_at(case.deadline, round_up=True)
+        self._wheel.insert(_Timer(breach_at, "breached", case.case_id))
+
+    def _expiry_timer(self, case: SlaCase) -> _Timer:
+        """Timer dropping a breached case once its retention has passed."""
+        expires_at = self._tick_at(case.deadline + self.breached_retention_seconds, round_up=True)
+        return _Timer(expires_at, "expired", case.case_id)
+
+    def _expire(self, case: SlaCase | None, tick: int) -> None:
+        """Drop a breached case whose retention ended by ``tick``; the caller holds ``_lock``."""
+        # The case may have been resolved, or re-tracked with a later deadline
+        if case is None or not case.breached or self._expiry_timer(case).tick > tick:
+            return
+        del self._cases[case.case_id]
+        self._breached.discard(case.case_id)
+        self.expired += 1
+
+    def _tick_at(self, timestamp: float, round_up: bool = False) -> int:
+        """Wheel tick of a timestamp; deadlines round up so they never fire early."""
+        ticks = timestamp / self.tick_seconds
+        return math.ceil(ticks) if round_up else math.floor(ticks)
@@ -0,0 +1,73 @@
+"""NDJSON streaming helpers for endpoints that read and write incrementally."""
+
+from collections.abc import AsyncIterator
+
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
+from starlette.types import Receive, Scope, Send
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    Streaming NDJSON response whose body is produced while the request is read.
+
+    The stock StreamingResponse listens for client disconnects on ``receive``
+    while it streams, which would swallow request body chunks that the body
+    generator has not consumed yet. This response leaves ``receive`` to the
+    request reader; a dropped client surfaces as a failed send instead.
+    """
+
+    media_type = NDJSON_MEDIA_TYPE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterator[bytes],
+    max_line_bytes: int = 0,
+) -> AsyncIterator[bytes | None]:
+    """
+    Split a byte stream into non-empty NDJSON lines.
+
+    Args:
+        chunks: Raw body chunks, e.g. ``Request.stream()``.
+        max_line_bytes: Longest line accepted; 0 means no limit.
+
+    Yields:
+        Each non-blank line without its trailing newline, or None in place
+        of a line longer than ``max_line_bytes``. Only the partial line at
+        the end of the latest chunk is buffered, appended to in place, and
+        the bytes of an overlong line are dropped as they arrive.
+    """
+    pending = bytearray()
+    oversized = False
+    async for chunk in chunks:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if not oversized:
+                pending += chunk[start:] if end < 0 else chunk[start:end]
+                if max_line_bytes and len(pending) > max_line_bytes:
+                    oversized = True
+                    pending.clear()
+            if end < 0:
+                break
+            if oversized:
+                oversized = False
+                yield None
+            elif pending.strip():
+                yield bytes(pending)
+            pending.clear()
+            start = end + 1
+    if oversized:
+        yield None
+    elif pending.strip():
+        yield bytes(pending)
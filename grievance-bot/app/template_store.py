@@ -0,0 +1,137 @@
+"""Lazily loaded, bounded cache of localized response template packs."""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_LANGUAGE = "en"
+
+
+def normalize_language(language: str) -> str | None:
+    """
+    Reduce a language tag to its primary subtag ("hi-IN" -> "hi").
+
+    Returns None for tags that cannot name a pack file, so user input never
+    reaches the filesystem as anything but a short alphabetic code.
+    """
+    primary = language.strip().lower().replace("_", "-").split("-", 1)[0]
+    if not primary.isascii() or not primary.isalpha() or len(primary) > 8:
+        return None
+    return primary
+
+
+class TemplateStore:
+    """
+    Serves response templates per language from JSON packs on disk.
+
+    Each ``<language>.json`` file in ``directory`` maps request types to
+    template text. The directory is only listed at startup (or on
+    ``refresh``); a pack is read the first time its language is requested
+    and kept in an LRU of at most ``max_languages`` packs. English comes from
+    ``fallback`` and is always resident; a pack missing a request type falls
+    back to English for that type.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        fallback: dict[str, str],
+        max_languages: int = 8,
+        default_type: str = "access",
+    ) -> None:
+        self.directory = directory
+        self.max_languages = max(1, max_languages)
+        self._fallback = fallback
+        self._default_type = default_type
+        self._packs: OrderedDict[str, dict[str, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Re-list the pack directory and drop cached packs."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            names = []
+        available = {DEFAULT_LANGUAGE}
+        for name in names:
+            stem, ext = os.path.splitext(name)
+            if ext == ".json" and normalize_language(stem) == stem:
+                available.add(stem)
+        with self._lock:
+            self._available = frozenset(available)
+            self._packs.clear()
+
+    def preload(self) -> None:
+        """Load up to ``max_languages`` packs now rather than on first request."""
+        for code in sorted(self._available - {DEFAULT_LANGUAGE})[: self.max_languages]:
+            self._pack(code)
+
+    def available_languages(self) -> list[str]:
+        """Return every language with a pack, without loading any."""
+        return sorted(self._available)
+
+    def loaded_languages(self) -> list[str]:
+        """Return the languages currently cached, least recently used first."""
+        with self._lock:
+            return list(self._packs)
+
+    def resolve(self, language: str, request_type: str) -> tuple[str, str]:
+        """
+        Pick the template for a request type in the requested language.
+
+        Args:
+            language: Requested language tag, e.g. "hi" or "hi-IN".
+            request_type: Classified request type.
+
+        Returns:
+            Tuple of (template text, language the text is actually in).
+        """
+        code = normalize_language(language)
+        if code is not None and code != DEFAULT_LANGUAGE and code in self._available:
+            text = self._pack(code).get(request_type)
+            if text is not None:
+                return text, code
+        text = self._fallback.get(request_type, self._fallback[self._default_type])
+        return text, DEFAULT_LANGUAGE
+
+    def stats(self) -> dict[str, int]:
+        """Return cache size and load/eviction counters."""
+        with self._lock:
+            return {
+                "available": len(self._available),
+                "loaded": len(self._packs),
+                "max_languages": self.max_languages,
+                "loads": self.loads,
+                "evictions": self.evictions,
+            }
+
+    def _pack(self, code: str) -> dict[str, str]:
+        """Return a cached pack, loading it and evicting the LRU one if needed."""
+        with self._lock:
+            pack = self._packs.get(code)
+            if pack is not None:
+                self._packs.move_to_end(code)
+                return pack
+            pack = self._load(code)
+            self._packs[code] = pack
+            self.loads += 1
+            while len(self._packs) > self.max_languages:
+                self._packs.popitem(last=False)
+                self.evictions += 1
+            return pack
+
+    def _load(self, code: str) -> dict[str, str]:
+        """Read one pack from disk; an unreadable pack counts as empty."""
+        path = os.path.join(self.directory, f"{code}.json")
+        try:
+            with open(path, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {k: v for k, v in data.items() if isinstance(v, str)}
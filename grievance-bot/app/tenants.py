@@ -0,0 +1,265 @@
+"""Per-organization keyword tables, compiled on demand and reloaded on change."""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Literal, NamedTuple
+
+from pydantic import BaseModel, ConfigDict, field_validator
+
+from app.batch import BatchClassifier
+from app.classifier import DEFAULT_TABLES, GrievanceClassifier, KeywordTables
+
+logger = logging.getLogger(__name__)
+
+RequestType = Literal["access", "correction", "erasure", "portability", "objection"]
+
+# Org IDs name config files, so only plain identifiers (UUIDs, slugs) are accepted
+_ORG_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,128}")
+
+
+class KeywordConfig(BaseModel):
+    """
+    An organization's keyword config file, ``<org_id>.json``.
+
+    Every field is optional and replaces the built-in table of the same
+    name; ``keyword_map`` and ``sub_category_rules`` replace per request
+    type. Keywords are lowercased, since descriptions are matched lowercased,
+    and must not be empty or blank.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    keyword_map: dict[RequestType, list[str]] = {}
+    critical_keywords: list[str] | None = None
+    high_keywords: list[str] | None = None
+    low_keywords: list[str] | None = None
+    manual_review_keywords: list[str] | None = None
+    complexity_keywords: list[str] | None = None
+    sub_category_rules: dict[RequestType, list[tuple[list[str], str]]] = {}
+
+    @field_validator(
+        "critical_keywords",
+        "high_keywords",
+        "low_keywords",
+        "manual_review_keywords",
+        "complexity_keywords",
+    )
+    @classmethod
+    def _check_keywords(cls, keywords: list[str] | None) -> list[str] | None:
+        """Reject empty and whitespace-only keywords."""
+        if keywords is not None and any(not keyword.strip() for keyword in keywords):
+            raise ValueError("keywords must not be empty or blank")
+        return keywords
+
+    @field_validator("keyword_map")
+    @classmethod
+    def _check_keyword_map(
+        cls, keyword_map: dict[RequestType, list[str]]
+    ) -> dict[RequestType, list[str]]:
+        """Reject empty and whitespace-only keywords."""
+        for keywords in keyword_map.values():
+            cls._check_keywords(keywords)
+        return keyword_map
+
+    @field_validator("sub_category_rules")
+    @classmethod
+    def _check_cues(
+        cls, rules: dict[RequestType, list[tuple[list[str], str]]]
+    ) -> dict[RequestType, list[tuple[list[str], str]]]:
+        """Reject empty and whitespace-only cue words."""
+        for type_rules in rules.values():
+            for cues, _ in type_rules:
+                cls._check_keywords(cues)
+        return rules
+
+    def compile(self, base: KeywordTables = DEFAULT_TABLES) -> KeywordTables:
+        """Overlay this config on ``base`` and compile the result."""
+
+        def words(override: list[str] | None, default: tuple[str, ...]) -> list[str]:
+            return [w.lower() for w in override] if override is not None else list(default)
+
+        keyword_map = {t: list(kws) for t, kws in base.keyword_map.items()}
+        keyword_map.update({t: [w.lower() for w in kws] for t, kws in self.keyword_map.items()})
+        sub_category_rules = {t: list(rules) for t, rules in base.sub_category_rules.items()}
+        sub_category_rules.update(
+            {
+                t: [([cue.lower() for cue in cues], sub) for cues, sub in rules]
+                for t, rules in self.sub_category_rules.items()
+            }
+        )
+        return KeywordTables(
+            keyword_map=keyword_map,
+            critical_keywords=words(self.critical_keywords, base.critical_keywords),
+            high_keywords=words(self.high_keywords, base.high_keywords),
+            low_keywords=words(self.low_keywords, base.low_keywords),
+            manual_review_keywords=words(self.manual_review_keywords, base.manual_review_keywords),
+            complexity_keywords=words(self.complexity_keywords, base.complexity_keywords),
+            sub_category_rules=sub_category_rules,
+            default_sub_category=base.default_sub_category,
+        )
+
+
+class KeywordProfile(NamedTuple):
+    """Compiled tables and the classifiers built on them, for one org version."""
+
+    org_id: str | None
+    tables: KeywordTables
+    classifier: GrievanceClassifier
+    batch_classifier: BatchClassifier
+
+    @property
+    def version(self) -> str:
+        """Fingerprint of the tables."""
+        return self.tables.version
+
+    @classmethod
+    def build(cls, org_id: str | None, tables: KeywordTables) -> "KeywordProfile":
+        """Build both classifiers for a set of tables."""
+        return cls(org_id, tables, GrievanceClassifier(tables), BatchClassifier(tables))
+
+
+DEFAULT_PROFILE = KeywordProfile.build(None, DEFAULT_TABLES)
+
+
+class _Pointer(NamedTuple):
+    """Which compiled version an org currently uses, and when its file was checked."""
+
+    checked_at: float
+    signature: tuple[int, int, int] | None
+    key: tuple[str, str] | None
+
+
+class TenantKeywordStore:
+    """
+    Resolves an org ID to its compiled KeywordProfile.
+
+    Profiles are compiled from ``<org_id>.json`` in ``directory`` and held in
+    an LRU of ``max_profiles`` entries keyed by (org, tables version). An
+    org's file is re-checked with ``os.stat`` at most every
+    ``check_interval`` seconds. When it changed, the new version is compiled
+    without holding the lock and then swapped in with a single assignment,
+    so requests already holding the old profile finish on it undisturbed. A
+    file that fails to parse keeps the previous version (or the defaults)
+    active, as does one whose tables fail to compile. Orgs without a file,
+    and requests without an org, get the
+    built-in tables.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_profiles: int = 256,
+        check_interval: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.directory = directory
+        self.max_profiles = max(1, max_profiles)
+        self.check_interval = check_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._profiles: OrderedDict[tuple[str, str], KeywordProfile] = OrderedDict()
+        self._pointers: OrderedDict[str, _Pointer] = OrderedDict()
+        self.loads = 0
+        self.reloads = 0
+        self.errors = 0
+        self.evictions = 0
+
+    def profile_for(self, org_id: str | None) -> KeywordProfile:
+        """Return the active profile for an org, reloading it if its file changed."""
+        if not self.directory or org_id is None or not _ORG_ID_PATTERN.fullmatch(org_id):
+            return DEFAULT_PROFILE
+        now = self._clock()
+        with self._lock:
+            pointer = self._pointers.get(org_id)
+            if pointer is not None and not self._is_cached(pointer.key):
+                # Its profile was evicted; compile it again
+                pointer = None
+            elif pointer is not None and now - pointer.checked_at < self.check_interval:
+                return self._lookup(pointer.key)
+
+        path = os.path.join(self.directory, f"{org_id}.json")
+        try:
+            st = os.stat(path)
+            signature: tuple[int, int, int] | None = (st.st_mtime_ns, st.st_size, st.st_ino)
+        except FileNotFoundError:
+            signature = None
+
+        if pointer is not None and signature == pointer.signature:
+            key = pointer.key
+        elif signature is None:
+            key = None
+        else:
+            key = self._compile(org_id, path, previous=pointer)
+        with self._lock:
+            self._pointers[org_id] = _Pointer(now, signature, key)
+            self._pointers.move_to_end(org_id)
+            while len(self._pointers) > self.max_profiles * 4:
+                self._pointers.popitem(last=False)
+            return self._lookup(key)
+
+    def stats(self) -> dict[str, int]:
+        """Return cache size and load/reload/error counters."""
+        with self._lock:
+            return {
+                "profiles": len(self._profiles),
+                "max_profiles": self.max_profiles,
+                "loads": self.loads,
+                "reloads": self.reloads,
+                "errors": self.errors,
+                "evictions": self.evictions,
+            }
+
+    def _is_cached(self, key: tuple[str, str] | None) -> bool:
+        """Whether a pointer's profile is still cached; the caller holds ``_lock``."""
+        return key is None or key in self._profiles
+
+    def _lookup(self, key: tuple[str, str] | None) -> KeywordProfile:
+        """Return a cached profile; the caller holds ``_lock``."""
+        if key is None:
+            return DEFAULT_PROFILE
+        profile = self._profiles.get(key)
+        if profile is None:
+            # Evicted by another org's load in the meantime; compiled again next time
+            self._pointers.pop(key[0], None)
+            return DEFAULT_PROFILE
+        self._profiles.move_to_end(key)
+        return profile
+
+    def _compile(
+        self,
+        org_id: str,
+        path: str,
+        previous: _Pointer | None,
+    ) -> tuple[str, str] | None:
+        """Load and compile an org's file, returning its cache key."""
+        try:
+            with open(path, encoding="utf-8") as fh:
+                config = KeywordConfig.model_validate(json.load(fh))
+            tables = config.compile()
+            profile = KeywordProfile.build(org_id, tables)
+        except Exception as exc:
+            # Validation should catch bad configs; anything else that fails
+            # to compile must not take the org's classification down either
+            logger.warning("keeping previous keywords for org %s: %r", org_id, exc)
+            with self._lock:
+                self.errors += 1
+            return previous.key if previous is not None else None
+
+        key = (org_id, tables.version)
+        with self._lock:
+            if key not in self._profiles:
+                self._profiles[key] = profile
+                while len(self._profiles) > self.max_profiles:
+                    self._profiles.popitem(last=False)
+                    self.evictions += 1
+            if previous is None or previous.key is None:
+                self.loads += 1
+            else:
+                self.reloads += 1
+        return key
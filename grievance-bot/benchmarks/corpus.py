@@ -0,0 +1,104 @@
+"""Synthetic grievance corpus generator for benchmarks."""
+
+import random
+from dataclasses import dataclass
+
+from app.classifier import (
+    CRITICAL_KEYWORDS,
+    HIGH_KEYWORDS,
+    KEYWORD_MAP,
+    LOW_KEYWORDS,
+    MANUAL_REVIEW_KEYWORDS,
+)
+
+REQUEST_TYPES = list(KEYWORD_MAP)
+
+# Filler vocabulary per language; "hinglish" mixes romanized Hindi with English
+FILLER_WORDS: dict[str, list[str]] = {
+    "en": (
+        "i have been a customer of your service for years and recently noticed that "
+        "my order history account settings were shared with partners without notice "
+        "please look into this matter at the earliest regards thanks"
+    ).split(),
+    "hinglish": (
+        "mera account aapke paas hai aur maine dekha ki meri details partners ke saath "
+        "share ho rahi hain kripya jaldi se dekhiye dhanyavaad please order history"
+    ).split(),
+    "hi": "मेरा खाता आपकी सेवा में है और मेरी जानकारी बिना अनुमति साझा की गई कृपया जल्दी देखें धन्यवाद".split(),
+    "ta": "என் கணக்கு உங்கள் சேவையில் உள்ளது தகவல் அனுமதி இல்லாமல் பகிரப்பட்டது தயவுசெய்து பார்க்கவும் நன்றி".split(),
+    "bn": "আমার অ্যাকাউন্ট আপনার পরিষেবায় আছে আমার তথ্য অনুমতি ছাড়া শেয়ার করা হয়েছে দয়া করে দেখুন ধন্যবাদ".split(),
+}
+
+PRIORITY_WORDS = CRITICAL_KEYWORDS + HIGH_KEYWORDS + LOW_KEYWORDS + MANUAL_REVIEW_KEYWORDS
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """Knobs for the synthetic corpus."""
+
+    size: int = 2000
+    min_words: int = 10
+    max_words: int = 400
+    keyword_density: float = 0.08
+    mismatch_rate: float = 0.25
+    priority_rate: float = 0.15
+    language_mix: tuple[tuple[str, float], ...] = (
+        ("en", 0.6),
+        ("hinglish", 0.2),
+        ("hi", 0.1),
+        ("ta", 0.05),
+        ("bn", 0.05),
+    )
+    seed: int = 1234
+
+
+@dataclass(frozen=True)
+class SyntheticGrievance:
+    """One generated grievance and the type its keywords were drawn from."""
+
+    description: str
+    stated_type: str
+    true_type: str
+    language: str
+
+
+def generate_corpus(spec: CorpusSpec) -> list[SyntheticGrievance]:
+    """
+    Generate a reproducible corpus of synthetic grievances.
+
+    Each grievance picks a language from ``language_mix``, a length between
+    ``min_words`` and ``max_words``, and a true request type whose keywords are
+    sprinkled in at ``keyword_density``. With probability ``mismatch_rate`` the
+    stated type differs from the true type, and with ``priority_rate`` a
+    priority or manual-review keyword is added.
+    """
+    rng = random.Random(spec.seed)
+    languages = [lang for lang, _ in spec.language_mix]
+    weights = [weight for _, weight in spec.language_mix]
+    corpus: list[SyntheticGrievance] = []
+    for i in range(spec.size):
+        language = rng.choices(languages, weights)[0]
+        true_type = rng.choice(REQUEST_TYPES)
+        stated_type = true_type
+        if rng.random() < spec.mismatch_rate:
+            stated_type = rng.choice([t for t in REQUEST_TYPES if t != true_type])
+
+        filler = FILLER_WORDS[language]
+        keywords = KEYWORD_MAP[true_type]
+        words = [
+            rng.choice(keywords) if rng.random() < spec.keyword_density else rng.choice(filler)
+            for _ in range(rng.randint(spec.min_words, spec.max_words))
+        ]
+        if rng.random() < spec.priority_rate:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(PRIORITY_WORDS))
+        # A ticket number keeps every description distinct, so caches never hit
+        words.append(f"ref-{spec.seed}-{i}")
+        corpus.append(
+            SyntheticGrievance(
+                description=" ".join(words),
+                stated_type=stated_type,
+                true_type=true_type,
+                language=language,
+            )
+        )
+    return corpus
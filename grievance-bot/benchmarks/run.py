@@ -0,0 +1,365 @@
+"""
+Benchmark the grievance-bot hot paths and compare against a stored baseline.
+
+Usage (from the grievance-bot directory):
+
+    python -m benchmarks.run                    # run and compare to baseline
+    python -m benchmarks.run --update-baseline  # run and store a new baseline
+
+Baselines depend on the hardware, so none is committed: record one on the
+machine you compare on. Without a baseline the results are only printed.
+Exits with status 1 when a benchmark regresses by more than ``--threshold``.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import asdict
+from typing import Any
+
+# Measure classification work, not cache hits, and keep benchmark runs from
+# touching the local state directory: analytics snapshots are off and every
+# other state file (case-id leases, job queue, SLA snapshot) goes to a
+# temporary directory removed at exit. Must be set before importing the app.
+_STATE_DIR = tempfile.TemporaryDirectory(prefix="grievance-bench-")
+os.environ.setdefault("GRIEVANCE_STATE_DIR", _STATE_DIR.name)
+os.environ.setdefault("GRIEVANCE_CACHE_MAX_ENTRIES", "0")
+os.environ.setdefault("GRIEVANCE_ANALYTICS_SNAPSHOT_PATH", "")
+
+import httpx
+
+from app.classifier import GrievanceClassifier
+from app.encoding import ARROW_MEDIA_TYPE
+from app.learned import HashedNaiveBayes, StatisticalClassifier
+from app.main import app
+from app.models import GrievanceRequest
+from app.responder import GrievanceResponder
+from benchmarks.corpus import CorpusSpec, SyntheticGrievance, generate_corpus
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def summarize(latencies_ns: Sequence[int], items: int, elapsed_s: float) -> dict[str, float]:
+    """Throughput and latency percentiles for one benchmark."""
+    ordered = sorted(latencies_ns)
+    return {
+        "calls": len(ordered),
+        "items": items,
+        "throughput_per_s": round(items / elapsed_s, 1),
+        "p50_ms": round(ordered[len(ordered) // 2] / 1e6, 4),
+        "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] / 1e6, 4),
+        "mean_ms": round(statistics.fmean(ordered) / 1e6, 4),
+    }
+
+
+def timed_calls(calls: Sequence[Callable[[], Any]], items_per_call: int = 1) -> dict[str, float]:
+    """Run sync callables one after another, timing each."""
+    latencies: list[int] = []
+    start = time.perf_counter()
+    for call in calls:
+        t0 = time.perf_counter_ns()
+        call()
+        latencies.append(time.perf_counter_ns() - t0)
+    return summarize(latencies, len(calls) * items_per_call, time.perf_counter() - start)
+
+
+async def timed_requests(
+    calls: Sequence[Callable[[], Awaitable[httpx.Response]]],
+    items_per_call: int = 1,
+    concurrency: int = 1,
+) -> dict[str, float]:
+    """Run async requests with bounded concurrency, timing each."""
+    latencies: list[int] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(call: Callable[[], Awaitable[httpx.Response]]) -> None:
+        async with semaphore:
+            t0 = time.perf_counter_ns()
+            response = await call()
+            latencies.append(time.perf_counter_ns() - t0)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(call) for call in calls))
+    return summarize(latencies, len(calls) * items_per_call, time.perf_counter() - start)
+
+
+def bench_classify(corpus: list[SyntheticGrievance]) -> dict[str, float]:
+    """GrievanceClassifier.classify, one grievance at a time."""
+    classifier = GrievanceClassifier()
+    return timed_calls(
+        [lambda g=g: classifier.classify(g.description, g.stated_type) for g in corpus]
+    )
+
+
+def _statistical_classifier(corpus: list[SyntheticGrievance]) -> StatisticalClassifier:
+    """Train on a differently seeded corpus and load the weights back memory-mapped."""
+    training = generate_corpus(CorpusSpec(size=len(corpus), seed=CorpusSpec.seed + 1))
+    model = HashedNaiveBayes.fit(
+        [g.description for g in training],
+        [g.true_type for g in training],
+        [g.stated_type for g in training],
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "model.bin")
+        model.save(path)
+        # The mapping stays valid after the file is unlinked
+        return StatisticalClassifier.load(path)
+
+
+def bench_classify_statistical(corpus: list[SyntheticGrievance]) -> dict[str, float]:
+    """StatisticalClassifier.classify, one grievance at a time."""
+    classifier = _statistical_classifier(corpus)
+    return timed_calls(
+        [lambda g=g: classifier.classify(g.description, g.stated_type) for g in corpus]
+    )
+
+
+def bench_classify_statistical_batch(
+    corpus: list[SyntheticGrievance],
+    batch_size: int,
+) -> dict[str, float]:
+    """StatisticalClassifier.classify_batch over fixed-size batches."""
+    classifier = _statistical_classifier(corpus)
+    batches = [corpus[i:i + batch_size] for i in range(0, len(corpus) - batch_size + 1, batch_size)]
+    return timed_calls(
+        [
+            lambda b=b: classifier.classify_batch(
+                [g.description for g in b], [g.stated_type for g in b]
+            )
+            for b in batches
+        ],
+        items_per_call=batch_size,
+    )
+
+
+def bench_generate_response(corpus: list[SyntheticGrievance]) -> dict[str, float]:
+    """GrievanceResponder.generate_response on pre-classified grievances."""
+    classifier = GrievanceClassifier()
+    responder = GrievanceResponder()
+    inputs = [
+        (
+            classifier.classify(g.description, g.stated_type),
+            GrievanceRequest(
+                data_principal_email="bench@example.com",
+                request_type=g.stated_type,
+                description=g.description,
+                language=g.language,
+            ),
+        )
+        for g in corpus
+    ]
+    return timed_calls(
+        [lambda c=c, r=r: responder.generate_response(classification=c, request=r) for c, r in inputs]
+    )
+
+
+async def bench_api_process(
+    client: httpx.AsyncClient,
+    corpus: list[SyntheticGrievance],
+    concurrency: int,
+) -> dict[str, float]:
+    """POST /api/process through the in-process ASGI client."""
+    payloads = [
+        {
+            "data_principal_email": "bench@example.com",
+            "request_type": g.stated_type,
+            "description": g.description,
+            "language": g.language,
+        }
+        for g in corpus
+    ]
+    return await timed_requests(
+        [lambda p=p: client.post("/api/process", json=p) for p in payloads],
+        concurrency=concurrency,
+    )
+
+
+async def bench_api_bulk_classify(
+    client: httpx.AsyncClient,
+    corpus: list[SyntheticGrievance],
+    batch_size: int,
+    headers: dict[str, str] | None = None,
+) -> dict[str, float]:
+    """
+    POST /api/bulk-classify in batches through the in-process ASGI client.
+
+    Responses are uncompressed JSON unless ``headers`` ask otherwise.
+    """
+    headers = {"Accept-Encoding": "identity", **(headers or {})}
+    batches = [
+        {
+            "items": [
+                {"description": g.description, "stated_type": g.stated_type}
+                for g in corpus[i:i + batch_size]
+            ]
+        }
+        for i in range(0, len(corpus) - batch_size + 1, batch_size)
+    ]
+    return await timed_requests(
+        [lambda b=b: client.post("/api/bulk-classify", json=b, headers=headers) for b in batches],
+        items_per_call=batch_size,
+    )
+
+
+async def run_all(
+    corpus: list[SyntheticGrievance],
+    bulk_size: int,
+    concurrency: int,
+    only: set[str] | None,
+) -> dict[str, dict[str, float]]:
+    """Run every selected benchmark and return their summaries by name."""
+    results: dict[str, dict[str, float]] = {}
+
+    def selected(name: str) -> bool:
+        return only is None or name in only
+
+    if selected("classify"):
+        results["classify"] = bench_classify(corpus)
+    if selected("classify_statistical"):
+        results["classify_statistical"] = bench_classify_statistical(corpus)
+    if selected("classify_statistical_batch"):
+        results["classify_statistical_batch"] = bench_classify_statistical_batch(
+            corpus, batch_size=bulk_size
+        )
+    if selected("generate_response"):
+        results["generate_response"] = bench_generate_response(corpus)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        if selected("api_process"):
+            results["api_process"] = await bench_api_process(client, corpus, concurrency=1)
+        if selected("api_process_concurrent"):
+            results["api_process_concurrent"] = await bench_api_process(
+                client, corpus, concurrency=concurrency
+            )
+        if selected("api_bulk_classify"):
+            results["api_bulk_classify"] = await bench_api_bulk_classify(
+                client, corpus, batch_size=bulk_size
+            )
+        if selected("api_bulk_classify_arrow") and importlib.util.find_spec("pyarrow"):
+            results["api_bulk_classify_arrow"] = await bench_api_bulk_classify(
+                client,
+                corpus,
+                batch_size=bulk_size,
+                headers={"Accept": ARROW_MEDIA_TYPE, "Accept-Encoding": "gzip"},
+            )
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[str]:
+    """Return a message per metric that regressed by more than ``threshold``."""
+    regressions: list[str] = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if current["throughput_per_s"] < previous["throughput_per_s"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {current['throughput_per_s']:.1f}/s "
+                f"vs baseline {previous['throughput_per_s']:.1f}/s"
+            )
+        if current["p99_ms"] > previous["p99_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name}: p99 {current['p99_ms']:.3f} ms vs baseline {previous['p99_ms']:.3f} ms"
+            )
+    return regressions
+
+
+def print_table(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+) -> None:
+    """Print results side by side with the baseline throughput."""
+    header = f"{'benchmark':<24}{'items/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'vs base':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        previous = baseline.get(name)
+        delta = (
+            f"{(r['throughput_per_s'] / previous['throughput_per_s'] - 1) * 100:+.1f}%"
+            if previous
+            else "-"
+        )
+        print(
+            f"{name:<24}{r['throughput_per_s']:>12.1f}{r['p50_ms']:>10.3f}"
+            f"{r['p99_ms']:>10.3f}{delta:>10}"
+        )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--size", type=int, default=CorpusSpec.size)
+    parser.add_argument("--min-words", type=int, default=CorpusSpec.min_words)
+    parser.add_argument("--max-words", type=int, default=CorpusSpec.max_words)
+    parser.add_argument("--keyword-density", type=float, default=CorpusSpec.keyword_density)
+    parser.add_argument("--mismatch-rate", type=float, default=CorpusSpec.mismatch_rate)
+    parser.add_argument("--seed", type=int, default=CorpusSpec.seed)
+    parser.add_argument("--bulk-size", type=int, default=200, help="items per bulk request")
+    parser.add_argument("--concurrency", type=int, default=64, help="in-flight /process calls")
+    parser.add_argument("--only", nargs="*", help="benchmark names to run")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed regression ratio")
+    parser.add_argument("--output", help="write the full results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    spec = CorpusSpec(
+        size=args.size,
+        min_words=args.min_words,
+        max_words=args.max_words,
+        keyword_density=args.keyword_density,
+        mismatch_rate=args.mismatch_rate,
+        seed=args.seed,
+    )
+    corpus = generate_corpus(spec)
+    results = asyncio.run(
+        run_all(corpus, args.bulk_size, args.concurrency, set(args.only) if args.only else None)
+    )
+    report = {
+        # JSON round trip so the spec compares equal to a stored baseline's
+        "corpus": json.loads(json.dumps(asdict(spec))),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "benchmarks": results,
+    }
+
+    baseline: dict[str, dict[str, float]] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as fh:
+            stored = json.load(fh)
+        if stored.get("corpus") != report["corpus"]:
+            print("warning: baseline was recorded with a different corpus spec", file=sys.stderr)
+        baseline = stored["benchmarks"]
+
+    print_table(results, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for message in regressions:
+        print(f"REGRESSION {message}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
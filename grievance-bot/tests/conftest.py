@@ -0,0 +1,6 @@
+"""Keep the app's local state out of the working tree while tests import it."""
+
+import os
+import tempfile
+
+os.environ.setdefault("GRIEVANCE_STATE_DIR", tempfile.mkdtemp(prefix="grievance-test-"))
@@ -0,0 +1,55 @@
+"""Tests for case ID allocation."""
+
+import os
+
+import pytest
+
+from app.case_ids import MAX_NODES, SUFFIX_LENGTH, CaseIdAllocator
+
+FIXED_NOW = 1_792_300_000.123
+
+
+def _fixed_clock() -> float:
+    return FIXED_NOW
+
+
+def test_ids_are_increasing_and_well_formed(tmp_path):
+    allocator = CaseIdAllocator(node_id=1, lock_dir=str(tmp_path), clock=_fixed_clock)
+    ids = allocator.allocate(500)
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    assert all(len(case_id.split("-")[2]) == SUFFIX_LENGTH for case_id in ids)
+
+
+def test_nodes_with_separate_lock_dirs_do_not_collide(tmp_path):
+    # Two pods: each leases slot 0 from its own lock dir in the same millisecond
+    first = CaseIdAllocator(lock_dir=str(tmp_path / "pod-a"), clock=_fixed_clock)
+    second = CaseIdAllocator(lock_dir=str(tmp_path / "pod-b"), clock=_fixed_clock)
+    assert first.worker_id == second.worker_id == 0
+    assert first.node_id != second.node_id
+    assert not set(first.allocate(100)) & set(second.allocate(100))
+
+
+def test_forked_worker_leases_its_own_slot(tmp_path):
+    allocator = CaseIdAllocator(node_id=7, lock_dir=str(tmp_path), clock=_fixed_clock)
+    parent_slot = allocator.worker_id
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            payload = "\n".join([str(allocator.worker_id), *allocator.allocate(100)])
+            os.write(write_fd, payload.encode())
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as fh:
+        child_slot, *child_ids = fh.read().split("\n")
+    os.waitpid(pid, 0)
+    assert int(child_slot) != parent_slot
+    assert not set(child_ids) & set(allocator.allocate(100))
+
+
+def test_rejects_out_of_range_node_id():
+    with pytest.raises(ValueError):
+        CaseIdAllocator(node_id=MAX_NODES)
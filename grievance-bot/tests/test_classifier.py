@@ -0,0 +1,71 @@
+"""Tests for the keyword matcher and the batch classifier's equivalence to the per-item path."""
+
+import random
+
+import pytest
+
+from app.batch import BatchClassifier
+from app.classifier import DEFAULT_TABLES, GrievanceClassifier, KeywordTables
+from app.matcher import KeywordMatcher
+
+FILLER = ["please", "my", "the", "report", "support", "I", "want", "to", "all", "now", "data"]
+STATED_TYPES = ["access", "correction", "erasure", "portability", "objection", "unknown"]
+
+# Overlapping and multi-word keywords, and one keyword listed for two types
+OVERLAPPING_TABLES = KeywordTables(
+    keyword_map={
+        "erasure": ["delete", "delete my account", "del", "account"],
+        "access": ["data", "my data", "data export", "account"],
+        "portability": ["export", "port", "data export"],
+    },
+    critical_keywords=["urgent", "urgently"],
+    high_keywords=["legal", "legal action"],
+    low_keywords=["just"],
+    manual_review_keywords=["legal action"],
+    complexity_keywords=["court"],
+    sub_category_rules={"erasure": [(["account"], "account_deletion"), ([], "full_erasure")]},
+)
+
+
+def _corpus(tables: KeywordTables, size: int, seed: int) -> list[str]:
+    """Random descriptions mixing keywords, filler words and case changes."""
+    rng = random.Random(seed)
+    vocabulary = sorted(tables.matcher.keywords) + FILLER
+    descriptions = ["", "   ", "NOTHING RELEVANT HERE"]
+    while len(descriptions) < size:
+        words = rng.choices(vocabulary, k=rng.randint(1, 12))
+        text = " ".join(words)
+        choice = rng.random()
+        if choice < 0.2:
+            text = text.upper()
+        elif choice < 0.4:
+            text = text.title()
+        elif choice < 0.5:
+            # Keywords glued together or inside longer words
+            text = "".join(words)
+        descriptions.append(text)
+    return descriptions
+
+
+@pytest.mark.parametrize("tables", [DEFAULT_TABLES, OVERLAPPING_TABLES], ids=["default", "overlap"])
+def test_matcher_finds_every_substring_keyword(tables):
+    matcher = KeywordMatcher(tables.matcher.keywords)
+    for text in _corpus(tables, 500, seed=1):
+        text = text.lower()
+        assert matcher.find_all(text) == {kw for kw in tables.matcher.keywords if kw in text}
+
+
+def test_matcher_ignores_empty_keywords():
+    matcher = KeywordMatcher(["", "port"])
+    assert matcher.keywords == {"port"}
+    assert KeywordMatcher([]).find_all("anything") == frozenset()
+
+
+@pytest.mark.parametrize("tables", [DEFAULT_TABLES, OVERLAPPING_TABLES], ids=["default", "overlap"])
+def test_batch_matches_per_item_classification(tables):
+    descriptions = _corpus(tables, 1_000, seed=2)
+    rng = random.Random(3)
+    stated_types = [rng.choice(STATED_TYPES) for _ in descriptions]
+    single = GrievanceClassifier(tables)
+    expected = [single.classify(d, s) for d, s in zip(descriptions, stated_types)]
+    assert BatchClassifier(tables).classify_batch(descriptions, stated_types) == expected
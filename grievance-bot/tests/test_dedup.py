@@ -0,0 +1,42 @@
+"""Tests for near-duplicate detection."""
+
+import random
+import string
+
+from app.dedup import MinHasher, NearDuplicateIndex
+
+
+def _words(count: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    return ["".join(rng.choices(string.ascii_lowercase, k=6)) for _ in range(count)]
+
+
+def test_long_descriptions_are_sampled_consistently():
+    hasher = MinHasher(max_shingles=256)
+    words = _words(5_000, seed=1)
+    original = " ".join(words)
+    edited = " ".join(words[:4_900] + _words(100, seed=2))
+    unrelated = " ".join(_words(5_000, seed=3))
+    same = (hasher.signature(original) == hasher.signature(edited)).mean()
+    different = (hasher.signature(original) == hasher.signature(unrelated)).mean()
+    assert same >= 0.8
+    assert different <= 0.1
+
+
+def test_short_descriptions_are_not_sampled():
+    capped = MinHasher(max_shingles=256)
+    uncapped = MinHasher(max_shingles=1_000_000)
+    text = "Please delete my account and every record you hold about me."
+    assert (capped.signature(text) == uncapped.signature(text)).all()
+
+
+def test_index_matches_within_scope_and_evicts_oldest():
+    index = NearDuplicateIndex(max_entries=2)
+    text = "Please delete my account and every record you hold about me."
+    assert index.check(text, reference="GRV-1", scope="org-a") is None
+    assert index.check(text, scope="org-b") is None
+    assert index.check(text, scope="org-a").reference == "GRV-1"
+    index.check("I want a copy of the data you hold.", reference="GRV-2", scope="org-a")
+    index.check("Stop sending me marketing email.", reference="GRV-3", scope="org-a")
+    assert index.check(text, scope="org-a") is None
+    assert index.stats()["evictions"] == 1
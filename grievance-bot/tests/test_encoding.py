@@ -0,0 +1,44 @@
+"""Tests for response content negotiation."""
+
+import pytest
+
+from app import encoding
+from app.encoding import (
+    ARROW_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    negotiate,
+)
+
+
+@pytest.fixture
+def installed(monkeypatch):
+    """Pretend every optional encoder is installed."""
+    monkeypatch.setattr(encoding, "_optional_module", lambda name: object())
+
+
+@pytest.mark.parametrize(
+    ("accept", "expected"),
+    [
+        (None, JSON_MEDIA_TYPE),
+        ("*/*", JSON_MEDIA_TYPE),
+        ("application/msgpack", MSGPACK_MEDIA_TYPE),
+        ("application/x-msgpack", MSGPACK_MEDIA_TYPE),
+        ("application/msgpack;q=0.5, application/json", JSON_MEDIA_TYPE),
+        ("application/json;q=0, */*", MSGPACK_MEDIA_TYPE),
+        ("application/json;q=0, application/msgpack;q=0, */*", ARROW_MEDIA_TYPE),
+        ("application/*;q=0.2, application/vnd.apache.arrow.stream;q=0.1", JSON_MEDIA_TYPE),
+    ],
+)
+def test_most_specific_range_wins(installed, accept, expected):
+    assert negotiate(accept, tabular=True) == expected
+
+
+def test_arrow_is_only_offered_for_tabular_responses(installed):
+    assert negotiate("application/vnd.apache.arrow.stream", tabular=False) == JSON_MEDIA_TYPE
+
+
+@pytest.mark.parametrize("accept", ["text/plain", "application/json;q=0, */*"])
+def test_unsatisfiable_accept_falls_back_to_json(monkeypatch, accept):
+    monkeypatch.setattr(encoding, "_optional_module", lambda name: None)
+    assert negotiate(accept) == JSON_MEDIA_TYPE
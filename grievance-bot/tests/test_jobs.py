@@ -0,0 +1,93 @@
+"""Tests for the SQLite job queue and runner."""
+
+import asyncio
+
+from app.jobs import JobQueue, JobRunner
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_claim_returns_stored_creation_time(tmp_path):
+    clock = FakeClock()
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), clock=clock)
+    job_id = queue.submit("principal", "{}")
+    clock.now += 30
+    (job,) = queue.claim(1)
+    assert job.id == job_id
+    assert job.created_at == 1_000.0
+    assert job.updated_at == 1_030.0
+
+
+def test_renewed_lease_is_not_claimed_again(tmp_path):
+    clock = FakeClock()
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), lease_seconds=60, clock=clock)
+    queue.submit("principal", "{}")
+    (job,) = queue.claim(1)
+    clock.now += 50
+    queue.renew([job.id])
+    clock.now += 50
+    assert queue.claim(1) == []
+    clock.now += 11
+    assert [j.id for j in queue.claim(1)] == [job.id]
+
+
+def test_runner_renews_leases_of_long_jobs(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), lease_seconds=0.3)
+
+    async def slow(payload: str) -> str:
+        await asyncio.sleep(1.0)
+        return payload
+
+    async def scenario() -> None:
+        runner = JobRunner(queue, slow, concurrency=2, poll_interval=0.02)
+        job_id = queue.submit("principal", "result")
+        runner.start()
+        await asyncio.sleep(0.6)
+        # Past two lease periods, the job must still be leased by this runner
+        assert queue.claim(1) == []
+        job = await runner.wait(job_id, timeout=2)
+        await runner.stop()
+        assert job is not None and job.status == "done" and job.attempts == 1
+
+    asyncio.run(scenario())
+    queue.close()
+
+
+def test_bulk_jobs_use_case_ids_reserved_in_one_block(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.routes import responder
+
+    calls = []
+    allocate = responder.case_ids.allocate
+
+    def spy(count: int) -> list[str]:
+        calls.append(count)
+        return allocate(count)
+
+    monkeypatch.setattr(responder.case_ids, "allocate", spy)
+    grievances = [
+        {
+            "data_principal_email": f"p{i}@example.com",
+            "request_type": "erasure",
+            "description": f"Please delete my account number {i}",
+        }
+        for i in range(3)
+    ]
+    with TestClient(app) as client:
+        accepted = client.post("/api/jobs/bulk", json={"requests": grievances})
+        assert accepted.status_code == 202
+        case_ids = []
+        for job_id in accepted.json()["job_ids"]:
+            status = client.get(f"/api/jobs/{job_id}", params={"wait": 10}).json()
+            assert status["status"] == "done"
+            case_ids.append(status["result"]["response"]["case_id"])
+    assert calls == [3]
+    assert case_ids == sorted(case_ids) and len(set(case_ids)) == 3
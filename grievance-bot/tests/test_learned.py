@@ -0,0 +1,81 @@
+"""Tests for the learned request-type classifier."""
+
+import csv
+
+import numpy as np
+import pytest
+
+from app.learned import (
+    NO_STATED_TYPE,
+    HashedNaiveBayes,
+    StatisticalClassifier,
+    read_labelled,
+)
+
+PHRASES = {
+    "erasure": ["please delete my account", "erase everything you hold", "wipe my records"],
+    "access": ["what data do you have on me", "send me a copy of my data", "let me see my file"],
+    "correction": ["my address is wrong", "fix the spelling of my name", "update my phone"],
+    "portability": ["export my data to another bank", "transfer my history", "download all"],
+    "objection": ["stop sending marketing email", "withdraw my consent", "opt out now"],
+}
+
+
+@pytest.fixture
+def labelled_csv(tmp_path):
+    path = tmp_path / "labelled.csv"
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["description", "request_type"])
+        for request_type, phrases in PHRASES.items():
+            for phrase in phrases:
+                for suffix in ("", " today", " as soon as possible", " thanks"):
+                    writer.writerow([phrase + suffix, request_type])
+    return str(path)
+
+
+def test_missing_stated_type_is_neutral_not_the_label(labelled_csv):
+    _, labels, stated = read_labelled([labelled_csv])
+    assert set(labels) == set(PHRASES)
+    assert set(stated) == {NO_STATED_TYPE}
+
+
+def test_stated_type_carries_no_signal_when_unlabelled(labelled_csv):
+    model = HashedNaiveBayes.fit(*read_labelled([labelled_csv]), n_features=1 << 12)
+    probabilities = model.predict_proba(["hello there"] * len(PHRASES), list(PHRASES))
+    assert np.ptp(probabilities, axis=0).max() < 0.01
+
+
+def test_save_and_load_round_trip(labelled_csv, tmp_path):
+    descriptions, labels, stated = read_labelled([labelled_csv])
+    model = HashedNaiveBayes.fit(descriptions, labels, stated, n_features=1 << 12)
+    model = model.with_temperature(model.fit_temperature(descriptions, labels, stated))
+    path = str(tmp_path / "model.bin")
+    model.save(path)
+    loaded = HashedNaiveBayes.load(path)
+    assert isinstance(loaded.weights, np.memmap)
+    assert (loaded.classes, loaded.version, loaded.temperature) == (
+        model.classes,
+        model.version,
+        model.temperature,
+    )
+    np.testing.assert_allclose(
+        loaded.predict_proba(descriptions, stated), model.predict_proba(descriptions, stated)
+    )
+
+
+def test_classify_batch_matches_classify(labelled_csv, tmp_path):
+    path = str(tmp_path / "model.bin")
+    HashedNaiveBayes.fit(*read_labelled([labelled_csv]), n_features=1 << 12).save(path)
+    classifier = StatisticalClassifier.load(path)
+    descriptions = [
+        "Please delete my account immediately, this is a breach",
+        "I want a copy of my data and to export it",
+        "",
+        "my lawyer will go to court over the wrong address",
+    ]
+    stated = ["erasure", "access", "objection", "unknown"]
+    assert classifier.classify_batch(descriptions, stated) == [
+        classifier.classify(description, stated_type)
+        for description, stated_type in zip(descriptions, stated)
+    ]
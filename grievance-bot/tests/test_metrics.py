@@ -0,0 +1,19 @@
+"""Tests for Prometheus exposition."""
+
+from app.metrics import Counter, Histogram, MetricsRegistry
+
+
+def test_values_keep_full_precision():
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("test_total", "Test counter", ("route",)))
+    histogram = registry.register(Histogram("test_seconds", "Test histogram", ()))
+    counter.inc("/a", amount=1_234_567)
+    counter.inc("/b", amount=0.1 + 0.2)
+    histogram.observe(1_234_567.25)
+    registry.register_collector(lambda: {"test_gauge": 98_765_432.0, "test_inf": float("inf")})
+    lines = registry.render().splitlines()
+    assert 'test_total{route="/a"} 1234567' in lines
+    assert 'test_total{route="/b"} 0.30000000000000004' in lines
+    assert "test_seconds_sum 1234567.25" in lines
+    assert "test_gauge 98765432" in lines
+    assert "test_inf +Inf" in lines
@@ -0,0 +1,145 @@
+"""Tests for batched ticket persistence."""
+
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.persistence import (
+    PostgresTicketStore,
+    SQLiteTicketStore,
+    TicketRow,
+    TicketWriter,
+    canonical_org_id,
+)
+
+ORG_ID = str(uuid.uuid4())
+
+
+def _row(case_id: str, org_id: str | None = ORG_ID) -> TicketRow:
+    now = datetime.now(timezone.utc)
+    return TicketRow(
+        id=str(uuid.uuid4()),
+        org_id=org_id,
+        case_id=case_id,
+        data_principal_email="principal@example.com",
+        request_type="access",
+        status="open",
+        priority="medium",
+        description="please send me my data",
+        ai_classification="{}",
+        ai_response="{}",
+        sla_deadline=now,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def test_canonical_org_id():
+    assert canonical_org_id(ORG_ID.upper()) == ORG_ID
+    assert canonical_org_id("acme") is None
+    assert canonical_org_id(None) is None
+
+
+def test_rejected_row_does_not_drop_its_batch(tmp_path):
+    path = str(tmp_path / "tickets.db")
+    writer = TicketWriter(SQLiteTicketStore(path), batch_size=100, flush_interval=0.05)
+    rows = [_row(f"GRV-{i}") for i in range(20)]
+    rows.insert(7, _row("GRV-3"))  # duplicate case_id violates the UNIQUE constraint
+    for row in rows:
+        assert writer.add(row)
+    writer.close()
+    assert writer.stats()["written"] == 20
+    assert writer.stats()["dropped"] == 1
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM grievance_tickets").fetchone()[0] == 20
+
+
+def test_add_rejects_rows_without_a_uuid_org():
+    writer = TicketWriter(SQLiteTicketStore(":memory:"))
+    assert not writer.add(_row("GRV-1", org_id=None))
+    assert writer.stats()["rejected"] == 1
+
+
+class _BlockingStore:
+    row_errors = ()
+
+    def __init__(self) -> None:
+        self.writing = threading.Event()
+        self.release = threading.Event()
+
+    def write_many(self, rows):
+        self.writing.set()
+        self.release.wait()
+
+    def close(self) -> None:
+        pass
+
+
+def test_add_does_not_block_when_the_buffer_is_full():
+    store = _BlockingStore()
+    writer = TicketWriter(store, batch_size=1, max_pending=1)
+    assert writer.add(_row("GRV-1"))
+    assert store.writing.wait(timeout=5)
+    assert writer.add(_row("GRV-2"))
+    assert not writer.add(_row("GRV-3"))
+    assert writer.stats()["overflowed"] == 1
+    store.release.set()
+    writer.close()
+    assert writer.stats()["written"] == 2
+
+
+@pytest.fixture
+def postgres_dsn():
+    """A DSN whose search path is a throwaway schema holding the ticket tables."""
+    url = os.environ.get("GRIEVANCE_TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("set GRIEVANCE_TEST_POSTGRES_URL to run the Postgres tests")
+    psycopg = pytest.importorskip("psycopg")
+    schema = f"test_{uuid.uuid4().hex}"
+    with psycopg.connect(url, autocommit=True) as conn:
+        conn.execute(f"CREATE SCHEMA {schema}")
+        conn.execute(f"CREATE TABLE {schema}.organizations (id UUID PRIMARY KEY)")
+        conn.execute(
+            f"""
+            CREATE TABLE {schema}.grievance_tickets (
+                id UUID PRIMARY KEY,
+                org_id UUID NOT NULL REFERENCES {schema}.organizations(id),
+                case_id TEXT NOT NULL UNIQUE,
+                data_principal_email TEXT NOT NULL,
+                request_type TEXT NOT NULL,
+                status TEXT NOT NULL,
+                priority TEXT NOT NULL,
+                description TEXT NOT NULL,
+                ai_classification TEXT,
+                ai_response TEXT,
+                sla_deadline TIMESTAMPTZ NOT NULL,
+                created_at TIMESTAMPTZ NOT NULL,
+                updated_at TIMESTAMPTZ NOT NULL
+            )
+            """
+        )
+        conn.execute(f"INSERT INTO {schema}.organizations VALUES (%s)", (ORG_ID,))
+        try:
+            yield psycopg.conninfo.make_conninfo(url, options=f"-c search_path={schema}")
+        finally:
+            conn.execute(f"DROP SCHEMA {schema} CASCADE")
+
+
+def test_postgres_copy_isolates_rejected_rows(postgres_dsn):
+    import psycopg
+
+    writer = TicketWriter(PostgresTicketStore(postgres_dsn), batch_size=100, flush_interval=0.05)
+    rows = [_row(f"GRV-{i}") for i in range(20)]
+    rows.insert(5, _row("GRV-unknown-org", org_id=str(uuid.uuid4())))  # foreign key violation
+    rows.insert(12, _row("GRV-3"))  # duplicate case_id
+    for row in rows:
+        writer.add(row)
+    writer.close()
+    assert writer.stats()["written"] == 20
+    assert writer.stats()["dropped"] == 2
+    with psycopg.connect(postgres_dsn) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM grievance_tickets").fetchone()[0] == 20
@@ -0,0 +1,27 @@
+"""Tests for which endpoints record the cases they answer."""
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routes import analytics, sla_scheduler
+
+GRIEVANCE = {
+    "data_principal_email": "principal@example.com",
+    "request_type": "erasure",
+    "description": "Please delete my account and all my data",
+}
+
+
+def test_respond_has_no_side_effects():
+    with TestClient(app) as client:
+        processed = analytics.summary().total_processed
+        open_cases = sla_scheduler.stats()["open_cases"]
+        response = client.post("/api/respond", json=GRIEVANCE)
+        assert response.status_code == 200
+        assert response.json()["case_id"].startswith("GRV-")
+        assert analytics.summary().total_processed == processed
+        assert sla_scheduler.stats()["open_cases"] == open_cases
+
+        client.post("/api/process", json=GRIEVANCE)
+        assert analytics.summary().total_processed == processed + 1
+        assert sla_scheduler.stats()["open_cases"] == open_cases + 1
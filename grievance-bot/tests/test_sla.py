@@ -0,0 +1,90 @@
+"""Tests for SLA tracking snapshots."""
+
+import json
+
+import pytest
+
+from app.sla import SNAPSHOT_FORMAT_VERSION, SlaCase, SlaScheduler
+
+NOW = 1_792_300_000.0
+
+
+def _scheduler() -> SlaScheduler:
+    return SlaScheduler(warning_seconds=3600, clock=lambda: NOW)
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "sla.json")
+    scheduler = _scheduler()
+    scheduler.track(SlaCase("GRV-1", None, "erasure", "high", NOW + 86_400))
+    scheduler.save(path)
+    assert not list(tmp_path.glob("*.tmp"))
+    restored = _scheduler()
+    assert restored.load(path)
+    assert [case.case_id for case in restored.due_within(2 * 86_400)] == ["GRV-1"]
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "{not json",
+        json.dumps({"version": SNAPSHOT_FORMAT_VERSION}),
+        json.dumps({"version": SNAPSHOT_FORMAT_VERSION, "cases": [["GRV-2"]]}),
+        json.dumps(
+            {
+                "version": SNAPSHOT_FORMAT_VERSION,
+                "cases": [["GRV-2", None, "erasure", "high", "tomorrow"]],
+            }
+        ),
+    ],
+)
+def test_corrupt_snapshot_is_ignored(tmp_path, content):
+    path = tmp_path / "sla.json"
+    path.write_text(content)
+    scheduler = _scheduler()
+    scheduler.track(SlaCase("GRV-1", None, "erasure", "high", NOW + 86_400))
+    assert not scheduler.load(str(path))
+    assert scheduler.stats()["open_cases"] == 1
+
+
+def test_breached_cases_are_dropped_after_retention(tmp_path):
+    now = [NOW]
+    scheduler = SlaScheduler(
+        warning_seconds=3600, breached_retention_seconds=86_400, clock=lambda: now[0]
+    )
+    scheduler.track(SlaCase("GRV-1", None, "erasure", "high", NOW + 600))
+    scheduler.track(SlaCase("GRV-2", None, "erasure", "high", NOW + 10 * 86_400))
+    now[0] = NOW + 3600
+    assert [event.kind for event in scheduler.advance()] == ["approaching", "breached"]
+    assert scheduler.stats()["breached_cases"] == 1
+
+    # A restart in between keeps the pending expiry
+    path = str(tmp_path / "sla.json")
+    scheduler.save(path)
+    restored = SlaScheduler(
+        warning_seconds=3600, breached_retention_seconds=86_400, clock=lambda: now[0]
+    )
+    restored.load(path)
+
+    now[0] = NOW + 600 + 86_400 + 120
+    for tracker in (scheduler, restored):
+        assert tracker.advance() == []
+        stats = tracker.stats()
+        assert (stats["open_cases"], stats["breached_cases"], stats["expired_cases"]) == (1, 0, 1)
+        assert [case.case_id for case in tracker.due_within(30 * 86_400)] == ["GRV-2"]
+
+
+def test_retracked_case_is_not_dropped_early():
+    now = [NOW]
+    scheduler = SlaScheduler(
+        warning_seconds=0, breached_retention_seconds=86_400, clock=lambda: now[0]
+    )
+    scheduler.track(SlaCase("GRV-1", None, "erasure", "high", NOW + 60))
+    now[0] = NOW + 600
+    scheduler.advance()
+    scheduler.track(SlaCase("GRV-1", None, "erasure", "high", NOW + 43_200))
+    now[0] = NOW + 43_200 + 120
+    scheduler.advance()
+    now[0] = NOW + 86_400 + 600
+    scheduler.advance()
+    assert scheduler.stats()["open_cases"] == 1
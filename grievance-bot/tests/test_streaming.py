@@ -0,0 +1,53 @@
+"""Tests for incremental NDJSON parsing."""
+
+import asyncio
+import json
+
+from app.streaming import iter_ndjson_lines
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+def _lines(*chunks: bytes, max_line_bytes: int = 0) -> list[bytes | None]:
+    async def collect():
+        return [line async for line in iter_ndjson_lines(_chunks(*chunks), max_line_bytes)]
+
+    return asyncio.run(collect())
+
+
+def test_lines_split_across_chunks():
+    assert _lines(b'{"a"', b": 1}\n\n  \n{", b'"b": 2}\n{"c": 3}') == [
+        b'{"a": 1}',
+        b'{"b": 2}',
+        b'{"c": 3}',
+    ]
+
+
+def test_overlong_lines_are_replaced_without_buffering():
+    chunks = [b"x" * 1000] * 50 + [b"\nok\n", b"y" * 20, b"z" * 20]
+    assert _lines(*chunks, max_line_bytes=30) == [None, b"ok", None]
+
+
+def test_stream_endpoint_reports_overlong_lines(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app import routes
+    from app.main import app
+
+    monkeypatch.setattr(routes, "BULK_STREAM_MAX_LINE_BYTES", 200)
+    body = "\n".join(
+        [
+            json.dumps({"description": "Please delete my account"}),
+            json.dumps({"description": "x" * 500}),
+            "not json",
+        ]
+    )
+    with TestClient(app) as client:
+        response = client.post("/api/bulk-classify/stream", content=body)
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows[0]["request_type"] == "erasure"
+    assert rows[1] == {"error": "invalid item", "detail": ["line longer than 200 bytes"]}
+    assert rows[2]["error"] == "invalid item"
@@ -0,0 +1,59 @@
+"""Tests for per-organization keyword tables."""
+
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from app import tenants
+from app.tenants import DEFAULT_PROFILE, KeywordConfig, TenantKeywordStore
+
+ORG = "org-1"
+
+
+def _write(directory, config: dict) -> None:
+    (directory / f"{ORG}.json").write_text(json.dumps(config))
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        {"keyword_map": {"erasure": ["delete", ""]}},
+        {"critical_keywords": ["urgent", "   "]},
+        {"sub_category_rules": {"erasure": [[["account", ""], "account_deletion"]]}},
+    ],
+)
+def test_blank_keywords_are_rejected(config):
+    with pytest.raises(ValidationError):
+        KeywordConfig.model_validate(config)
+
+
+def test_invalid_config_keeps_previous_tables(tmp_path):
+    store = TenantKeywordStore(str(tmp_path), check_interval=0)
+    _write(tmp_path, {"keyword_map": {"erasure": ["delete", "scrub"]}})
+    good = store.profile_for(ORG)
+    assert "scrub" in good.tables.keyword_map["erasure"]
+
+    _write(tmp_path, {"keyword_map": {"erasure": ["delete", "scrub", ""]}})
+    assert store.profile_for(ORG) is good
+    assert store.stats()["errors"] == 1
+
+
+def test_compile_failure_keeps_previous_tables(tmp_path, monkeypatch):
+    store = TenantKeywordStore(str(tmp_path), check_interval=0)
+    _write(tmp_path, {"keyword_map": {"erasure": ["delete", "scrub"]}})
+    good = store.profile_for(ORG)
+
+    def fail(org_id, tables):
+        raise KeyError("scrub")
+
+    monkeypatch.setattr(tenants.KeywordProfile, "build", fail)
+    _write(tmp_path, {"keyword_map": {"erasure": ["delete", "scrub", "purge"]}})
+    assert store.profile_for(ORG) is good
+    assert store.stats()["errors"] == 1
+
+
+def test_org_without_valid_config_gets_defaults(tmp_path):
+    store = TenantKeywordStore(str(tmp_path), check_interval=0)
+    _write(tmp_path, {"low_keywords": [""]})
+    assert store.profile_for(ORG) is DEFAULT_PROFILE